@@ -27,6 +27,8 @@ from typing import List, Optional
 
 from backend.dev import debug_delay
 
+from .config import get_settings
+from .lib.mock import generate_mock_file
 from .lib.shopify import shopify_json_to_dataframe
 from .sources import ShopifySource, add_dataset_source, find_source
 
@@ -37,6 +39,7 @@ from .models import ListAutoApproveResponse
 from .utils import (
     get_auto_approve_list,
     get_auto_approve_file_path,
+    get_mock_cache_dir,
     save_auto_approve_list,
 )
 
@@ -123,26 +126,14 @@ async def create_dataset(
             real_dataset_path.write_bytes(dataset.file.read())
             logger.debug(f"Uploaded dataset temporarily saved to: {real_dataset_path}")
 
-            # TODO auto-generate mock dataset
             mock_path = Path(temp_dir) / "mock"
             mock_path.mkdir(parents=True, exist_ok=True)
-            mock_dataset_path = mock_path / f"{dataset.filename}"
-
-            # Hardcoded GitHub raw CSV URL
-            github_csv_url = "https://raw.githubusercontent.com/OpenMined/datasets/refs/heads/main/enclave/organic-coop/data/part_1/crop_stock_mock_1.csv"
-            try:
-                response = requests.get(github_csv_url)
-                response.raise_for_status()
-                mock_dataset_path.write_bytes(response.content)
-                logger.debug(
-                    f"Mock dataset downloaded and saved to: {mock_dataset_path}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to download mock dataset: {e}")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to download mock dataset from GitHub: {e}",
-                )
+            generate_mock_file(
+                real_dataset_path,
+                mock_path / f"{dataset.filename}",
+                get_settings().mock_dataset_rows,
+                cache_dir=get_mock_cache_dir(client),
+            )
 
             # TODO fix None bug in syft_rds/client/local_stores/dataset.py:274 (if not Path(description_path).exists())
             dummy_description_path = Path(temp_dir) / "dummy_description.txt"
@@ -207,26 +198,14 @@ async def add_dataset_from_shopify(
             real_dataset_path.write_text(dataset_df.to_csv())
             logger.debug(f"Uploaded dataset temporarily saved to: {real_dataset_path}")
 
-            # TODO auto-generate mock dataset
             mock_path = Path(temp_dir) / "mock"
             mock_path.mkdir(parents=True, exist_ok=True)
-            mock_dataset_path = mock_path / f"shopify.csv"
-
-            # Hardcoded GitHub raw CSV URL
-            github_csv_url = "https://raw.githubusercontent.com/OpenMined/datasets/refs/heads/main/enclave/organic-coop/data/part_1/crop_stock_mock_1.csv"
-            try:
-                response = requests.get(github_csv_url)
-                response.raise_for_status()
-                mock_dataset_path.write_bytes(response.content)
-                logger.debug(
-                    f"Mock dataset downloaded and saved to: {mock_dataset_path}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to download mock dataset: {e}")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to download mock dataset from GitHub: {e}",
-                )
+            generate_mock_file(
+                real_dataset_path,
+                mock_path / f"shopify.csv",
+                get_settings().mock_dataset_rows,
+                cache_dir=get_mock_cache_dir(client),
+            )
 
             # TODO fix None bug in syft_rds/client/local_stores/dataset.py:274 (if not Path(description_path).exists())
             dummy_description_path = Path(temp_dir) / "dummy_description.txt"
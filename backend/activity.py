@@ -0,0 +1,145 @@
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Literal, NamedTuple, Optional
+
+from syft_rds.client.rds_client import RDSClient
+
+from .events import get_event_hub
+from .job_index import JobIndex, get_job_index
+from .models import ActivityResponse, ChangeEvent, DatasetActivity
+
+PERIOD_DAYS = {"day": 1, "week": 7}
+
+
+class _JobRecord(NamedTuple):
+    dataset: str
+    day: date
+    status: str
+
+
+def _day(created_at: datetime) -> date:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).date()
+
+
+class ActivityRollup:
+    """
+    Jobs submitted per dataset and per day, split by current status.
+
+    The rollup is seeded once from the job index, then kept up to date from
+    the `EventHub` job events: each event moves one job between counters, so
+    reading the activity of every dataset never touches the job store. Jobs
+    are counted on the (UTC) day they were submitted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: Optional[JobIndex] = None
+        self._jobs: Dict[str, _JobRecord] = {}
+        self._counts: Dict[str, Dict[date, Counter[str]]] = {}
+
+    def start(self) -> None:
+        get_event_hub().add_listener(self._on_events)
+
+    def stop(self) -> None:
+        get_event_hub().remove_listener(self._on_events)
+
+    def _on_events(self, events: List[ChangeEvent]) -> None:
+        with self._lock:
+            for event in events:
+                if not event.type.startswith("job.") or event.uid is None:
+                    continue
+                if event.type == "job.deleted":
+                    self._set(event.uid, None)
+                elif event.created_at is not None:
+                    day = _day(event.created_at)
+                    record = _JobRecord(event.dataset_name, day, event.status)
+                    self._set(event.uid, record)
+
+    def _set(self, uid: str, record: Optional[_JobRecord]) -> None:
+        """Move a job's count to `record`, or drop it if `record` is None."""
+        previous = self._jobs.pop(uid, None)
+        if previous is not None:
+            days = self._counts[previous.dataset]
+            statuses = days[previous.day]
+            statuses[previous.status] -= 1
+            if not statuses[previous.status]:
+                del statuses[previous.status]
+                if not statuses:
+                    del days[previous.day]
+                    if not days:
+                        del self._counts[previous.dataset]
+        if record is not None:
+            self._jobs[uid] = record
+            days = self._counts.setdefault(record.dataset, {})
+            days.setdefault(record.day, Counter())[record.status] += 1
+
+    def _ensure_seeded(self, rds_client: RDSClient) -> None:
+        """Seed from the job index, again if the session was re-created."""
+        index = get_job_index(rds_client)
+        if index is self._index:
+            return
+        snapshot = index.snapshot()
+        with self._lock:
+            if self._index is not None:
+                self._jobs.clear()
+                self._counts.clear()
+            for uid, (status, dataset, created_at) in snapshot.items():
+                # jobs already seen through events are at least as recent
+                if uid not in self._jobs:
+                    self._set(uid, _JobRecord(dataset, _day(created_at), status))
+            self._index = index
+
+    def query(
+        self,
+        rds_client: RDSClient,
+        buckets: int,
+        period: Literal["day", "week"] = "week",
+    ) -> ActivityResponse:
+        """Counts of the last `buckets` periods of every dataset, oldest first."""
+        self._ensure_seeded(rds_client)
+
+        span = PERIOD_DAYS[period]
+        end = datetime.now(timezone.utc).date()
+        start = end - timedelta(days=buckets * span - 1)
+        window = [start + timedelta(days=i) for i in range(buckets * span)]
+
+        datasets = []
+        with self._lock:
+            for name, days in sorted(self._counts.items()):
+                total = [0] * buckets
+                by_status: Dict[str, List[int]] = {}
+                for i, day in enumerate(window):
+                    statuses = days.get(day)
+                    if not statuses:
+                        continue
+                    bucket = i // span
+                    for status, count in statuses.items():
+                        total[bucket] += count
+                        by_status.setdefault(status, [0] * buckets)[bucket] += count
+                if any(total):
+                    datasets.append(
+                        DatasetActivity(name=name, total=total, by_status=by_status)
+                    )
+        return ActivityResponse(period=period, start=start, end=end, datasets=datasets)
+
+
+_rollup: Optional[ActivityRollup] = None
+
+
+def get_activity_rollup() -> ActivityRollup:
+    """Get the process-wide activity rollup."""
+    global _rollup
+    if _rollup is None:
+        _rollup = ActivityRollup()
+        _rollup.start()
+    return _rollup
+
+
+def close_activity_rollup() -> None:
+    global _rollup
+    if _rollup is not None:
+        rollup, _rollup = _rollup, None
+        rollup.stop()
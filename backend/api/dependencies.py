@@ -2,11 +2,13 @@ from fastapi import HTTPException
 from loguru import logger
 from syft_core import Client
 
+from ..session import get_session_pool
+
 
 async def get_syftbox_client() -> Client:
-    """Dependency for getting the SyftBox client"""
+    """Dependency for getting the pooled SyftBox client"""
     try:
-        return Client.load()
+        return get_session_pool().get_syftbox_client()
     except Exception as e:
         logger.error(f"Failed to load SyftBox client: {e}")
         raise HTTPException(
@@ -1,12 +1,17 @@
-from typing import Dict
+from typing import Any, Dict
 from fastapi import APIRouter
-from .routers import datasets, jobs, trusted_datasites
+from .routers import datasets, events, jobs, tasks, trusted_datasites
+from ..approvals import get_approval_engine
+from ..executor import executor_metrics, run_io
+from ..session import get_session_pool
 
 
 v1_router = APIRouter(prefix="/v1")
 
 v1_router.include_router(datasets.router)
+v1_router.include_router(events.router)
 v1_router.include_router(jobs.router)
+v1_router.include_router(tasks.router)
 v1_router.include_router(trusted_datasites.router)
 
 api_router = APIRouter(prefix="/api")
@@ -17,11 +22,18 @@ api_router.include_router(v1_router)
     "/health",
     summary="Health check endpoint",
     description="Check if the API is running properly",
-    response_model=Dict[str, str],
+    response_model=Dict[str, Any],
     tags=["health"],
 )
-async def health_check() -> Dict[str, str]:
-    return {"status": "healthy"}
+async def health_check() -> Dict[str, Any]:
+    syftbox = await run_io(get_session_pool().health)
+    approval_engine = get_approval_engine()
+    return {
+        "status": syftbox["status"],
+        "syftbox": syftbox,
+        "executors": executor_metrics(),
+        "auto_approval": approval_engine.metrics() if approval_engine else None,
+    }
 
 
 __all__ = ["api_router"]
@@ -1,7 +1,9 @@
-from . import datasets, jobs, trusted_datasites
+from . import datasets, events, jobs, tasks, trusted_datasites
 
 __all__ = [
     "datasets",
+    "events",
     "jobs",
+    "tasks",
     "trusted_datasites",
 ]
@@ -1,8 +1,17 @@
 import traceback
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
 from pydantic import BaseModel, Field, HttpUrl
 from syft_core import Client as SyftBoxClient
@@ -14,7 +23,16 @@ from backend.dev import debug_delay
 from ..dependencies import get_syftbox_client
 from ..services.dataset_service import DatasetService
 from ..services.shopify_service import ShopifyService
-from ...models import ListDatasetsResponse, Dataset as DatasetModel
+from ...lib.columnar import DownloadFormat
+from ...models import (
+    ActivityResponse,
+    DatasetPreview,
+    DatasetProfile,
+    ListDatasetsResponse,
+    SourceSyncState,
+    SyncStatusResponse,
+    TaskStatus,
+)
 
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
@@ -28,20 +46,40 @@ router = APIRouter(prefix="/datasets", tags=["datasets"])
 )
 async def get_datasets(
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> ListDatasetsResponse:
+) -> Response:
     """Get all datasets available in the system."""
     service = DatasetService(syftbox_client)
     return await service.list_datasets()
 
 
+@router.get(
+    "/activity",
+    summary="Get dataset activity",
+    description="Count the jobs submitted to each dataset over the last "
+    "`buckets` days or weeks, in total and by status. The last bucket ends today.",
+    response_model=ActivityResponse,
+)
+async def get_datasets_activity(
+    buckets: int = Query(12, ge=1, le=366, description="Number of periods"),
+    period: Literal["day", "week"] = Query("week", description="Bucket length"),
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> ActivityResponse:
+    """Get the activity graph data of all datasets."""
+    service = DatasetService(syftbox_client)
+    return await service.get_activity(buckets, period)
+
+
 @router.post(
     "/create-from-file",
-    status_code=201,
+    status_code=202,
     summary="Create a new dataset",
-    description="Create a new dataset with a dataset file, name, and description",
-    response_model=DatasetModel,
+    description="Upload a dataset file, name, and description and queue the "
+    "creation of the dataset. Poll the returned task for progress; its result "
+    "is the new dataset.",
+    response_model=TaskStatus,
 )
 async def dataset_create_from_file(
+    response: Response,
     dataset: UploadFile = File(..., description="The dataset file to upload"),
     name: str = Form(
         ..., min_length=1, max_length=100, description="The name of the dataset"
@@ -52,10 +90,12 @@ async def dataset_create_from_file(
         description="Brief description of the dataset",
     ),
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> DatasetModel:
+) -> TaskStatus:
     """Create a new dataset from an uploaded file."""
     service = DatasetService(syftbox_client)
-    return await service.create_dataset(dataset, name, description)
+    task = await service.create_dataset(dataset, name, description)
+    response.headers["Location"] = f"/api/v1/tasks/{task.id}"
+    return task
 
 
 class ImportShopifyRequestBody(BaseModel):
@@ -69,23 +109,28 @@ class ImportShopifyRequestBody(BaseModel):
 
 @router.post(
     "/import-from-shopify",
-    status_code=201,
+    status_code=202,
     summary="Add a dataset from Shopify",
-    response_model=DatasetModel,
+    description="Queue the import of a Shopify store as a dataset. Poll the "
+    "returned task for progress; its result is the new dataset.",
+    response_model=TaskStatus,
 )
 async def dataset_import_from_shopify(
     data: ImportShopifyRequestBody,
+    response: Response,
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> DatasetModel:
+) -> TaskStatus:
     """Create a dataset by importing data from a Shopify store."""
     try:
         shopify_service = ShopifyService(syftbox_client)
-        return await shopify_service.create_dataset_from_shopify(
+        task = await shopify_service.create_dataset_from_shopify(
             url=str(data.url),
             name=data.name,
             pat=data.pat,
             description=data.description,
         )
+        response.headers["Location"] = f"/api/v1/tasks/{task.id}"
+        return task
     except HTTPException:
         raise
     except Exception as e:
@@ -107,6 +152,48 @@ async def dataset_sync_shopify(
     return await shopify_service.sync_dataset(dataset_uid)
 
 
+@router.get(
+    "/sync-shopify-dataset/{dataset_uid}",
+    summary="Get the last sync of a dataset imported from Shopify",
+    description="Return when the dataset was last synced and how it went, "
+    "without contacting the store.",
+    response_model=SourceSyncState,
+)
+async def dataset_sync_shopify_state(
+    dataset_uid: str,
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> SourceSyncState:
+    shopify_service = ShopifyService(syftbox_client)
+    return await shopify_service.sync_state(dataset_uid)
+
+
+@router.post(
+    "/sync-shopify-datasets",
+    status_code=202,
+    summary="Sync all datasets imported from Shopify",
+    description="Queue a sync of every Shopify-backed dataset and return the "
+    "scheduler status. Datasets that are already syncing are not queued twice.",
+    response_model=SyncStatusResponse,
+)
+async def datasets_sync_shopify(
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> SyncStatusResponse:
+    shopify_service = ShopifyService(syftbox_client)
+    return await shopify_service.sync_all_datasets()
+
+
+@router.get(
+    "/sync-shopify-datasets",
+    summary="Get the progress of Shopify syncs",
+    response_model=SyncStatusResponse,
+)
+async def datasets_sync_shopify_status(
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> SyncStatusResponse:
+    shopify_service = ShopifyService(syftbox_client)
+    return shopify_service.sync_status()
+
+
 class UpdateDatasetRequestBody(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -158,15 +245,58 @@ async def delete_dataset(
 @router.get(
     "/{dataset_uuid}/private",
     summary="Download dataset private file",
-    description="Download the private file for a specific dataset using its UUID",
+    description="Download the private file for a specific dataset using its UUID. "
+    "Supports Range requests and If-None-Match / If-Modified-Since validators. "
+    "Tabular datasets can be converted to another format with `format`.",
 )
 async def download_dataset_private(
     dataset_uuid: str,
+    request: Request,
+    format: Optional[DownloadFormat] = Query(
+        None, description="Convert the file to csv, parquet or arrow (IPC stream)"
+    ),
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> StreamingResponse:
+) -> Response:
     """Download the private file of a dataset."""
     service = DatasetService(syftbox_client)
-    return await service.download_private_file(dataset_uuid)
+    return await service.download_private_file(
+        dataset_uuid, request.headers, format=format
+    )
+
+
+@router.get(
+    "/{dataset_uuid}/profile",
+    summary="Get dataset profile",
+    description="Row count and per-column dtype, null rate, range and mean of a "
+    "tabular dataset, computed once when the data was imported.",
+    response_model=DatasetProfile,
+)
+async def get_dataset_profile(
+    dataset_uuid: str,
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> DatasetProfile:
+    """Get the profile of a dataset."""
+    service = DatasetService(syftbox_client)
+    return await service.get_profile(dataset_uuid)
+
+
+@router.get(
+    "/{dataset_uuid}/preview",
+    summary="Preview dataset rows",
+    description="Read `rows` rows of the mock or private file of a tabular "
+    "dataset, starting at row `offset`. Only the requested rows are read.",
+    response_model=DatasetPreview,
+)
+async def preview_dataset(
+    dataset_uuid: str,
+    which: Literal["mock", "private"] = Query("mock", description="File to read"),
+    rows: int = Query(50, ge=1, le=1000, description="Number of rows"),
+    offset: int = Query(0, ge=0, description="Index of the first row"),
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> DatasetPreview:
+    """Preview the rows of a dataset."""
+    service = DatasetService(syftbox_client)
+    return await service.get_preview(dataset_uuid, which, rows, offset)
 
 
 @router.get("/open-local-directory/{dataset_uid}")
@@ -0,0 +1,40 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from ...config import get_settings
+from ...events import get_event_hub
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get(
+    "",
+    summary="Stream change events",
+    description="Server-Sent Events stream of dataset, job and trust list changes. "
+    "Each event's name is its type (e.g. `job.submitted`) and its data the "
+    "ChangeEvent as JSON. A `resync` event means events were dropped because "
+    "the client fell behind, and views should be re-fetched.",
+    response_class=StreamingResponse,
+)
+async def stream_events() -> StreamingResponse:
+    hub = get_event_hub()
+
+    async def events() -> AsyncIterator[str]:
+        # subscribed only once streaming starts, so a client that disconnects
+        # before the first chunk never leaves a subscriber behind
+        subscriber = hub.subscribe()
+        try:
+            heartbeat = get_settings().events_heartbeat_interval
+            async for message in hub.stream(subscriber, heartbeat):
+                yield message
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends
+from collections import Counter
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field, field_validator
 from syft_core import Client as SyftBoxClient
+from syft_rds.models.models import JobStatus
 
 from ..dependencies import get_syftbox_client
 from ..services.job_service import JobService
-from ...models import ListJobsResponse
+from ...models import BatchJobDecisionResponse, JobDecision, ListJobsResponse
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -14,15 +19,67 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.get(
     "",
     summary="List all jobs",
-    description="Retrieve a list of all jobs in the system",
+    description="Retrieve the jobs in the system, filtered by status, requester "
+    "and dataset and sorted by creation time. With `limit`, results are paged: "
+    "pass the returned `nextCursor` as `cursor` to get the next page. "
+    "`view=summary` returns only the fields shown in the jobs list.",
     response_model=ListJobsResponse,
 )
 async def list_jobs(
+    status: Optional[List[JobStatus]] = Query(
+        None, description="Only jobs in one of these statuses"
+    ),
+    requester: Optional[str] = Query(None, description="Email of the requester"),
+    dataset: Optional[str] = Query(None, description="Name of the dataset"),
+    order: Literal["asc", "desc"] = Query("desc", description="By creation time"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = Query(
+        "full", description="All job fields, or only the listed ones"
+    ),
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> ListJobsResponse:
+) -> Response:
     """Get all jobs in the system."""
     service = JobService(syftbox_client)
-    return await service.list_jobs()
+    return await service.list_jobs(
+        statuses=[s.value for s in status] if status is not None else None,
+        requester=requester,
+        dataset=dataset,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+        view=view,
+    )
+
+
+class BatchJobDecisionBody(BaseModel):
+    decisions: List[JobDecision] = Field(..., min_length=1, max_length=1000)
+
+    @field_validator("decisions")
+    @classmethod
+    def one_decision_per_job(cls, decisions: List[JobDecision]) -> List[JobDecision]:
+        counts = Counter(decision.uid for decision in decisions)
+        duplicates = sorted(uid for uid, count in counts.items() if count > 1)
+        if duplicates:
+            raise ValueError(
+                f"More than one decision for jobs: {', '.join(duplicates)}"
+            )
+        return decisions
+
+
+@router.post(
+    "/batch",
+    summary="Approve or reject many jobs",
+    description="Apply a list of approve/reject decisions in one request. "
+    "Each decision is reported separately; a failing job doesn't stop the others.",
+    response_model=BatchJobDecisionResponse,
+)
+async def decide_jobs(
+    data: BatchJobDecisionBody,
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> BatchJobDecisionResponse:
+    service = JobService(syftbox_client)
+    return await service.decide_many(data.decisions)
 
 
 @router.post(
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+
+from ...models import ListTasksResponse, TaskStatus
+from ...tasks import get_task_manager
+
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.get(
+    "",
+    summary="List background tasks",
+    description="List queued, running and recently finished tasks",
+    response_model=ListTasksResponse,
+)
+async def list_tasks() -> ListTasksResponse:
+    return ListTasksResponse(tasks=get_task_manager().list())
+
+
+@router.get(
+    "/{task_id}",
+    summary="Get a background task",
+    description="Get the state, phase, progress and timings of a task",
+    response_model=TaskStatus,
+)
+async def get_task(task_id: str) -> TaskStatus:
+    task = get_task_manager().get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+    return task
+
+
+@router.post(
+    "/{task_id}/cancel",
+    status_code=202,
+    summary="Cancel a background task",
+    description="Queued tasks are dropped, running tasks stop at their next phase",
+    response_model=TaskStatus,
+)
+async def cancel_task(task_id: str) -> TaskStatus:
+    task = get_task_manager().cancel(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+    return task
@@ -1,13 +1,12 @@
 from typing import List
 
 from fastapi import APIRouter, Body, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from syft_core import Client as SyftBoxClient
 
 from ..dependencies import get_syftbox_client
 from ..services.trusted_datasites_service import TrustedDatasitesService
-from ...models import ListAutoApproveResponse
+from ...models import ListAutoApproveResponse, TrustedDatasitesUpdateResponse
 
 
 router = APIRouter(prefix="/trusted-datasites", tags=["trusted-datasites"])
@@ -36,12 +35,36 @@ class SetTrustedDatasitesBody(BaseModel):
 @router.post(
     "",
     summary="Sets the auto-approve list",
-    description="Sets the list of emails that are auto-approved. This will replace the existing list.",
+    description="Sets the list of emails that are auto-approved. This will replace the existing list. "
+    "Only datasets whose auto-approval list differs are updated, "
+    "and the outcome for each dataset is reported.",
+    response_model=TrustedDatasitesUpdateResponse,
 )
 async def set_auto_approved_datasites(
     data: SetTrustedDatasitesBody,
     syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
-) -> JSONResponse:
+) -> TrustedDatasitesUpdateResponse:
     """Update the auto-approve list with new emails."""
     service = TrustedDatasitesService(syftbox_client)
     return await service.set_auto_approved_datasites(data.datasites)
+
+
+class PatchTrustedDatasitesBody(BaseModel):
+    add: List[str] = Field(default=[], description="Entries to trust.")
+    remove: List[str] = Field(default=[], description="Entries to stop trusting.")
+
+
+@router.patch(
+    "",
+    summary="Edit the auto-approve list",
+    description="Add and remove entries without replacing the list. Entries are "
+    "emails, '*@domain' for a whole domain or '*@*.domain' for its subdomains. "
+    "Datasets get the same additions and removals.",
+    response_model=TrustedDatasitesUpdateResponse,
+)
+async def patch_auto_approved_datasites(
+    data: PatchTrustedDatasitesBody,
+    syftbox_client: SyftBoxClient = Depends(get_syftbox_client),
+) -> TrustedDatasitesUpdateResponse:
+    service = TrustedDatasitesService(syftbox_client)
+    return await service.patch_auto_approved_datasites(data.add, data.remove)
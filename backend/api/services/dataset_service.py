@@ -1,22 +1,48 @@
 # backend/api/services/dataset_service.py
+import functools
 from pathlib import Path
+import shutil
 import tempfile
-from typing import Iterator, Literal
+from typing import BinaryIO, Literal, Optional
 import webbrowser
 
 from fastapi import HTTPException, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from loguru import logger
-import requests
+from starlette.datastructures import Headers
 from syft_core import Client as SyftBoxClient
-from syft_core.url import SyftBoxURL
-from syft_rds import init_session
 from syft_rds.models.models import DatasetUpdate
 from syft_rds.client.exceptions import DatasetNotFoundError
 
-from ...models import ListDatasetsResponse, Dataset as DatasetModel
-from ...sources import find_source
-from ...utils import get_auto_approve_list
+from ...activity import get_activity_rollup
+from ...catalog import get_dataset_catalog
+from ...config import get_settings
+from ...executor import run_io
+from ...lib.columnar import (
+    MEDIA_TYPES,
+    DownloadFormat,
+    csv_to_parquet,
+    file_format,
+    iter_converted,
+    require_pyarrow,
+    use_parquet_storage,
+)
+from ...lib.file_responses import conditional_file_response
+from ...lib.json_responses import RawJSONResponse
+from ...lib.mock import generate_mock_file
+from ...lib.preview import preview_file
+from ...lib.uploads import StoredUpload, copy_upload, upload_too_large
+from ...models import (
+    ActivityResponse,
+    DatasetPreview,
+    DatasetProfile,
+    Dataset as DatasetModel,
+    TaskStatus,
+)
+from ...profiles import compute_profile, get_profile_store, private_file
+from ...session import get_session_pool
+from ...tasks import TaskContext, get_task_manager
+from ...utils import get_auto_approve_list, get_mock_cache_dir
 
 
 class DatasetService:
@@ -24,42 +50,30 @@ class DatasetService:
 
     def __init__(self, syftbox_client: SyftBoxClient):
         self.syftbox_client = syftbox_client
-        self.rds_client = init_session(syftbox_client.email)
-
-    async def list_datasets(self) -> ListDatasetsResponse:
-        """List all datasets with proper formatting."""
-        datasets = [
-            DatasetModel.model_validate(dataset)
-            for dataset in self.rds_client.dataset.get_all()
-        ]
-
-        # Process datasets to fix temporary issues with RDS
-        for dataset in datasets:
-            private_file_path = next(dataset.private_path.iterdir(), None)
-            dataset.private = SyftBoxURL.from_path(
-                private_file_path, self.syftbox_client.workspace
-            )
-
-            mock_file_path = next(dataset.mock_path.iterdir(), None)
-            dataset.mock = SyftBoxURL.from_path(
-                mock_file_path, self.syftbox_client.workspace
-            )
+        self.rds_client = get_session_pool().get_rds_client(syftbox_client.email)
+        self.catalog = get_dataset_catalog(syftbox_client, self.rds_client)
 
-            dataset.readme = None
-            dataset.private_size = (
-                private_file_path.stat().st_size if private_file_path else "1 B"
-            )
-            dataset.mock_size = (
-                mock_file_path.stat().st_size if mock_file_path else "1 B"
-            )
-            dataset.source = find_source(dataset.uid)
+    async def list_datasets(self) -> RawJSONResponse:
+        """List all datasets, serialised once per change of the catalog."""
+        return RawJSONResponse(await run_io(self.catalog.render))
 
-        return ListDatasetsResponse(datasets=datasets)
+    async def get_activity(
+        self, buckets: int, period: Literal["day", "week"]
+    ) -> ActivityResponse:
+        """Jobs submitted per dataset over the last `buckets` periods."""
+        return await run_io(
+            get_activity_rollup().query, self.rds_client, buckets, period
+        )
 
     async def create_dataset(
         self, dataset_file: UploadFile, name: str, description: str
-    ) -> DatasetModel:
-        """Create a new dataset from uploaded file."""
+    ) -> TaskStatus:
+        """
+        Stage an uploaded file and queue a task that creates a dataset from it.
+
+        The upload is copied out of the request before returning, since the
+        request's file is closed once the response is sent.
+        """
         try:
             # Validate file type
             if not dataset_file.content_type:
@@ -67,41 +81,54 @@ class DatasetService:
                     status_code=400,
                     detail=f"Invalid file type for {dataset_file.filename}",
                 )
-
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save real dataset
-                real_path = Path(temp_dir) / "real"
-                real_path.mkdir(parents=True, exist_ok=True)
-                real_dataset_path = real_path / dataset_file.filename
-                real_dataset_path.write_bytes(await dataset_file.read())
-                logger.debug(
-                    f"Uploaded dataset temporarily saved to: {real_dataset_path}"
+            settings = get_settings()
+            if dataset_file.content_type not in settings.allowed_file_types:
+                raise HTTPException(
+                    status_code=415,
+                    detail=f"Unsupported file type '{dataset_file.content_type}'",
                 )
-
-                # Create mock dataset
-                mock_path = Path(temp_dir) / "mock"
-                mock_path.mkdir(parents=True, exist_ok=True)
-                mock_dataset_path = mock_path / dataset_file.filename
-
-                # Download mock data (temporary solution)
-                await self._download_mock_dataset(mock_dataset_path)
-
-                # Create dummy description file (temporary fix for RDS bug)
-                dummy_description_path = Path(temp_dir) / "dummy_description.txt"
-                dummy_description_path.touch()
-
-                # Create dataset in RDS
-                dataset = self.rds_client.dataset.create(
-                    name=name,
-                    summary=description,
-                    path=real_path,
-                    mock_path=mock_path,
-                    description_path=dummy_description_path,
-                    auto_approval=get_auto_approve_list(self.syftbox_client),
+            if dataset_file.size and dataset_file.size > settings.max_upload_size:
+                raise upload_too_large(settings.max_upload_size)
+
+            staging_dir = Path(await run_io(tempfile.mkdtemp, prefix="dataset-"))
+            try:
+                upload = await run_io(
+                    self._stage_upload,
+                    dataset_file.file,
+                    dataset_file.filename,
+                    staging_dir,
+                )
+            except BaseException:
+                await run_io(shutil.rmtree, staging_dir, ignore_errors=True)
+                raise
+
+            async def create(task: TaskContext) -> dict:
+                task.add_bytes(upload.size)
+                dataset = await run_io(
+                    self._create_dataset,
+                    task,
+                    staging_dir,
+                    upload,
+                    name,
+                    description,
                 )
+                self.catalog.invalidate()
 
                 logger.debug(f"Dataset created: {dataset}")
-                return DatasetModel.model_validate(dataset)
+                return DatasetModel.model_validate(dataset).model_dump(
+                    mode="json", by_alias=True
+                )
+
+            # the staged copy is removed however the task ends, even if it
+            # is cancelled before it starts
+            return get_task_manager().submit(
+                "create-dataset",
+                create,
+                bytes_total=upload.size,
+                cleanup=functools.partial(
+                    shutil.rmtree, staging_dir, ignore_errors=True
+                ),
+            )
 
         except HTTPException:
             raise
@@ -109,13 +136,91 @@ class DatasetService:
             logger.error(f"Error creating dataset: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    def _stage_upload(
+        self, source: BinaryIO, filename: str, staging_dir: Path
+    ) -> StoredUpload:
+        # never let the client-supplied name escape the staging directory
+        filename = Path(filename).name
+
+        # Stream the real dataset to disk
+        real_path = staging_dir / "real"
+        real_path.mkdir(parents=True, exist_ok=True)
+        upload = copy_upload(
+            source, real_path / filename, get_settings().max_upload_size
+        )
+        logger.debug(
+            f"Uploaded dataset temporarily saved to: {upload.path} "
+            f"({upload.size} bytes, sha256={upload.sha256})"
+        )
+        return upload
+
+    def _create_dataset(
+        self,
+        task: TaskContext,
+        staging_dir: Path,
+        upload: StoredUpload,
+        name: str,
+        description: str,
+    ):
+        settings = get_settings()
+        real_path = upload.path.parent
+        real_file = upload.path
+        if (
+            use_parquet_storage(settings.dataset_storage_format)
+            and file_format(real_file) == "csv"
+        ):
+            task.set_phase("converting")
+            real_file = real_file.with_suffix(".parquet")
+            csv_to_parquet(upload.path, real_file)
+
+        # Generate a synthetic mock with the same schema
+        task.set_phase("generating_mock")
+        mock_path = staging_dir / "mock"
+        mock_path.mkdir(parents=True, exist_ok=True)
+        generate_mock_file(
+            upload.path,
+            mock_path / real_file.name,
+            settings.mock_dataset_rows,
+            cache_dir=get_mock_cache_dir(self.syftbox_client),
+            content_hash=upload.sha256,
+        )
+        if real_file != upload.path:
+            upload.path.unlink()
+
+        # Profile the stored file while it is still hot in the page cache
+        task.set_phase("profiling")
+        profile = compute_profile(real_file)
+
+        # Create dummy description file (temporary fix for RDS bug)
+        dummy_description_path = staging_dir / "dummy_description.txt"
+        dummy_description_path.touch()
+
+        # Create dataset in RDS
+        task.set_phase("creating")
+        dataset = self.rds_client.dataset.create(
+            name=name,
+            summary=description,
+            path=real_path,
+            mock_path=mock_path,
+            description_path=dummy_description_path,
+            auto_approval=get_auto_approve_list(self.syftbox_client),
+        )
+        get_profile_store(self.syftbox_client).save_for(
+            dataset.uid, profile, dataset.private_path
+        )
+        return dataset
+
     async def update_dataset(self, dataset_update: DatasetUpdate) -> DatasetModel:
-        return self.rds_client.dataset.update(dataset_update)
+        try:
+            return await run_io(self.rds_client.dataset.update, dataset_update)
+        finally:
+            self.catalog.invalidate()
 
     async def delete_dataset(self, dataset_name: str) -> JSONResponse:
         """Delete a dataset by name."""
         try:
-            delete_res = self.rds_client.dataset.delete(dataset_name)
+            delete_res = await run_io(self.rds_client.dataset.delete, dataset_name)
+            self.catalog.invalidate()
             if not delete_res:
                 raise HTTPException(
                     status_code=404, detail=f"Unable to delete dataset '{dataset_name}'"
@@ -132,36 +237,52 @@ class DatasetService:
             logger.error(f"Error deleting dataset {dataset_name}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def download_private_file(self, dataset_uuid: str) -> StreamingResponse:
-        """Download the private file for a dataset."""
+    async def download_private_file(
+        self,
+        dataset_uuid: str,
+        request_headers: Headers,
+        format: Optional[DownloadFormat] = None,
+    ) -> Response:
+        """Download the private file for a dataset.
+
+        Supports conditional requests (ETag / Last-Modified) and byte ranges.
+        When `format` differs from the stored format, tabular files are
+        converted on the fly and streamed one row group at a time.
+        """
         try:
-            dataset = self.rds_client.dataset.get(uid=dataset_uuid)
-            if not dataset:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Dataset with UUID '{dataset_uuid}' not found",
-                )
-
-            dataset = DatasetModel.model_validate(dataset)
-            private_file_path = next(dataset.private_path.iterdir(), None)
+            dataset, private_file_path = await run_io(
+                self._get_private_file, dataset_uuid
+            )
 
-            if not private_file_path or not private_file_path.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Private file not found for dataset '{dataset_uuid}'",
+            stored_format = file_format(private_file_path)
+            if format is not None and format != stored_format:
+                if stored_format is None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Dataset '{dataset.name}' is not tabular and can't "
+                        f"be converted to {format}",
+                    )
+                require_pyarrow()
+                chunks = await run_io(iter_converted, private_file_path, format)
+                filename = f"{dataset.name}.{format}"
+                return StreamingResponse(
+                    chunks,
+                    media_type=MEDIA_TYPES[format],
+                    headers={
+                        "Content-Disposition": f'attachment; filename="{filename}"'
+                    },
                 )
 
-            def iterfile() -> Iterator[bytes]:
-                with open(private_file_path, "rb") as file:
-                    yield from file
+            stat_result = await run_io(private_file_path.stat)
 
             extension = private_file_path.suffix
             filename = f"{dataset.name}{extension}"
 
-            return StreamingResponse(
-                iterfile(),
-                media_type="application/octet-stream",
-                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            return conditional_file_response(
+                private_file_path,
+                request_headers,
+                filename=filename,
+                stat_result=stat_result,
             )
 
         except HTTPException:
@@ -172,25 +293,88 @@ class DatasetService:
             )
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def _download_mock_dataset(self, mock_dataset_path: Path) -> None:
-        """Download mock dataset from GitHub (temporary solution)."""
-        # TODO: Replace with auto-generated mock dataset
-        github_csv_url = "https://raw.githubusercontent.com/OpenMined/datasets/refs/heads/main/enclave/organic-coop/data/part_1/crop_stock_mock_1.csv"
+    async def get_profile(self, dataset_uuid: str) -> DatasetProfile:
+        """
+        The profile of a dataset, as computed at ingest.
+
+        Datasets ingested before profiling existed, or whose file was
+        replaced outside the app, are profiled once here and stored.
+        """
+        profile = await run_io(self._get_profile, dataset_uuid)
+        if profile is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No profile available for dataset '{dataset_uuid}'",
+            )
+        return profile
+
+    async def get_preview(
+        self,
+        dataset_uuid: str,
+        which: Literal["mock", "private"],
+        rows: int,
+        offset: int,
+    ) -> DatasetPreview:
+        """Rows `offset` to `offset + rows` of the mock or private file."""
         try:
-            response = requests.get(github_csv_url)
-            response.raise_for_status()
-            mock_dataset_path.write_bytes(response.content)
-            logger.debug(f"Mock dataset downloaded and saved to: {mock_dataset_path}")
-        except Exception as e:
-            logger.error(f"Failed to download mock dataset: {e}")
+            page = await run_io(self._get_preview, dataset_uuid, which, rows, offset)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return DatasetPreview(which=which, offset=offset, **page)
+
+    def _get_preview(
+        self,
+        dataset_uuid: str,
+        which: Literal["mock", "private"],
+        rows: int,
+        offset: int,
+    ) -> dict:
+        dataset, path = self._get_private_file(dataset_uuid)
+        if which == "mock":
+            path = private_file(dataset.mock_path)
+            if path is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Mock file not found for dataset '{dataset_uuid}'",
+                )
+        return preview_file(path, offset, rows)
+
+    def _get_profile(self, dataset_uuid: str) -> Optional[DatasetProfile]:
+        _, private_file_path = self._get_private_file(dataset_uuid)
+        store = get_profile_store(self.syftbox_client)
+        profile = store.get(dataset_uuid, private_file_path)
+        if profile is None:
+            profile = compute_profile(private_file_path)
+            if profile is not None:
+                store.save(dataset_uuid, profile, private_file_path)
+        return profile
+
+    def _get_private_file(self, dataset_uuid: str) -> tuple[DatasetModel, Path]:
+        dataset = self.rds_client.dataset.get(uid=dataset_uuid)
+        if not dataset:
             raise HTTPException(
-                status_code=400,
-                detail=f"Failed to download mock dataset from GitHub: {e}",
+                status_code=404,
+                detail=f"Dataset with UUID '{dataset_uuid}' not found",
             )
 
+        dataset = DatasetModel.model_validate(dataset)
+        private_file_path = next(dataset.private_path.iterdir(), None)
+
+        if not private_file_path or not private_file_path.exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"Private file not found for dataset '{dataset_uuid}'",
+            )
+        return dataset, private_file_path
+
     async def open_local_directory(
         self, dataset_uid: str, which: Literal["private", "mock"] = "private"
     ):
+        await run_io(self._open_local_directory, dataset_uid, which)
+
+    def _open_local_directory(
+        self, dataset_uid: str, which: Literal["private", "mock"]
+    ) -> None:
         dataset = self.rds_client.dataset.get(uid=dataset_uid)
         if not dataset:
             raise DatasetNotFoundError(f"Dataset with uid {dataset_uid} does not exist")
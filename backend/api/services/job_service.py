@@ -1,11 +1,21 @@
+import asyncio
+from typing import List, Literal, Optional
 import webbrowser
 
 from fastapi import HTTPException
 from loguru import logger
 from syft_core import Client as SyftBoxClient
-from syft_rds import init_session
 
-from ...models import ListJobsResponse
+from ...config import get_settings
+from ...executor import run_io
+from ...job_index import JobView, get_job_index
+from ...lib.json_responses import RawJSONResponse
+from ...models import (
+    BatchJobDecisionResponse,
+    JobDecision,
+    JobDecisionResult,
+)
+from ...session import get_session_pool
 
 
 class JobService:
@@ -13,67 +23,134 @@ class JobService:
 
     def __init__(self, syftbox_client: SyftBoxClient):
         self.syftbox_client = syftbox_client
-        self.rds_client = init_session(syftbox_client.email)
+        self.rds_client = get_session_pool().get_rds_client(syftbox_client.email)
 
-    async def list_jobs(self) -> ListJobsResponse:
-        """List all jobs in the system."""
+    async def list_jobs(
+        self,
+        statuses: Optional[List[str]] = None,
+        requester: Optional[str] = None,
+        dataset: Optional[str] = None,
+        order: Literal["asc", "desc"] = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: JobView = "full",
+    ) -> RawJSONResponse:
+        """
+        List jobs matching the filters, newest first by default.
+
+        The body is a `ListJobsResponse` serialised by the job index, which
+        reuses it while the matching jobs are unchanged.
+        """
         try:
-            jobs = self.rds_client.jobs.get_all()
-            return ListJobsResponse(jobs=jobs)
+            body = await run_io(
+                get_job_index(self.rds_client).render,
+                statuses=statuses,
+                requester=requester,
+                dataset=dataset,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+                view=view,
+            )
+            return RawJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error listing jobs: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def decide_many(
+        self, decisions: List[JobDecision]
+    ) -> BatchJobDecisionResponse:
+        """
+        Approve or reject many jobs in one go.
+
+        All jobs are resolved with a single index lookup and the decisions
+        are applied concurrently; a failing job doesn't stop the others.
+        """
+        index = get_job_index(self.rds_client)
+        jobs = await run_io(index.get_many, {d.uid for d in decisions})
+        semaphore = asyncio.Semaphore(get_settings().auto_approval_update_concurrency)
+
+        async def decide(decision: JobDecision) -> JobDecisionResult:
+            result = JobDecisionResult(
+                uid=decision.uid, action=decision.action, status="failed"
+            )
+            job = jobs[decision.uid]
+            if job is None:
+                result.status = "not_found"
+                result.error = f"Job with UID '{decision.uid}' not found"
+                return result
+
+            async with semaphore:
+                try:
+                    if decision.action == "approve":
+                        await run_io(self.rds_client.jobs.approve, job)
+                        result.status = "approved"
+                    else:
+                        reason = decision.reason or "Unspecified"
+                        await run_io(self.rds_client.jobs.reject, job, reason)
+                        result.status = "rejected"
+                except Exception as e:
+                    logger.error(f"Error deciding job {decision.uid}: {e}")
+                    result.error = str(e)
+            return result
+
+        results = await asyncio.gather(*(decide(d) for d in decisions))
+        counts = {"approved": 0, "rejected": 0, "failed": 0}
+        for result in results:
+            counts["failed" if result.error else result.status] += 1
+        logger.info(f"Decided {len(results)} jobs: {counts}")
+        return BatchJobDecisionResponse(**counts, results=results)
+
     async def open_job_code(self, job_uid: str) -> None:
         """Open the job code directory in the file browser."""
         try:
-            job = self.rds_client.jobs.get(uid=job_uid)
+            job = await run_io(self.rds_client.jobs.get, uid=job_uid)
             if not job:
                 raise HTTPException(
                     status_code=404, detail=f"Job with UID '{job_uid}' not found"
                 )
 
             # Open the job's code directory
-            webbrowser.open(f"file://{job.user_code.local_dir}")
+            user_code = await run_io(lambda: job.user_code)
+            await run_io(webbrowser.open, f"file://{user_code.local_dir}")
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error opening job code: {e}")
             raise HTTPException(status_code=500, detail=str(e))
-        
 
     async def approve(self, job_uid: str):
         """Approve a job request by its UID."""
         try:
-            job = self.rds_client.jobs.get(uid=job_uid)
+            job = await run_io(self.rds_client.jobs.get, uid=job_uid)
             if not job:
                 raise HTTPException(
                     status_code=404, detail=f"Job with UID '{job_uid}' not found"
                 )
 
-            self.rds_client.jobs.approve(job)
+            await run_io(self.rds_client.jobs.approve, job)
             logger.info(f"Job {job_uid} approved.")
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error approving job: {e}")
             raise HTTPException(status_code=500, detail=str(e))
-        
+
     async def reject(self, job_uid: str):
         """Reject a job request by its UID."""
         try:
-            job = self.rds_client.jobs.get(uid=job_uid)
+            job = await run_io(self.rds_client.jobs.get, uid=job_uid)
             if not job:
                 raise HTTPException(
                     status_code=404, detail=f"Job with UID '{job_uid}' not found"
                 )
 
-            self.rds_client.jobs.reject(job)
+            await run_io(self.rds_client.jobs.reject, job)
             logger.info(f"Job {job_uid} rejected.")
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error rejecting job: {e}")
             raise HTTPException(status_code=500, detail=str(e))
-        
-
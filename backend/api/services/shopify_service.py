@@ -1,19 +1,43 @@
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
 import tempfile
-import traceback
-from typing import Optional
+import time
+from typing import List, Optional
 
 from fastapi import HTTPException
+import httpx
 from loguru import logger
-import requests
+import pandas as pd
 from syft_core import Client as SyftBoxClient
-from syft_rds import init_session
 from syft_rds.models.models import DatasetUpdate
 
-from ...lib.shopify import shopify_json_to_dataframe
-from ...models import Dataset as DatasetModel
-from ...sources import ShopifySource, add_dataset_source, find_source
-from ...utils import get_auto_approve_list
+from ...catalog import get_dataset_catalog
+from ...config import get_settings
+from ...executor import run_cpu, run_io
+from ...lib.columnar import use_parquet_storage, write_dataframe
+from ...lib.mock import generate_mock_file
+from ...lib.shopify import (
+    drop_unchanged_products,
+    latest_updated_at,
+    merge_shopify_dataframes,
+    read_shopify_file,
+    shopify_json_to_dataframe,
+    variantless_product_ids,
+)
+from ...lib.shopify_client import get_shopify_client
+from ...models import (
+    Dataset as DatasetModel,
+    SourceSyncState,
+    SyncStatusResponse,
+    TaskStatus,
+)
+from ...profiles import compute_profile, get_profile_store
+from ...session import get_session_pool
+from ...sources import ShopifySource, get_source_registry
+from ...sync import PeriodicSync, SyncScheduler
+from ...tasks import TaskContext, get_task_manager
+from ...utils import get_auto_approve_list, get_mock_cache_dir
 
 
 class ShopifyService:
@@ -21,15 +45,17 @@ class ShopifyService:
 
     def __init__(self, syftbox_client: SyftBoxClient):
         self.syftbox_client = syftbox_client
-        self.rds_client = init_session(syftbox_client.email)
+        self.rds_client = get_session_pool().get_rds_client(syftbox_client.email)
+        self.catalog = get_dataset_catalog(syftbox_client, self.rds_client)
+        self.sources = get_source_registry(syftbox_client)
 
     async def create_dataset_from_shopify(
         self, url: str, name: str, pat: str, description: Optional[str] = None
-    ) -> DatasetModel:
-        """Create a dataset by importing data from Shopify."""
+    ) -> TaskStatus:
+        """Queue a task that creates a dataset by importing data from Shopify."""
 
         # check if dataset name already exists
-        for dataset in self.rds_client.datasets:
+        for dataset in await run_io(self.rds_client.dataset.get_all):
             if dataset.name == name:
                 raise HTTPException(
                     status_code=409,
@@ -40,111 +66,367 @@ class ShopifyService:
                     },
                 )
 
-        # Download data from Shopify
-        products_json = await self._fetch_shopify_products(url, pat)
-        dataset_df = shopify_json_to_dataframe(products_json)
+        async def create(task: TaskContext) -> dict:
+            # Download data from Shopify
+            task.set_phase("fetching")
+            products_json = await self._fetch_shopify_products(url, pat, task)
+            task.set_phase("building")
+            dataset_df = await run_cpu(shopify_json_to_dataframe, products_json)
 
+            dataset = await run_io(
+                self._create_dataset,
+                task,
+                dataset_df,
+                name,
+                description or f"Shopify data from {url}",
+            )
+            logger.debug(f"Shopify dataset created: {dataset}")
+
+            # Store Shopify source information
+            source = ShopifySource(
+                store_url=url,
+                pat=pat,
+                updated_at_watermark=latest_updated_at(dataset_df),
+                variantless_product_ids=sorted(variantless_product_ids(products_json)),
+            )
+            await run_io(self.sources.add, dataset.uid, source)
+            self.catalog.invalidate()
+
+            return DatasetModel.model_validate(dataset).model_dump(
+                mode="json", by_alias=True
+            )
+
+        return get_task_manager().submit("import-from-shopify", create)
+
+    def _create_dataset(
+        self, task: TaskContext, dataset_df: pd.DataFrame, name: str, summary: str
+    ):
         with tempfile.TemporaryDirectory() as temp_dir:
             # Save real dataset
+            task.set_phase("writing")
             real_path = Path(temp_dir) / "real"
             real_path.mkdir(parents=True, exist_ok=True)
-            real_dataset_path = real_path / "shopify.csv"
-            real_dataset_path.write_text(dataset_df.to_csv())
+            settings = get_settings()
+            if use_parquet_storage(settings.dataset_storage_format):
+                real_dataset_path = real_path / "shopify.parquet"
+            else:
+                real_dataset_path = real_path / "shopify.csv"
+            write_dataframe(dataset_df, real_dataset_path)
+            task.add_bytes(real_dataset_path.stat().st_size)
             logger.debug(f"Shopify dataset temporarily saved to: {real_dataset_path}")
 
-            # Create mock dataset
+            # Generate a synthetic mock with the same schema
+            task.set_phase("generating_mock")
             mock_path = Path(temp_dir) / "mock"
             mock_path.mkdir(parents=True, exist_ok=True)
-            mock_dataset_path = mock_path / "shopify.csv"
-            await self._download_mock_dataset(mock_dataset_path)
+            generate_mock_file(
+                real_dataset_path,
+                mock_path / real_dataset_path.name,
+                settings.mock_dataset_rows,
+                cache_dir=get_mock_cache_dir(self.syftbox_client),
+            )
+
+            task.set_phase("profiling")
+            profile = compute_profile(real_dataset_path)
 
             # Create dummy description file
             dummy_description_path = Path(temp_dir) / "dummy_description.txt"
             dummy_description_path.touch()
 
             # Create dataset
+            task.set_phase("creating")
             dataset = self.rds_client.dataset.create(
                 name=name,
-                summary=description or f"Shopify data from {url}",
+                summary=summary,
                 path=real_path,
                 mock_path=mock_path,
                 description_path=dummy_description_path,
                 auto_approval=get_auto_approve_list(self.syftbox_client),
             )
+            get_profile_store(self.syftbox_client).save_for(
+                dataset.uid, profile, dataset.private_path
+            )
+            return dataset
 
-            logger.debug(f"Shopify dataset created: {dataset}")
+    async def sync_dataset(self, dataset_uid: str) -> dict:
+        """Sync a Shopify datset with the most recent store data.
 
-            # Store Shopify source information
-            add_dataset_source(str(dataset.uid), ShopifySource(store_url=url, pat=pat))
+        Concurrent requests for the same dataset share a single sync.
+        """
+        return await get_sync_scheduler().sync(dataset_uid)
 
-            return DatasetModel.model_validate(dataset)
+    async def sync_all_datasets(self) -> SyncStatusResponse:
+        """Queue a sync of every Shopify-backed dataset."""
+        sources = await run_io(self.sources.load)
+        get_sync_scheduler().submit_many(str(uid) for uid in sources)
+        return get_sync_scheduler().status()
 
-    async def sync_dataset(self, dataset_uid: str) -> dict:
-        """Sync a Shopify datset with the most recent store data."""
+    def sync_status(self) -> SyncStatusResponse:
+        return get_sync_scheduler().status()
+
+    async def sync_state(self, dataset_uid: str) -> SourceSyncState:
+        """The outcome of the last sync of a dataset, as recorded on its source."""
+        source = await run_io(self.sources.find_source, dataset_uid)
+        if not source:
+            raise HTTPException(
+                status_code=404,
+                detail="Dataset does not have associated Shopify source info",
+            )
+        return SourceSyncState(
+            dataset_uid=dataset_uid,
+            syncing=get_sync_scheduler().is_syncing(dataset_uid),
+            updated_at_watermark=source.updated_at_watermark,
+            last_synced_at=source.last_synced_at,
+            last_sync_status=source.last_sync_status,
+            last_sync_duration=source.last_sync_duration,
+            last_sync_error=source.last_sync_error,
+        )
+
+    async def _record_sync(
+        self,
+        dataset_uid: str,
+        status: str,
+        duration: float,
+        error: Optional[str] = None,
+    ) -> None:
+        await run_io(
+            self.sources.update,
+            dataset_uid,
+            last_synced_at=datetime.now(timezone.utc),
+            last_sync_status=status,
+            last_sync_duration=duration,
+            last_sync_error=error,
+        )
+
+    async def _sync_dataset(self, dataset_uid: str) -> dict:
         try:
-            source = find_source(dataset_uid)
+            source = await run_io(self.sources.find_source, dataset_uid)
             if not source or not isinstance(source, ShopifySource):
                 raise HTTPException(
                     status_code=400,
                     detail="Dataset does not have associated Shopify source info",
                 )
 
-            # Fetch latest data from Shopify
-            products_json = await self._fetch_shopify_products(
-                source.store_url, source.pat
-            )
-            dataset_df = shopify_json_to_dataframe(products_json)
-
-            with tempfile.TemporaryDirectory() as temp_dir:
-                real_path = Path(temp_dir) / "real"
-                real_path.mkdir(parents=True, exist_ok=True)
-                real_dataset_path = real_path / "shopify.csv"
-                real_dataset_path.write_text(dataset_df.to_csv())
-
-                # Update the dataset
-
-                self.rds_client.dataset.update(
-                    DatasetUpdate(uid=dataset_uid, path=str(real_path)),
-                )
+            if source.updated_at_watermark is None:
+                stats = await self._full_sync(dataset_uid, source)
+            else:
+                stats = await self._incremental_sync(dataset_uid, source)
+            self.catalog.invalidate()
 
-                return {"message": f"Dataset {dataset_uid} synced successfully"}
+            logger.debug(f"Shopify dataset {dataset_uid} synced: {stats}")
+            return {
+                "message": f"Dataset {dataset_uid} synced successfully",
+                **stats,
+            }
 
         except HTTPException:
             raise
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch Shopify products: {e}")
+            raise HTTPException(
+                status_code=400, detail=f"Failed to fetch data from Shopify: {str(e)}"
+            )
         except Exception as e:
             logger.error(f"Error syncing Shopify dataset: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def _fetch_shopify_products(self, store_url: str, pat: str) -> dict:
-        """Fetch products from Shopify API."""
-        headers = {
-            "X-Shopify-Access-Token": pat,
-            "Content-Type": "application/json",
-        }
+    async def _full_sync(self, dataset_uid: str, source: ShopifySource) -> dict:
+        """Replace the dataset file with the whole current catalogue."""
+        products_json = await self._fetch_shopify_products(source.store_url, source.pat)
+        dataset_df = await run_cpu(shopify_json_to_dataframe, products_json)
+        await run_io(self._update_dataset_file, dataset_uid, dataset_df)
 
-        try:
-            response = requests.get(
-                f"{store_url}/admin/api/2024-01/products.json", headers=headers
+        await self._save_watermark(
+            dataset_uid, source, dataset_df, variantless_product_ids(products_json)
+        )
+        return {"updated": len(dataset_df), "deleted": 0}
+
+    async def _incremental_sync(self, dataset_uid: str, source: ShopifySource) -> dict:
+        """
+        Upsert the products updated since the last sync into the dataset file.
+
+        The products repeated from the last sync are dropped first, so the
+        file is only rewritten when something actually changed.
+
+        Deletions are detected by comparing the store's product count with the
+        products known to the dataset: those with rows in it plus the ones
+        without variants, which are kept with the watermark. The id-only
+        product listing is only fetched when they differ.
+        """
+        client = get_shopify_client()
+        params = {"updated_at_min": source.updated_at_watermark.isoformat()}
+        products_json, store_count = await asyncio.gather(
+            client.fetch_products(source.store_url, source.pat, params),
+            client.count_products(source.store_url, source.pat),
+        )
+
+        changes_df = await run_cpu(shopify_json_to_dataframe, products_json)
+        existing_df = await run_io(self._read_dataset_file, dataset_uid)
+        changes_df = await run_cpu(drop_unchanged_products, existing_df, changes_df)
+        merged_df = await run_cpu(merge_shopify_dataframes, existing_df, changes_df)
+
+        changed_ids = {product["id"] for product in products_json["products"]}
+        variantless_ids = (
+            set(source.variantless_product_ids) - changed_ids
+        ) | variantless_product_ids(products_json)
+        known_ids = set(merged_df["product_id"]) | variantless_ids
+
+        if len(known_ids) != store_count:
+            live_ids = await client.fetch_product_ids(source.store_url, source.pat)
+            merged_df = await run_cpu(
+                merge_shopify_dataframes, existing_df, changes_df, live_ids
             )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch Shopify products: {e}")
+            variantless_ids &= live_ids
+
+        deleted = (~existing_df["variant_id"].isin(merged_df["variant_id"])).sum()
+        if not changes_df.empty or deleted:
+            await run_io(self._update_dataset_file, dataset_uid, merged_df)
+
+        await self._save_watermark(dataset_uid, source, changes_df, variantless_ids)
+        return {"updated": len(changes_df), "deleted": int(deleted)}
+
+    async def _save_watermark(
+        self,
+        dataset_uid: str,
+        source: ShopifySource,
+        synced_df: pd.DataFrame,
+        variantless_ids: set[int],
+    ) -> None:
+        fields = {}
+        watermark = latest_updated_at(synced_df)
+        if watermark is not None and (
+            source.updated_at_watermark is None
+            or watermark > source.updated_at_watermark
+        ):
+            fields["updated_at_watermark"] = watermark
+        if variantless_ids != set(source.variantless_product_ids):
+            fields["variantless_product_ids"] = sorted(variantless_ids)
+        if fields:
+            # only the sync state is written, leaving fields set meanwhile intact
+            await run_io(self.sources.update, dataset_uid, **fields)
+
+    def _dataset_file(self, dataset_uid: str) -> Path:
+        """The private file of a Shopify dataset, `shopify.csv` or `.parquet`."""
+        dataset = self.rds_client.dataset.get(uid=dataset_uid)
+        if not dataset:
             raise HTTPException(
-                status_code=400, detail=f"Failed to fetch data from Shopify: {str(e)}"
+                status_code=404,
+                detail=f"Dataset with UUID '{dataset_uid}' not found",
+            )
+        dataset = DatasetModel.model_validate(dataset)
+        path = next(dataset.private_path.glob("shopify.*"), None)
+        return path or dataset.private_path / "shopify.csv"
+
+    def _read_dataset_file(self, dataset_uid: str) -> pd.DataFrame:
+        return read_shopify_file(self._dataset_file(dataset_uid))
+
+    def _update_dataset_file(self, dataset_uid: str, dataset_df: pd.DataFrame):
+        # keep the format the dataset was created with
+        filename = self._dataset_file(dataset_uid).name
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            real_path = Path(temp_dir) / "real"
+            real_path.mkdir(parents=True, exist_ok=True)
+            write_dataframe(dataset_df, real_path / filename)
+            profile = compute_profile(real_path / filename)
+
+            # Update the dataset
+            dataset = self.rds_client.dataset.update(
+                DatasetUpdate(uid=dataset_uid, path=str(real_path)),
             )
+        if profile is not None:
+            get_profile_store(self.syftbox_client).save(
+                dataset_uid, profile, self._dataset_file(dataset_uid)
+            )
+        return dataset
+
+    async def _fetch_shopify_products(
+        self, store_url: str, pat: str, task: Optional[TaskContext] = None
+    ) -> dict:
+        """Fetch all products from Shopify, following pagination.
 
-    async def _download_mock_dataset(self, mock_dataset_path: Path) -> None:
-        """Download mock dataset from GitHub."""
-        github_csv_url = "https://raw.githubusercontent.com/OpenMined/datasets/refs/heads/main/enclave/organic-coop/data/part_1/crop_stock_mock_1.csv"
+        With a `task`, progress is reported and cancellation checked per page.
+        """
         try:
-            response = requests.get(github_csv_url)
-            response.raise_for_status()
-            mock_dataset_path.write_bytes(response.content)
-            logger.debug(f"Mock dataset downloaded to: {mock_dataset_path}")
-        except Exception as e:
-            logger.error(f"Failed to download mock dataset: {e}")
+            if task is None:
+                return await get_shopify_client().fetch_products(store_url, pat)
+
+            products = []
+            client = get_shopify_client()
+            async for page in client.iter_pages(store_url, pat, "products.json"):
+                task.check_cancelled()
+                task.add_items(len(page))
+                products.extend(page)
+            return {"products": products}
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch Shopify products: {e}")
             raise HTTPException(
-                status_code=400,
-                detail=f"Failed to download mock dataset: {e}",
+                status_code=400, detail=f"Failed to fetch data from Shopify: {str(e)}"
             )
+
+
+async def _sync_shopify_dataset(dataset_uid: str) -> dict:
+    syftbox_client = await run_io(get_session_pool().get_syftbox_client)
+    service = ShopifyService(syftbox_client)
+    start = time.perf_counter()
+    try:
+        result = await service._sync_dataset(dataset_uid)
+    except HTTPException as e:
+        await service._record_sync(
+            dataset_uid, "failed", time.perf_counter() - start, str(e.detail)
+        )
+        raise
+    await service._record_sync(dataset_uid, "succeeded", time.perf_counter() - start)
+    return result
+
+
+async def _list_shopify_datasets() -> List[str]:
+    syftbox_client = await run_io(get_session_pool().get_syftbox_client)
+    sources = await run_io(get_source_registry(syftbox_client).load)
+    return [str(uid) for uid in sources]
+
+
+_scheduler: Optional[SyncScheduler] = None
+_periodic_sync: Optional[PeriodicSync] = None
+
+
+def get_sync_scheduler() -> SyncScheduler:
+    """Get the process-wide Shopify sync scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SyncScheduler(
+            _sync_shopify_dataset, get_settings().shopify_sync_concurrency
+        )
+    return _scheduler
+
+
+async def close_sync_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        scheduler, _scheduler = _scheduler, None
+        await scheduler.close()
+
+
+def start_periodic_sync() -> None:
+    """Start syncing every Shopify dataset in the background, if enabled."""
+    global _periodic_sync
+    settings = get_settings()
+    if _periodic_sync is not None or settings.shopify_sync_interval <= 0:
+        return
+    _periodic_sync = PeriodicSync(
+        get_sync_scheduler(),
+        _list_shopify_datasets,
+        interval=settings.shopify_sync_interval,
+        jitter=settings.shopify_sync_jitter,
+    )
+    _periodic_sync.start()
+    logger.debug(
+        f"Syncing Shopify datasets every {settings.shopify_sync_interval:.0f}s"
+    )
+
+
+async def stop_periodic_sync() -> None:
+    global _periodic_sync
+    if _periodic_sync is not None:
+        periodic_sync, _periodic_sync = _periodic_sync, None
+        await periodic_sync.stop()
@@ -1,20 +1,21 @@
 # backend/api/services/auto_approve_service.py
-from typing import List
+import asyncio
+from typing import Callable, List
 
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
-from filelock import FileLock
 from loguru import logger
 from syft_core import Client as SyftBoxClient
-from syft_rds import init_session
 from syft_rds.models.models import DatasetUpdate
 
-from ...models import ListAutoApproveResponse
-from ...utils import (
-    get_auto_approve_file_path,
-    get_auto_approve_list,
-    save_auto_approve_list,
+from ...config import get_settings
+from ...executor import run_io
+from ...models import (
+    DatasetAutoApprovalResult,
+    ListAutoApproveResponse,
+    TrustedDatasitesUpdateResponse,
 )
+from ...session import get_session_pool
+from ...trust import TrustList, get_trust_list, is_wildcard, parse_entry
 
 
 class TrustedDatasitesService:
@@ -22,37 +23,71 @@ class TrustedDatasitesService:
 
     def __init__(self, syftbox_client: SyftBoxClient):
         self.syftbox_client = syftbox_client
-        self.rds_client = init_session(syftbox_client.email)
+        self.rds_client = get_session_pool().get_rds_client(syftbox_client.email)
+        self.trust_list = get_trust_list(syftbox_client)
 
-    async def set_auto_approved_datasites(self, datasites: List[str]) -> JSONResponse:
-        """Set the list of auto-approved datasites."""
-        # Create a lock file for thread safety
-        lock_file_path = get_auto_approve_file_path(self.syftbox_client).with_suffix(
-            ".lock"
+    async def set_auto_approved_datasites(
+        self, datasites: List[str]
+    ) -> TrustedDatasitesUpdateResponse:
+        """
+        Set the list of auto-approved datasites and propagate it to datasets.
+
+        Only datasets whose stored auto-approval list differs from the new
+        one are updated, concurrently on the I/O pool.
+        """
+        datasites = list(dict.fromkeys(_parse_entries(datasites)))
+        return await self._edit(
+            lambda trust_list: trust_list.save(datasites),
+            lambda _: datasites,
         )
-        file_lock = FileLock(str(lock_file_path))
 
+    async def patch_auto_approved_datasites(
+        self, add: List[str], remove: List[str]
+    ) -> TrustedDatasitesUpdateResponse:
+        """
+        Add and remove entries without replacing the whole list.
+
+        Datasets get the same edit applied to their own auto-approval list.
+        """
+        add = _parse_entries(add)
+        # wildcards saved earlier can always be removed
+        removed = {
+            entry.lower() for entry in _parse_entries(remove, allow_wildcards=True)
+        }
+
+        def edit(entries: List[str]) -> List[str]:
+            entries = [entry for entry in entries if entry.lower() not in removed]
+            return list(dict.fromkeys(entries + add))
+
+        return await self._edit(lambda trust_list: trust_list.update(edit), edit)
+
+    async def _edit(
+        self,
+        edit_list: Callable[[TrustList], tuple[List[str], List[str]]],
+        edit_dataset: Callable[[List[str]], List[str]],
+    ) -> TrustedDatasitesUpdateResponse:
         try:
-            with file_lock:
-                # Clean the email list
-                datasites = [
-                    datasite.strip() for datasite in datasites if datasite.strip()
-                ]
-
-                # Save the new auto-approve list
-                save_auto_approve_list(self.syftbox_client, datasites)
-
-                # Update all existing datasets with the new auto-approve list
-                await self._update_datasets_auto_approval(datasites)
-
-                logger.debug(f"Updated auto-approve list with {len(datasites)} emails")
-                return JSONResponse(
-                    content={
-                        "message": f"Auto-approve list updated with {len(datasites)} emails"
-                    },
-                    status_code=200,
+            # serialise edits in this process for the whole propagation; the
+            # file lock only guards the list file against other processes
+            async with _edit_lock:
+                previous, datasites = await run_io(edit_list, self.trust_list)
+                datasets = await run_io(self.rds_client.dataset.get_all)
+                results = await self._update_datasets_auto_approval(
+                    datasets, edit_dataset
                 )
 
+            updated = sum(result.status == "updated" for result in results)
+            logger.debug(
+                f"Updated auto-approve list with {len(datasites)} emails, "
+                f"{updated} of {len(results)} datasets updated"
+            )
+            return TrustedDatasitesUpdateResponse(
+                message=f"Auto-approve list updated with {len(datasites)} emails",
+                datasites=datasites,
+                changed=previous != datasites,
+                datasets=results,
+            )
+
         except Exception as e:
             logger.error(f"Error in auto-approve operation: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -60,30 +95,76 @@ class TrustedDatasitesService:
     async def get_auto_approved_datasites(self) -> ListAutoApproveResponse:
         """Get the current list of auto-approved datasites."""
         try:
-            auto_approved_datasites = get_auto_approve_list(self.syftbox_client)
+            auto_approved_datasites = await run_io(self.trust_list.load)
             return ListAutoApproveResponse(datasites=auto_approved_datasites)
         except Exception as e:
             logger.error(f"Error getting auto-approve list: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def _update_datasets_auto_approval(self, datasites: List[str]) -> None:
-        """Update all datasets with new auto-approval list."""
-        datasets = self.rds_client.dataset.get_all()
+    async def _update_datasets_auto_approval(
+        self, datasets: list, edit: Callable[[List[str]], List[str]]
+    ) -> List[DatasetAutoApprovalResult]:
+        """
+        Apply `edit` to the auto-approval list of every dataset it changes.
+
+        Datasets only get the exact emails, which is all syft_rds matches.
+        """
+        semaphore = asyncio.Semaphore(get_settings().auto_approval_update_concurrency)
+
+        async def update(dataset) -> DatasetAutoApprovalResult:
+            result = DatasetAutoApprovalResult(
+                dataset_uid=str(dataset.uid),
+                dataset_name=dataset.name,
+                status="unchanged",
+            )
+            current = list(dataset.auto_approval or [])
+            datasites = [entry for entry in edit(current) if not is_wildcard(entry)]
+            if sorted(current) == sorted(datasites):
+                return result
 
-        for dataset in datasets:
-            try:
-                updated_dataset = self.rds_client.dataset.update(
-                    DatasetUpdate(
-                        uid=dataset.uid,
-                        auto_approval=datasites,
+            async with semaphore:
+                try:
+                    await run_io(
+                        self.rds_client.dataset.update,
+                        DatasetUpdate(uid=dataset.uid, auto_approval=datasites),
                     )
-                )
-                logger.debug(
-                    f"Updated dataset {updated_dataset.name} with "
-                    f"auto-approval for {len(datasites)} datasites"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to update dataset {dataset.name} "
-                    f"with auto-approval: {e}"
-                )
+                    result.status = "updated"
+                except Exception as e:
+                    logger.error(
+                        f"Failed to update dataset {dataset.name} "
+                        f"with auto-approval: {e}"
+                    )
+                    result.status = "failed"
+                    result.error = str(e)
+            return result
+
+        return await asyncio.gather(*(update(dataset) for dataset in datasets))
+
+
+def _parse_entries(datasites: List[str], allow_wildcards: bool = False) -> List[str]:
+    """
+    Clean a list of entries, rejecting the request if any is invalid.
+
+    Domain wildcards are only accepted while the auto-approval engine,
+    the only thing that resolves them, is enabled.
+    """
+    entries = []
+    allow_wildcards = allow_wildcards or get_settings().auto_approval_enabled
+    for datasite in datasites:
+        if not datasite.strip():
+            continue
+        try:
+            entry = parse_entry(datasite)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if is_wildcard(entry) and not allow_wildcards:
+            raise HTTPException(
+                status_code=400,
+                detail=f"'{entry}' needs the auto-approval engine, "
+                "set auto_approval_enabled to trust whole domains",
+            )
+        entries.append(entry)
+    return entries
+
+
+_edit_lock = asyncio.Lock()
@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Literal, NamedTuple, Optional
+
+from loguru import logger
+from syft_rds.client.rds_client import RDSClient
+from syft_rds.models.models import Job, JobStatus
+
+from .config import get_settings
+from .events import get_event_hub
+from .executor import run_io
+from .job_index import get_job_index
+from .lib.files import Fingerprint, scan_tree
+from .models import ChangeEvent
+from .session import get_session_pool
+from .trust import TrustMatcher, get_trust_list
+
+# Number of recent decisions kept for the latency percentiles
+LATENCY_WINDOW = 1000
+
+
+class Decision(NamedTuple):
+    job: Job
+    action: Literal["approve", "reject"]
+    reason: str
+
+
+class ApprovalEngine:
+    """
+    Background worker that decides pending jobs as soon as they arrive.
+
+    The engine wakes on change events from the shared `EventHub`, and
+    re-scans every `poll_interval` seconds in case events are missed or
+    unavailable. Events arriving within `batch_delay` of each other are
+    handled in one pass. A pass is skipped when neither the job store, the
+    dataset store nor the trust list changed since the last one.
+
+    A pending job is approved when its requester matches the trusted
+    datasites list or the auto-approval list of its dataset. With
+    `reject_untrusted`, all other pending jobs are rejected; otherwise they
+    are left for manual review.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        batch_delay: float,
+        max_concurrent: int,
+        reject_untrusted: bool = False,
+    ):
+        self.poll_interval = poll_interval
+        self.batch_delay = batch_delay
+        self.max_concurrent = max_concurrent
+        self.reject_untrusted = reject_untrusted
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._fingerprint: Optional[Fingerprint] = None
+
+        self._lock = threading.Lock()
+        self._counts = {"approved": 0, "rejected": 0, "failed": 0}
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._last_run_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake.set()  # decide the jobs that arrived while we were down
+            get_event_hub().add_listener(self._on_events)
+            self._task = asyncio.create_task(self._loop(), name="approval-engine")
+
+    def _on_events(self, events: List[ChangeEvent]) -> None:
+        self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                # let a burst of job files settle into a single batch
+                await asyncio.sleep(self.batch_delay)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                rds_client = await run_io(get_session_pool().get_rds_client)
+                await self.run_once(rds_client)
+            except Exception as e:
+                logger.error(f"Auto-approval pass failed: {e}")
+
+    async def run_once(self, rds_client: RDSClient) -> None:
+        decisions = await run_io(self._evaluate, rds_client)
+        self._last_run_at = datetime.now(timezone.utc)
+        if not decisions:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def apply(decision: Decision) -> bool:
+            async with semaphore:
+                return await self._apply(rds_client, decision)
+
+        applied = await asyncio.gather(*(apply(d) for d in decisions))
+        if not all(applied):
+            # retry the failed decisions on the next pass
+            self._fingerprint = None
+
+    def _fingerprint_of(self, rds_client: RDSClient) -> Fingerprint:
+        syftbox_client = get_session_pool().get_syftbox_client()
+        return tuple(
+            scan_tree(rds_client.local_store.jobs.store.item_type_dir, depth=1)
+            + scan_tree(rds_client.local_store.dataset.store.item_type_dir, depth=1)
+            + scan_tree(get_trust_list(syftbox_client).path, depth=0)
+        )
+
+    def _evaluate(self, rds_client: RDSClient) -> List[Decision]:
+        fingerprint = self._fingerprint_of(rds_client)
+        if fingerprint == self._fingerprint:
+            return []
+
+        pending = (
+            get_job_index(rds_client)
+            .query(statuses=[JobStatus.pending_code_review.value])
+            .jobs
+        )
+        if not pending:
+            self._fingerprint = fingerprint
+            return []
+
+        syftbox_client = get_session_pool().get_syftbox_client()
+        trusted = get_trust_list(syftbox_client).matcher()
+        policies = {
+            dataset.name: TrustMatcher(dataset.auto_approval or [])
+            for dataset in rds_client.dataset.get_all()
+        }
+
+        decisions = []
+        for job in pending:
+            requester = job.created_by or ""
+            policy = policies.get(job.dataset_name)
+            if policy is None:
+                if self.reject_untrusted:
+                    reason = f"Dataset '{job.dataset_name}' does not exist"
+                    decisions.append(Decision(job, "reject", reason))
+            elif trusted.matches(requester) or policy.matches(requester):
+                decisions.append(Decision(job, "approve", "Trusted datasite"))
+            elif self.reject_untrusted:
+                decisions.append(Decision(job, "reject", "Untrusted datasite"))
+
+        # only a pass that read everything counts as done, so a job file
+        # that failed to parse is evaluated again on the next pass
+        self._fingerprint = fingerprint
+        return decisions
+
+    async def _apply(self, rds_client: RDSClient, decision: Decision) -> bool:
+        job = decision.job
+        try:
+            if decision.action == "approve":
+                await run_io(rds_client.jobs.approve, job)
+            else:
+                await run_io(rds_client.jobs.reject, job, decision.reason)
+        except Exception as e:
+            logger.error(f"Failed to {decision.action} job {job.uid}: {e}")
+            with self._lock:
+                self._counts["failed"] += 1
+            return False
+
+        created_at = job.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        latency = (datetime.now(timezone.utc) - created_at).total_seconds()
+        outcome = "approved" if decision.action == "approve" else "rejected"
+        with self._lock:
+            self._counts[outcome] += 1
+            self._latencies.append(latency)
+        logger.info(
+            f"Auto-{outcome} job {job.uid} from {job.created_by} "
+            f"({decision.reason}, {latency:.1f}s after submission)"
+        )
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Decision counters and submission-to-decision latency in seconds."""
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = sorted(self._latencies)
+
+        latency = {"count": len(latencies)}
+        if latencies:
+            latency.update(
+                mean=sum(latencies) / len(latencies),
+                p50=latencies[len(latencies) // 2],
+                p95=latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                max=latencies[-1],
+            )
+        return {
+            **counts,
+            "mode": get_event_hub().mode,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+            "latency": latency,
+        }
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            get_event_hub().remove_listener(self._on_events)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+_engine: Optional[ApprovalEngine] = None
+
+
+def get_approval_engine() -> Optional[ApprovalEngine]:
+    return _engine
+
+
+def start_approval_engine() -> None:
+    """Start auto-approving jobs in the background, if enabled."""
+    global _engine
+    settings = get_settings()
+    if _engine is not None or not settings.auto_approval_enabled:
+        return
+    _engine = ApprovalEngine(
+        poll_interval=settings.auto_approval_poll_interval,
+        batch_delay=settings.auto_approval_batch_delay,
+        max_concurrent=settings.auto_approval_update_concurrency,
+        reject_untrusted=settings.auto_approval_reject_untrusted,
+    )
+    _engine.start()
+
+
+async def stop_approval_engine() -> None:
+    global _engine
+    if _engine is not None:
+        engine, _engine = _engine, None
+        await engine.stop()
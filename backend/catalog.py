@@ -0,0 +1,137 @@
+import threading
+from typing import Optional
+
+from loguru import logger
+from syft_core import Client as SyftBoxClient
+from syft_core.url import SyftBoxURL
+from syft_rds.client.rds_client import RDSClient
+
+from .lib.files import Fingerprint, scan_tree
+from .lib.json_responses import dumps
+from .models import Dataset as DatasetModel
+from .profiles import get_profile_store, private_file
+from .sources import get_source_registry
+
+
+class DatasetCatalog:
+    """In-memory cache of the enriched dataset listing of a datasite.
+
+    The cache is keyed on a cheap fingerprint of the RDS dataset store, the
+    public/private dataset directories and the sources config, so any change
+    on disk (including ones made outside this process) triggers a rebuild.
+    """
+
+    def __init__(self, syftbox_client: SyftBoxClient, rds_client: RDSClient):
+        self.syftbox_client = syftbox_client
+        self.rds_client = rds_client
+        self._lock = threading.Lock()
+        self._datasets: Optional[list[DatasetModel]] = None
+        # the listing serialised as a `ListDatasetsResponse`, built on demand
+        self._body: Optional[bytes] = None
+        self._fingerprint: Optional[Fingerprint] = None
+
+        self._store_dir = rds_client.local_store.dataset.store.item_type_dir
+        self._public_dir = syftbox_client.my_datasite / "public" / "datasets"
+        self._private_dir = syftbox_client.my_datasite / "private" / "datasets"
+        self._sources = get_source_registry(syftbox_client)
+        self._profiles = get_profile_store(syftbox_client)
+
+    def fingerprint(self) -> Fingerprint:
+        """Stat-only snapshot of everything the listing is derived from."""
+        return tuple(
+            scan_tree(self._store_dir, depth=1)
+            + scan_tree(self._public_dir, depth=2)
+            + scan_tree(self._private_dir, depth=2)
+            + scan_tree(self._sources.path, depth=0)
+            + scan_tree(self._profiles.directory, depth=1)
+        )
+
+    def get_datasets(self) -> list[DatasetModel]:
+        """Return the cached datasets, rebuilding them if anything changed on disk."""
+        with self._lock:
+            return self._refresh()
+
+    def render(self) -> bytes:
+        """The cached listing as a serialised `ListDatasetsResponse`."""
+        with self._lock:
+            datasets = self._refresh()
+            if self._body is None:
+                self._body = dumps(
+                    {
+                        "datasets": [
+                            dataset.model_dump(mode="json", by_alias=True)
+                            for dataset in datasets
+                        ]
+                    }
+                )
+            return self._body
+
+    def _refresh(self) -> list[DatasetModel]:
+        fingerprint = self.fingerprint()
+        if self._datasets is None or fingerprint != self._fingerprint:
+            self._datasets = self._build()
+            self._body = None
+            # Snapshot after the build so writes that raced the rebuild
+            # are picked up by the next call.
+            self._fingerprint = self.fingerprint()
+        return self._datasets
+
+    def invalidate(self) -> None:
+        """Drop the cached listing, e.g. after a create/update/delete."""
+        with self._lock:
+            self._datasets = None
+            self._body = None
+            self._fingerprint = None
+
+    def _build(self) -> list[DatasetModel]:
+        datasets = [
+            DatasetModel.model_validate(dataset)
+            for dataset in self.rds_client.dataset.get_all()
+        ]
+
+        sources = self._sources.find_sources(dataset.uid for dataset in datasets)
+
+        # Process datasets to fix temporary issues with RDS
+        for dataset in datasets:
+            private_file_path = private_file(dataset.private_path)
+            dataset.private = SyftBoxURL.from_path(
+                private_file_path, self.syftbox_client.workspace
+            )
+
+            mock_file_path = next(dataset.mock_path.iterdir(), None)
+            dataset.mock = SyftBoxURL.from_path(
+                mock_file_path, self.syftbox_client.workspace
+            )
+
+            dataset.readme = None
+            dataset.private_size = (
+                private_file_path.stat().st_size if private_file_path else 0
+            )
+            dataset.mock_size = mock_file_path.stat().st_size if mock_file_path else 0
+            dataset.source = sources[dataset.uid]
+            dataset.profile = self._profiles.get(dataset.uid, private_file_path)
+
+        logger.debug(f"Rebuilt dataset catalog with {len(datasets)} datasets")
+        return datasets
+
+
+_catalogs: dict[str, DatasetCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_dataset_catalog(
+    syftbox_client: SyftBoxClient, rds_client: RDSClient
+) -> DatasetCatalog:
+    """Get the process-wide dataset catalog for the client's datasite."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(syftbox_client.email)
+        # the session pool hands out new clients when the config changes,
+        # which may also move the workspace the catalog is watching
+        if (
+            catalog is None
+            or catalog.syftbox_client is not syftbox_client
+            or catalog.rds_client is not rds_client
+        ):
+            catalog = DatasetCatalog(syftbox_client, rds_client)
+            _catalogs[syftbox_client.email] = catalog
+        return catalog
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -14,9 +14,61 @@ class Settings(BaseSettings):
     # Client settings
     config_path: Optional[str] = None
 
+    # Executor settings
+    io_workers: int = 16
+    cpu_workers: int = 0  # 0 runs pandas work on the I/O thread pool
+
+    # Background task settings: dataset creation and import run as tasks,
+    # records of finished tasks are kept for `task_ttl` seconds
+    task_workers: int = 4
+    task_ttl: float = 60 * 60.0
+
+    # Datasets updated at once when the trusted datasites list changes, and
+    # jobs decided at once by the auto-approval engine or a batch decision
+    auto_approval_update_concurrency: int = 8
+
+    # Change events: the RDS store is re-scanned every poll interval in case
+    # filesystem events are missed. Each SSE client buffers up to
+    # `events_queue_size` events and gets a heartbeat comment when idle
+    events_poll_interval: float = 5.0
+    events_queue_size: int = 256
+    events_heartbeat_interval: float = 15.0
+
+    # Auto-approval engine: approves pending jobs from trusted datasites as
+    # they arrive. Off unless opted in with `auto_approval_enabled=true` (env
+    # names are case-sensitive). The job store is re-scanned every poll
+    # interval in case filesystem events are missed; untrusted jobs are
+    # rejected only if `auto_approval_reject_untrusted` is set
+    auto_approval_enabled: bool = False
+    auto_approval_poll_interval: float = 5.0
+    auto_approval_batch_delay: float = 0.5
+    auto_approval_reject_untrusted: bool = False
+
     # File upload settings
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
-    allowed_file_types: list[str] = ["text/csv", "application/json", "text/plain"]
+    allowed_file_types: list[str] = [
+        "text/csv",
+        "application/json",
+        "text/plain",
+        "application/vnd.ms-excel",  # how browsers on Windows label .csv files
+    ]
+
+    # Shopify settings
+    shopify_timeout: float = 30.0
+    shopify_max_connections: int = 10
+    shopify_max_retries: int = 5
+    shopify_sync_concurrency: int = 8
+    # Background sync of every Shopify dataset; 0 disables it. Each round
+    # starts after interval +/- jitter (a fraction of the interval)
+    shopify_sync_interval: float = 60 * 60.0
+    shopify_sync_jitter: float = 0.1
+
+    # Dataset storage: "original" keeps files as they were uploaded or
+    # imported, "parquet" stores tabular data as Parquet (needs pyarrow)
+    dataset_storage_format: Literal["original", "parquet"] = "original"
+
+    # Mock dataset settings
+    mock_dataset_rows: int = 1000
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,318 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from loguru import logger
+from syft_rds.client.rds_client import RDSClient
+
+from .config import get_settings
+from .executor import run_io
+from .job_index import get_job_index
+from .lib.files import file_stamp, yaml_stamps
+from .models import ChangeEvent
+from .session import get_session_pool
+from .trust import get_trust_list
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # comes with syft-rds; without it the hub only polls
+    Observer = None
+
+# Delay between a filesystem event and the scan, so a burst of writes
+# (e.g. a dataset create touching several files) becomes a single scan
+SCAN_DELAY = 0.2
+
+JOB_STATUS_EVENTS = {
+    "approved": "job.approved",
+    "rejected": "job.rejected",
+}
+
+type Listener = Callable[[List[ChangeEvent]], None]
+
+
+class _StoreWatcher:
+    """Calls `wake` from a watchdog thread whenever a watched directory changes."""
+
+    def __init__(self, paths: List[Path], wake: Callable[[], None]):
+        self.paths = paths
+        handler = FileSystemEventHandler()
+        handler.on_any_event = lambda event: wake()
+        self._observer = Observer()
+        for path in paths:
+            self._observer.schedule(handler, str(path), recursive=False)
+        self._observer.start()
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join(timeout=5)
+
+
+class Subscriber:
+    """
+    One client's event queue.
+
+    Publishing never waits on a slow client: once `max_size` events are
+    queued, the backlog is dropped and replaced by a single `resync` event,
+    telling the client to re-fetch its views.
+    """
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(max_size)
+        self.dropped = 0
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(ChangeEvent(type="resync", at=event.at))
+
+
+class EventHub:
+    """
+    Turns changes in the RDS store and the trust list into typed events.
+
+    A single watchdog observer covers the dataset and job stores and the
+    trust list, with a re-scan every `poll_interval` seconds in case events
+    are missed or unavailable. Each scan diffs the stores against the
+    previous one; changes are fanned out to SSE subscribers and to in-process
+    listeners such as the auto-approval engine.
+    """
+
+    def __init__(self, poll_interval: float, queue_size: int):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[_StoreWatcher] = None
+        self._subscribers: set[Subscriber] = set()
+        self._listeners: List[Listener] = []
+
+        # state of the previous scan; None until the first one
+        self._datasets: Optional[Dict[str, tuple[tuple[int, int], str]]] = None
+        self._jobs: Optional[Dict[str, tuple[str, str, datetime]]] = None
+        self._trust_stamp: Optional[tuple[int, int]] = None
+
+    @property
+    def mode(self) -> str:
+        return "polling" if self._watcher is None else "filesystem"
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake.set()
+            self._task = asyncio.create_task(self._loop(), name="event-hub")
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call `listener` on the event loop with every non-empty batch of events."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, events: List[ChangeEvent]) -> None:
+        if not events:
+            return
+        for subscriber in self._subscribers:
+            for event in events:
+                subscriber.put(event)
+        for listener in list(self._listeners):
+            try:
+                listener(events)
+            except Exception as e:
+                logger.error(f"Event listener failed: {e}")
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(self._wake.set)
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                await asyncio.sleep(SCAN_DELAY)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                rds_client = await run_io(get_session_pool().get_rds_client)
+                await run_io(self._watch, rds_client, wake)
+                self.publish(await run_io(self._scan, rds_client))
+            except Exception as e:
+                logger.error(f"Event scan failed: {e}")
+
+    def _paths(self, rds_client: RDSClient) -> List[Path]:
+        """The watched directories that exist; missing ones are polled."""
+        syftbox_client = get_session_pool().get_syftbox_client()
+        paths = [
+            rds_client.local_store.dataset.store.item_type_dir,
+            rds_client.local_store.jobs.store.item_type_dir,
+            get_trust_list(syftbox_client).path.parent,
+        ]
+        return [path for path in paths if path.is_dir()]
+
+    def _watch(self, rds_client: RDSClient, wake: Callable[[], None]) -> None:
+        """(Re)start the watcher if the stores moved, e.g. on a config change."""
+        if Observer is None:
+            return
+        paths = self._paths(rds_client)
+        if not paths or self._watcher is not None and self._watcher.paths == paths:
+            return
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        try:
+            self._watcher = _StoreWatcher(paths, wake)
+        except Exception as e:
+            logger.warning(f"Cannot watch the RDS store ({e}), polling instead")
+
+    def _scan(self, rds_client: RDSClient) -> List[ChangeEvent]:
+        """Diff the stores against the previous scan; the first one only records."""
+        now = datetime.now(timezone.utc)
+        first_scan = self._jobs is None
+        events = self._scan_datasets(rds_client, now)
+        events += self._scan_jobs(rds_client, now)
+
+        trust_list = get_trust_list(get_session_pool().get_syftbox_client())
+        trust_stamp = file_stamp(trust_list.path)
+        if trust_stamp != self._trust_stamp and not first_scan:
+            events.append(ChangeEvent(type="trust.changed", at=now))
+        self._trust_stamp = trust_stamp
+        return events
+
+    def _scan_datasets(self, rds_client: RDSClient, now: datetime) -> List[ChangeEvent]:
+        store = rds_client.local_store.dataset.store
+        stamps = yaml_stamps(store.item_type_dir)
+        previous = self._datasets
+        datasets = {}
+        events = []
+
+        for uid, stamp in stamps.items():
+            known = previous.get(uid) if previous is not None else None
+            if known is not None and known[0] == stamp:
+                datasets[uid] = known
+                continue
+            try:
+                dataset = store.get_by_uid(uid)
+            except Exception as e:
+                # likely caught mid-write; picked up by the next scan
+                logger.debug(f"Failed to load dataset {uid}: {e}")
+                dataset = None
+            if dataset is None:
+                # keep the old entry, so the retry is reported as an update
+                if known is not None:
+                    datasets[uid] = known
+                continue
+            datasets[uid] = (stamp, dataset.name)
+            if previous is not None:
+                kind = "dataset.updated" if known else "dataset.created"
+                events.append(
+                    ChangeEvent(type=kind, uid=uid, name=dataset.name, at=now)
+                )
+
+        for uid in (previous or {}).keys() - stamps.keys():
+            name = previous[uid][1]
+            events.append(
+                ChangeEvent(type="dataset.deleted", uid=uid, name=name, at=now)
+            )
+
+        self._datasets = datasets
+        return events
+
+    def _scan_jobs(self, rds_client: RDSClient, now: datetime) -> List[ChangeEvent]:
+        jobs = get_job_index(rds_client).snapshot()
+        previous = self._jobs
+        self._jobs = jobs
+        if previous is None:
+            return []
+
+        events = []
+        for uid, (status, dataset_name, created_at) in jobs.items():
+            known = previous.get(uid)
+            if known is None:
+                kind = "job.submitted"
+            elif known[0] != status:
+                kind = JOB_STATUS_EVENTS.get(status, "job.updated")
+            else:
+                continue
+            events.append(
+                ChangeEvent(
+                    type=kind,
+                    uid=uid,
+                    dataset_name=dataset_name,
+                    status=status,
+                    created_at=created_at,
+                    at=now,
+                )
+            )
+
+        for uid in previous.keys() - jobs.keys():
+            status, dataset_name, created_at = previous[uid]
+            events.append(
+                ChangeEvent(
+                    type="job.deleted",
+                    uid=uid,
+                    dataset_name=dataset_name,
+                    status=status,
+                    created_at=created_at,
+                    at=now,
+                )
+            )
+        return events
+
+    async def stream(
+        self, subscriber: Subscriber, heartbeat: float
+    ) -> AsyncIterator[str]:
+        """Format a subscriber's events as SSE, with a comment every `heartbeat`s."""
+        yield f"retry: {int(self.poll_interval * 1000)}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            data = json.dumps(event.model_dump(mode="json", by_alias=True))
+            yield f"event: {event.type}\ndata: {data}\n\n"
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if self._watcher is not None:
+            await run_io(self._watcher.stop)
+            self._watcher = None
+
+
+_hub: Optional[EventHub] = None
+
+
+def get_event_hub() -> EventHub:
+    """Get the process-wide event hub."""
+    global _hub
+    if _hub is None:
+        settings = get_settings()
+        _hub = EventHub(settings.events_poll_interval, settings.events_queue_size)
+    return _hub
+
+
+async def close_event_hub() -> None:
+    global _hub
+    if _hub is not None:
+        hub, _hub = _hub, None
+        await hub.stop()
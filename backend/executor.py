@@ -0,0 +1,120 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+
+from .config import get_settings
+
+T = TypeVar("T")
+
+
+class WorkerPool:
+    """A bounded executor that keeps queue-depth counters for metrics."""
+
+    def __init__(self, name: str, executor: Executor, max_workers: int):
+        self.name = name
+        self.executor = executor
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """
+        Run `func` on the pool.
+
+        A call that has started can't be interrupted, so if the caller is
+        cancelled it waits for the call to finish before the cancellation
+        propagates; cleanup done on cancellation never races the worker.
+        """
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self.executor.submit(functools.partial(func, *args, **kwargs))
+            try:
+                result = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if not future.cancel():
+                    await asyncio.wait([asyncio.wrap_future(future)])
+                raise
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        return result
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "pending": self._pending,
+                "running": min(self._pending, self.max_workers),
+                "queued": max(0, self._pending - self.max_workers),
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[str, WorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name: str) -> Optional[WorkerPool]:
+    with _pools_lock:
+        if name in _pools:
+            return _pools[name]
+
+        settings = get_settings()
+        if name == "io":
+            workers = settings.io_workers
+            executor = ThreadPoolExecutor(workers, thread_name_prefix="io")
+        elif name == "cpu" and settings.cpu_workers > 0:
+            workers = settings.cpu_workers
+            executor = ProcessPoolExecutor(workers)
+        else:
+            return None
+
+        pool = _pools[name] = WorkerPool(name, executor, workers)
+        logger.debug(f"Started {name} worker pool with {workers} workers")
+        return pool
+
+
+async def run_io(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run blocking I/O (syft_rds, filesystem, HTTP) on the bounded thread pool."""
+    return await _get_pool("io").run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work (pandas) on the process pool.
+
+    Falls back to the I/O thread pool when `cpu_workers` is 0. `func` and
+    its arguments must be picklable when the process pool is enabled.
+    """
+    pool = _get_pool("cpu") or _get_pool("io")
+    return await pool.run(func, *args, **kwargs)
+
+
+def executor_metrics() -> Dict[str, Dict[str, int]]:
+    """Queue-depth and throughput counters for every started pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.metrics() for pool in pools}
+
+
+def shutdown_executors() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
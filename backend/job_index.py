@@ -0,0 +1,327 @@
+import base64
+import bisect
+import itertools
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Literal, NamedTuple, Optional
+
+from loguru import logger
+from syft_rds.client.rds_client import RDSClient
+from syft_rds.models.models import Job
+
+from .lib.files import yaml_stamps
+from .lib.json_responses import dumps
+from .models import Job as JobModel
+
+type SortKey = tuple[datetime, str]
+
+# Below this share of all jobs, filtered candidates are sorted directly
+# instead of walking the whole created_at order
+SORT_CANDIDATES_RATIO = 8
+
+# Serialised listing pages kept per index, for repeated identical queries
+MAX_CACHED_PAGES = 32
+
+# Fields of each job in the "summary" view of a listing, i.e. what the jobs
+# page shows; the "full" view has every field of `Job`
+SUMMARY_FIELDS = (
+    "uid",
+    "name",
+    "description",
+    "datasetName",
+    "createdBy",
+    "createdAt",
+    "updatedAt",
+    "status",
+)
+
+type JobView = Literal["full", "summary"]
+
+
+class JobPage(NamedTuple):
+    jobs: List[Job]
+    total: int
+    next_cursor: Optional[str]
+
+
+def _sort_key(job: Job) -> SortKey:
+    created_at = job.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at, str(job.uid)
+
+
+def encode_cursor(key: SortKey) -> str:
+    raw = f"{key[0].isoformat()}|{key[1]}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Parse a cursor from `encode_cursor`, or raise `ValueError`."""
+    try:
+        created_at, uid = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), uid
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+class JobIndex:
+    """
+    In-memory index of the RDS job store.
+
+    Each job's YAML file is parsed once and only re-read when its mtime or
+    size changes. Jobs are indexed by status, requester and dataset, and
+    kept in created_at order, so a filtered page costs a directory scan and
+    a set intersection instead of parsing every job.
+    """
+
+    def __init__(self, rds_client: RDSClient):
+        self.rds_client = rds_client
+        self._store = rds_client.local_store.jobs.store
+        self._lock = threading.Lock()
+        self._stamps: Dict[str, tuple[int, int]] = {}
+        self._jobs: Dict[str, Job] = {}
+        # sort key and indexed values of each job as it was added; callers
+        # may mutate the returned jobs (e.g. `jobs.approve` sets the status)
+        self._entries: Dict[str, tuple[SortKey, tuple[str, str, str]]] = {}
+        self._order: List[SortKey] = []
+        self._by_status: Dict[str, set[str]] = {}
+        self._by_requester: Dict[str, set[str]] = {}
+        self._by_dataset: Dict[str, set[str]] = {}
+        # JSON view of each job, built on first listing, and serialised pages
+        # of recent queries; both are dropped as the jobs they cover change
+        self._views: Dict[str, dict] = {}
+        self._pages: OrderedDict[tuple, tuple[int, bytes]] = OrderedDict()
+        self._version = 0
+
+    @property
+    def path(self) -> Path:
+        return self._store.item_type_dir
+
+    def _add(self, job: Job) -> None:
+        uid = str(job.uid)
+        key = _sort_key(job)
+        values = (job.status.value, (job.created_by or "").lower(), job.dataset_name)
+        self._jobs[uid] = job
+        self._entries[uid] = key, values
+        bisect.insort(self._order, key)
+        for index, value in zip(self._value_indexes(), values):
+            index.setdefault(value, set()).add(uid)
+
+    def _value_indexes(self) -> tuple[Dict[str, set[str]], ...]:
+        return self._by_status, self._by_requester, self._by_dataset
+
+    def _remove(self, uid: str) -> None:
+        self._jobs.pop(uid, None)
+        self._views.pop(uid, None)
+        entry = self._entries.pop(uid, None)
+        if entry is None:
+            return
+        key, values = entry
+        i = bisect.bisect_left(self._order, key)
+        if i < len(self._order) and self._order[i] == key:
+            del self._order[i]
+        for index, value in zip(self._value_indexes(), values):
+            uids = index.get(value)
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del index[value]
+
+    def refresh(self) -> None:
+        """Re-read the job files that were added, changed or removed."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        stamps = yaml_stamps(self.path)
+
+        for uid in self._stamps.keys() - stamps.keys():
+            self._remove(uid)
+
+        changed = [
+            uid for uid, stamp in stamps.items() if self._stamps.get(uid) != stamp
+        ]
+        for uid in changed:
+            self._remove(uid)
+            try:
+                job = self._store.get_by_uid(uid)
+            except Exception as e:
+                # likely caught mid-write; retried on the next refresh
+                logger.warning(f"Failed to load job {uid}: {e}")
+                stamps.pop(uid)
+                continue
+            if job is not None:
+                self._add(self.rds_client.local_store.jobs.register_client_id(job))
+
+        if changed or len(stamps) != len(self._stamps):
+            self._version += 1
+        self._stamps = stamps
+        if changed:
+            logger.debug(f"Job index refreshed {len(changed)} of {len(stamps)} jobs")
+
+    def snapshot(self) -> Dict[str, tuple[str, str, datetime]]:
+        """The status, dataset and creation time of every job, after a refresh."""
+        with self._lock:
+            self._refresh()
+            return {
+                uid: (status, dataset, key[0])
+                for uid, (key, (status, _, dataset)) in self._entries.items()
+            }
+
+    def get_many(self, uids: Iterable[str]) -> Dict[str, Optional[Job]]:
+        """Look up many jobs by uid against a single refresh."""
+        with self._lock:
+            self._refresh()
+            return {uid: self._jobs.get(uid) for uid in uids}
+
+    def query(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        requester: Optional[str] = None,
+        dataset: Optional[str] = None,
+        order: Literal["asc", "desc"] = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> JobPage:
+        """
+        Return the jobs matching all given filters, ordered by created_at.
+
+        Pages are keyset-based: `next_cursor` points after the last job
+        returned, so jobs added meanwhile never shift later pages.
+        """
+        with self._lock:
+            self._refresh()
+            return self._query(statuses, requester, dataset, order, limit, cursor)
+
+    def render(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        requester: Optional[str] = None,
+        dataset: Optional[str] = None,
+        order: Literal["asc", "desc"] = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        view: JobView = "full",
+    ) -> bytes:
+        """
+        Like `query`, but return the page as a serialised `ListJobsResponse`.
+
+        With `view="summary"` each job only has the `SUMMARY_FIELDS`. Jobs
+        are converted to their API form once, and the bytes of recent pages
+        are reused until a job changes, so repeating an unchanged listing
+        costs a directory scan and a dictionary lookup.
+        """
+        key = (
+            tuple(sorted(statuses)) if statuses is not None else None,
+            requester and requester.lower(),
+            dataset,
+            order,
+            limit,
+            cursor,
+            view,
+        )
+        with self._lock:
+            self._refresh()
+            cached = self._pages.get(key)
+            if cached is not None and cached[0] == self._version:
+                self._pages.move_to_end(key)
+                return cached[1]
+
+            page = self._query(statuses, requester, dataset, order, limit, cursor)
+            body = dumps(
+                {
+                    "jobs": [self._view(job, view) for job in page.jobs],
+                    "total": page.total,
+                    "nextCursor": page.next_cursor,
+                }
+            )
+            self._pages[key] = self._version, body
+            self._pages.move_to_end(key)
+            while len(self._pages) > MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+            return body
+
+    def _view(self, job: Job, view: JobView) -> dict:
+        uid = str(job.uid)
+        full = self._views.get(uid)
+        if full is None:
+            full = JobModel.model_validate(job).model_dump(mode="json", by_alias=True)
+            self._views[uid] = full
+        if view == "summary":
+            return {field: full.get(field) for field in SUMMARY_FIELDS}
+        return full
+
+    def _query(
+        self,
+        statuses: Optional[Iterable[str]],
+        requester: Optional[str],
+        dataset: Optional[str],
+        order: Literal["asc", "desc"],
+        limit: Optional[int],
+        cursor: Optional[str],
+    ) -> JobPage:
+        after = decode_cursor(cursor) if cursor else None
+        candidates = None
+        if statuses is not None:
+            candidates = set().union(
+                *(self._by_status.get(status, ()) for status in statuses)
+            )
+        for index, value in (
+            (self._by_requester, requester and requester.lower()),
+            (self._by_dataset, dataset),
+        ):
+            if value is not None:
+                uids = index.get(value, set())
+                candidates = uids if candidates is None else candidates & uids
+
+        total = len(self._jobs) if candidates is None else len(candidates)
+        keys = self._ordered_keys(candidates, order, after)
+
+        page = list(itertools.islice(keys, limit))
+        jobs = [self._jobs[uid] for _, uid in page]
+
+        next_cursor = None
+        if page and next(keys, None) is not None:
+            next_cursor = encode_cursor(page[-1])
+        return JobPage(jobs, total, next_cursor)
+
+    def _ordered_keys(
+        self,
+        candidates: Optional[set[str]],
+        order: Literal["asc", "desc"],
+        after: Optional[SortKey],
+    ) -> Iterator[SortKey]:
+        if candidates is not None and (
+            len(candidates) * SORT_CANDIDATES_RATIO < len(self._order)
+        ):
+            keys = sorted(self._entries[uid][0] for uid in candidates)
+        else:
+            keys = self._order
+
+        if order == "desc":
+            end = len(keys) if after is None else bisect.bisect_left(keys, after)
+            ordered = (keys[i] for i in range(end - 1, -1, -1))
+        else:
+            start = 0 if after is None else bisect.bisect_right(keys, after)
+            ordered = (keys[i] for i in range(start, len(keys)))
+
+        if candidates is None or keys is not self._order:
+            return ordered
+        return (key for key in ordered if key[1] in candidates)
+
+
+_indexes: Dict[str, JobIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_job_index(rds_client: RDSClient) -> JobIndex:
+    """Get the process-wide job index of an RDS session."""
+    with _indexes_lock:
+        index = _indexes.get(rds_client.email)
+        # the session pool opens a new session when the config changes
+        if index is None or index.rds_client is not rds_client:
+            index = _indexes[rds_client.email] = JobIndex(rds_client)
+        return index
@@ -0,0 +1,211 @@
+import io
+from pathlib import Path
+from typing import Iterator, Literal
+
+import pandas as pd
+from fastapi import HTTPException
+from loguru import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, see the `columnar` extra
+    pa = None
+
+type DownloadFormat = Literal["csv", "parquet", "arrow"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Rows per Parquet row group, and per batch when converting on download
+ROW_GROUP_SIZE = 64 * 1024
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise HTTPException(
+            status_code=501,
+            detail="Columnar formats need pyarrow, install the 'columnar' extra",
+        )
+
+
+def use_parquet_storage(storage_format: str) -> bool:
+    """Whether new datasets should be stored as Parquet."""
+    if storage_format != "parquet":
+        return False
+    if pa is None:
+        logger.warning("dataset_storage_format is 'parquet' but pyarrow is missing")
+        return False
+    return True
+
+
+def file_format(path: Path) -> str | None:
+    """The tabular format of a stored dataset file, if it has one."""
+    return {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow"}.get(
+        path.suffix.lower()
+    )
+
+
+def write_dataframe(df: pd.DataFrame, path: Path, index: bool = True) -> None:
+    """Write `df` as CSV or Parquet, depending on the suffix of `path`."""
+    if path.suffix.lower() == ".parquet":
+        require_pyarrow()
+        df.to_parquet(
+            path,
+            index=False,
+            compression=PARQUET_COMPRESSION,
+            row_group_size=ROW_GROUP_SIZE,
+        )
+    else:
+        df.to_csv(path, index=index)
+
+
+def can_read(path: Path) -> bool:
+    """Whether `read_dataframe` can read the file with what is installed."""
+    fmt = file_format(path)
+    return fmt == "csv" or (fmt is not None and pa is not None)
+
+
+def csv_has_index(path: Path) -> bool:
+    """Whether a CSV file starts with the unnamed index column `to_csv()` writes."""
+    header = pd.read_csv(path, nrows=0)
+    return len(header.columns) > 0 and header.columns[0] == "Unnamed: 0"
+
+
+def read_dataframe(path: Path) -> pd.DataFrame:
+    """
+    Read a whole CSV, Parquet or Arrow dataset file.
+
+    A CSV index column is read back as the index; Parquet and Arrow files
+    are memory-mapped. Raises `ValueError` for files that aren't tabular.
+    """
+    fmt = file_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, index_col=0 if csv_has_index(path) else None)
+    if fmt is None:
+        raise ValueError(f"{path.name} is not a tabular file")
+    require_pyarrow()
+    if fmt == "parquet":
+        return pq.read_table(path, memory_map=True).to_pandas()
+    return pa_ipc.open_stream(pa.memory_map(str(path))).read_all().to_pandas()
+
+
+def iter_dataframes(
+    path: Path, chunk_size: int = ROW_GROUP_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Read a dataset file like `read_dataframe`, `chunk_size` rows at a time."""
+    fmt = file_format(path)
+    if fmt == "csv":
+        index_col = 0 if csv_has_index(path) else None
+        with pd.read_csv(path, index_col=index_col, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+    if fmt is None:
+        raise ValueError(f"{path.name} is not a tabular file")
+    require_pyarrow()
+    if fmt == "parquet":
+        batches = pq.ParquetFile(path, memory_map=True).iter_batches(chunk_size)
+    else:
+        batches = pa_ipc.open_stream(pa.memory_map(str(path)))
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+def csv_to_parquet(source: Path, destination: Path) -> None:
+    """Convert a CSV file to Parquet one batch at a time."""
+    require_pyarrow()
+    try:
+        reader = pa_csv.open_csv(source)
+        with pq.ParquetWriter(
+            destination, reader.schema, compression=PARQUET_COMPRESSION
+        ) as writer:
+            for batch in reader:
+                writer.write_batch(batch, row_group_size=ROW_GROUP_SIZE)
+    except pa.ArrowInvalid as e:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=400, detail=f"Cannot store {source.name} as Parquet: {e}"
+        )
+
+
+def _iter_batches(path: Path) -> tuple["pa.Schema", Iterator["pa.RecordBatch"]]:
+    if file_format(path) == "parquet":
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        return parquet_file.schema_arrow, parquet_file.iter_batches(ROW_GROUP_SIZE)
+    if file_format(path) == "arrow":
+        reader = pa_ipc.open_stream(pa.memory_map(str(path)))
+        return reader.schema, iter(reader)
+    reader = pa_csv.open_csv(path)
+    return reader.schema, iter(reader)
+
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only file that hands out what was written since the last drain.
+
+    Writers keep their own offsets through `tell()`, so Parquet footers stay
+    correct even though the bytes are discarded once sent.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_converted(path: Path, target: DownloadFormat) -> Iterator[bytes]:
+    """
+    Stream a CSV or Parquet dataset file converted to `target`.
+
+    Only one batch of rows is held in memory at a time. Each batch is
+    written as a Parquet row group, an Arrow IPC stream message or a block
+    of CSV lines, and sent as soon as it has been encoded. The source is
+    opened before returning, so unreadable files fail before a response
+    has started.
+    """
+    require_pyarrow()
+    schema, batches = _iter_batches(path)
+    sink = _ChunkSink()
+
+    if target == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    elif target == "arrow":
+        writer = pa_ipc.new_stream(sink, schema)
+    else:
+        writer = pa_csv.CSVWriter(sink, schema)
+    return _stream(writer, batches, sink)
+
+
+def _stream(
+    writer, batches: Iterator["pa.RecordBatch"], sink: _ChunkSink
+) -> Iterator[bytes]:
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            if chunk := sink.drain():
+                yield chunk
+    finally:
+        writer.close()
+    if chunk := sink.drain():
+        yield chunk
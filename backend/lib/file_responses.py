@@ -0,0 +1,58 @@
+import os
+from email.utils import parsedate
+from pathlib import Path
+from typing import Optional
+
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+
+# Larger than starlette's 64KB default so big downloads need fewer sends when
+# the server can't use the zero-copy `http.response.pathsend` extension.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """Whether a conditional request can be answered with a 304."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = response_headers.get("etag")
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+        return etag is not None and ("*" in tags or etag in tags)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since and last_modified:
+        since, modified = parsedate(if_modified_since), parsedate(last_modified)
+        return since is not None and modified is not None and since >= modified
+
+    return False
+
+
+def conditional_file_response(
+    path: Path,
+    request_headers: Headers,
+    filename: Optional[str] = None,
+    media_type: str = "application/octet-stream",
+    stat_result: Optional[os.stat_result] = None,
+) -> Response:
+    """
+    Serve `path` with Content-Length, ETag and Last-Modified headers.
+
+    Returns a 304 when the client's validators still match. `Range` and
+    `If-Range` requests are answered with 206 partial content by
+    `FileResponse`, which also uses `http.response.pathsend` when the ASGI
+    server supports it.
+    """
+    response = FileResponse(
+        path,
+        filename=filename,
+        media_type=media_type,
+        stat_result=stat_result or path.stat(),
+    )
+    response.chunk_size = DOWNLOAD_CHUNK_SIZE
+
+    if is_not_modified(response.headers, request_headers):
+        return NotModifiedResponse(response.headers)
+    return response
@@ -0,0 +1,65 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    """The (mtime_ns, size) of a file, None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+type Fingerprint = tuple[tuple[str, int, int], ...]
+
+
+def scan_tree(path: Path, depth: int) -> list[tuple[str, int, int]]:
+    """Collect (path, mtime_ns, size) for `path` and its entries `depth` deep."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return [(str(path), -1, -1)]
+
+    entries = [(str(path), stat.st_mtime_ns, stat.st_size)]
+    if depth <= 0 or not path.is_dir():
+        return entries
+
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                entries.extend(scan_tree(Path(entry.path), depth - 1))
+            else:
+                entry_stat = entry.stat(follow_symlinks=False)
+                entries.append((entry.path, entry_stat.st_mtime_ns, entry_stat.st_size))
+    return entries
+
+
+def yaml_stamps(path: Path) -> Dict[str, tuple[int, int]]:
+    """The (mtime_ns, size) of each `.yaml` file in `path`, keyed by its stem."""
+    stamps = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.endswith(".yaml"):
+                    stat = entry.stat()
+                    stamps[entry.name[:-5]] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return stamps
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """
+    Write `data` as JSON to `path`.
+
+    The JSON goes to a temporary file that is then renamed over `path`, so
+    concurrent readers see either the old or the new file, never a partial
+    one.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
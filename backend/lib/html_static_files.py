@@ -1,7 +1,86 @@
+import os
+import threading
+import time
+from hashlib import md5
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+from .file_responses import is_not_modified
+
+# Content-hashed build output, never changed in place
+IMMUTABLE_PREFIX = "_next/static/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Pages keep their URL across builds, so clients revalidate them with the ETag
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# How often the index checks whether the export directory was rebuilt
+INDEX_CHECK_INTERVAL = 2.0
+
+# Precompressed variants, in order of preference
+VARIANTS = {"br": ".br", "gzip": ".gz"}
+
+
+class _Representation(NamedTuple):
+    path: str
+    stat: os.stat_result
+    headers: Dict[str, str]
+
+
+class _Asset(NamedTuple):
+    # keyed by content coding, "identity" for the file itself
+    representations: Dict[str, _Representation]
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _etag(stat: os.stat_result) -> str:
+    # same validator as starlette's FileResponse
+    base = f"{stat.st_mtime}-{stat.st_size}"
+    return f'"{md5(base.encode(), usedforsecurity=False).hexdigest()}"'
 
 
 class HTMLStaticFiles(StaticFiles):
+    """
+    Serves the static frontend export.
+
+    Extensionless routes map to their `.html` page. The export directory is
+    indexed in memory at startup and re-indexed when its top-level mtime
+    changes, so a request costs a `stat()` of the file served, which also
+    catches files rewritten in place. Precompressed `.br`/`.gz` variants
+    (see `precompress`) are served to clients that accept them, unless
+    older than their original; content-hashed `_next/static` assets are
+    cached as immutable, and conditional requests are answered from the
+    index.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index_lock = threading.Lock()
+        self._index: Optional[Dict[str, _Asset]] = None
+        self._index_stamp: Optional[int] = None
+        self._index_checked_at = 0.0
+        self._get_index()
+
     def lookup_path(self, path):
         full_path, stat = super().lookup_path(path)
 
@@ -10,3 +89,119 @@ class HTMLStaticFiles(StaticFiles):
             return super().lookup_path(f"{path}.html")
 
         return full_path, stat
+
+    def _directory_stamp(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except (FileNotFoundError, TypeError):
+            return None
+
+    def _get_index(self) -> Optional[Dict[str, _Asset]]:
+        now = time.monotonic()
+        recently_checked = now - self._index_checked_at < INDEX_CHECK_INTERVAL
+        if self._index is not None and recently_checked:
+            return self._index
+        with self._index_lock:
+            stamp = self._directory_stamp()
+            if self._index is None or stamp != self._index_stamp:
+                self._index = self._build_index() if stamp is not None else None
+                self._index_stamp = stamp
+            self._index_checked_at = now
+            return self._index
+
+    def _build_index(self) -> Dict[str, _Asset]:
+        root = Path(self.directory)
+        index: Dict[str, _Asset] = {}
+        for dirpath, _, files in os.walk(root):
+            names = set(files)
+            for name in files:
+                if any(name.endswith(suffix) for suffix in VARIANTS.values()):
+                    if name.rsplit(".", 1)[0] in names:
+                        continue  # a variant, indexed with its original
+                path = Path(dirpath) / name
+                rel = path.relative_to(root).as_posix()
+                index[rel] = self._index_asset(path, rel, names)
+
+        # the routes the export's pages are served under
+        for rel, asset in list(index.items()):
+            if rel == "index.html":
+                index.setdefault(".", asset)
+            elif rel.endswith("/index.html"):
+                index.setdefault(rel[: -len("/index.html")], asset)
+            elif rel.endswith(".html"):
+                index.setdefault(rel[: -len(".html")], asset)
+        return index
+
+    def _index_asset(self, path: Path, rel: str, names: set[str]) -> _Asset:
+        media_type = guess_type(path.name)[0] or "text/plain"
+        cache_control = (
+            IMMUTABLE_CACHE_CONTROL
+            if rel.startswith(IMMUTABLE_PREFIX)
+            else REVALIDATE_CACHE_CONTROL
+        )
+
+        def representation(variant: Path, encoding: Optional[str]) -> _Representation:
+            stat = variant.stat()
+            headers = {
+                "content-type": media_type,
+                "cache-control": cache_control,
+                "etag": _etag(stat),
+                "vary": "Accept-Encoding",
+            }
+            if encoding is not None:
+                headers["content-encoding"] = encoding
+            return _Representation(str(variant), stat, headers)
+
+        representations = {"identity": representation(path, None)}
+        for encoding, suffix in VARIANTS.items():
+            if path.name + suffix in names:
+                variant = path.with_name(path.name + suffix)
+                representations[encoding] = representation(variant, encoding)
+        return _Asset(representations)
+
+    def _current(self, asset: _Asset, encoding: str) -> Optional[_Representation]:
+        """A representation with the current stat of its file, None if it's gone."""
+        cached = asset.representations[encoding]
+        try:
+            stat = os.stat(cached.path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) != (
+            cached.stat.st_mtime_ns,
+            cached.stat.st_size,
+        ):
+            cached = asset.representations[encoding] = cached._replace(
+                stat=stat, headers={**cached.headers, "etag": _etag(stat)}
+            )
+        return cached
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        index = self._get_index() if scope["method"] in ("GET", "HEAD") else None
+        asset = index.get(Path(path).as_posix()) if index else None
+        if asset is None:
+            return await super().get_response(path, scope)
+
+        identity = self._current(asset, "identity")
+        if identity is None:
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        representation = identity
+        for encoding in VARIANTS:
+            if encoding not in accepted or encoding not in asset.representations:
+                continue
+            variant = self._current(asset, encoding)
+            # a variant older than its original wasn't rebuilt with it
+            if variant and variant.stat.st_mtime_ns >= identity.stat.st_mtime_ns:
+                representation = variant
+                break
+
+        if is_not_modified(Headers(representation.headers), request_headers):
+            return NotModifiedResponse(Headers(representation.headers))
+        return FileResponse(
+            representation.path,
+            media_type=representation.headers["content-type"],
+            stat_result=representation.stat,
+            headers=representation.headers,
+        )
@@ -0,0 +1,35 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see the `fast-json` extra
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise `content` to compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=str)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """`JSONResponse` rendered with orjson, falling back to the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """A response whose body is JSON that was serialised (and cached) earlier."""
+
+    media_type = "application/json"
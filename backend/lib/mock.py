@@ -0,0 +1,264 @@
+import hashlib
+import shutil
+import warnings
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .columnar import csv_has_index, read_dataframe
+
+# Bump when the generator changes so cached mocks are regenerated
+GENERATOR_VERSION = 2
+
+# Category values seen fewer times than this are never copied into the mock,
+# so rare (identifying) values from the private data can't leak.
+MIN_CATEGORY_COUNT = 5
+MAX_CATEGORIES = 1000
+
+MAX_CACHED_MOCKS = 64
+
+# Day, second, millisecond and microsecond, in nanoseconds
+DATETIME_RESOLUTIONS = (86_400 * 10**9, 10**9, 10**6, 10**3)
+
+# Text layouts of CSV timestamps that the mock reproduces
+DATETIME_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+)
+OFFSET_FORMATS = ("Z", "%:z", "%z")
+
+
+def _synthetic_strings(name: str, rows: int, rng: np.random.Generator) -> pd.Series:
+    ids = pd.Series(rng.integers(0, max(rows, 1), size=rows)).astype(str)
+    return f"{name or 'value'}_" + ids
+
+
+def _resolution(as_int: pd.Series) -> int:
+    """The coarsest unit, in nanoseconds, that all the timestamps are whole in."""
+    for step in DATETIME_RESOLUTIONS:
+        if (as_int % step == 0).all():
+            return step
+    return 1
+
+
+def _mock_column(series: pd.Series, rows: int, rng: np.random.Generator) -> pd.Series:
+    """Sample `rows` synthetic values that follow the distribution of `series`."""
+    non_null = series.dropna()
+    if non_null.empty:
+        return pd.Series([None] * rows, dtype=series.dtype)
+
+    if pd.api.types.is_bool_dtype(series):
+        values = pd.Series(rng.random(rows) < non_null.mean())
+    elif pd.api.types.is_numeric_dtype(series):
+        low, high = non_null.min(), non_null.max()
+        std = non_null.std() if len(non_null) > 1 else 0.0
+        sampled = rng.normal(non_null.mean(), std, size=rows).clip(low, high)
+        if pd.api.types.is_integer_dtype(series):
+            sampled = np.rint(sampled).astype(series.dtype)
+        values = pd.Series(sampled)
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        # sampled as wall-clock times at the column's own resolution, so naive
+        # columns stay naive and aware ones keep their zone
+        tz = series.dt.tz
+        wall = non_null.dt.tz_localize(None) if tz is not None else non_null
+        as_int = wall.astype("datetime64[ns]").astype("int64")
+        low, high = as_int.min(), as_int.max()
+        step = _resolution(as_int)
+        sampled = rng.integers(low, high + 1, size=rows)
+        sampled -= (sampled - low) % step
+        values = pd.Series(pd.to_datetime(sampled))
+        if tz is not None:
+            values = values.dt.tz_localize(
+                tz, ambiguous="NaT", nonexistent="shift_forward"
+            )
+        values = values.astype(series.dtype)
+    else:
+        counts = non_null.value_counts()
+        common = counts[counts >= MIN_CATEGORY_COUNT].iloc[:MAX_CATEGORIES]
+        values = _synthetic_strings(series.name, rows, rng)
+        if not common.empty:
+            chosen = rng.choice(
+                common.index.to_numpy(), size=rows, p=(common / common.sum()).to_numpy()
+            )
+            # rare values are replaced by synthetic tokens at the same overall rate
+            keep = rng.random(rows) < common.sum() / len(non_null)
+            values = values.where(~keep, pd.Series(chosen))
+
+    null_rate = 1 - len(non_null) / len(series)
+    if null_rate > 0:
+        values = values.mask(rng.random(rows) < null_rate)
+    return values
+
+
+def generate_mock_dataframe(
+    df: pd.DataFrame, rows: int, seed: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Generate a synthetic DataFrame with the same columns and dtypes as `df`.
+
+    Every column is sampled independently and vectorised: numbers from a
+    normal distribution clipped to the observed range, datetimes uniformly
+    within the observed range, booleans and frequent categories with their
+    observed frequencies, and everything else as synthetic tokens. Null
+    rates are preserved.
+    """
+    rng = np.random.default_rng(seed)
+    mock = pd.DataFrame(
+        {column: _mock_column(df[column], rows, rng) for column in df.columns}
+    )
+    return mock[df.columns]
+
+
+def _datetime_format(sample: pd.Series, parsed: pd.Series) -> Optional[str]:
+    """The strftime format that reproduces `sample` exactly, if there is one."""
+    offsets = OFFSET_FORMATS if parsed.dt.tz is not None else ("",)
+    for base in DATETIME_FORMATS:
+        for offset in offsets:
+            fmt = base + offset
+            if (parsed.dt.strftime(fmt) == sample).all():
+                return fmt
+    return None
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    """
+    Parse ISO timestamps, keeping naive values naive.
+
+    Values with a single UTC offset keep it; mixed offsets are converted to
+    UTC, as a column can only have one zone.
+    """
+    with warnings.catch_warnings():
+        # pandas warns before falling back to objects for mixed offsets
+        warnings.simplefilter("ignore", FutureWarning)
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    if not pd.api.types.is_datetime64_any_dtype(parsed):
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    return parsed
+
+
+def _parse_datetime_columns(
+    df: pd.DataFrame,
+) -> tuple[pd.DataFrame, dict[str, str]]:
+    """
+    Convert text columns that hold ISO timestamps, as CSV has no datetime type.
+
+    Returns the frame with the text format of each converted column, so the
+    mock can be written back in the same layout.
+    """
+    formats = {}
+    for column in df.select_dtypes(include="object").columns:
+        sample = df[column].dropna().head(100)
+        if sample.empty:
+            continue
+        parsed = _to_datetime(sample)
+        if not parsed.notna().all():
+            continue
+        df[column] = _to_datetime(df[column])
+        fmt = _datetime_format(sample, parsed)
+        if fmt is not None:
+            formats[column] = fmt
+    return df, formats
+
+
+def _read_table(path: Path) -> tuple[pd.DataFrame, bool, dict[str, str]]:
+    """
+    Read a tabular file.
+
+    Returns the frame, whether it has an index column and the text format
+    of its CSV timestamp columns.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        df, formats = _parse_datetime_columns(read_dataframe(path))
+        return df, csv_has_index(path), formats
+    if suffix == ".json":
+        return pd.read_json(path), False, {}
+    if suffix == ".parquet":
+        return read_dataframe(path), False, {}
+    raise ValueError(f"Unsupported file type for mock generation: {suffix}")
+
+
+def _write_table(
+    df: pd.DataFrame, path: Path, index: bool, formats: dict[str, str]
+) -> None:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        df = df.assign(
+            **{column: df[column].dt.strftime(fmt) for column, fmt in formats.items()}
+        )
+        df.to_csv(path, index=index)
+    elif suffix == ".json":
+        df.to_json(path, orient="records", date_format="iso")
+    elif suffix == ".parquet":
+        df.to_parquet(path, index=index)
+    else:
+        raise ValueError(f"Unsupported file type for mock generation: {suffix}")
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _evict(cache_dir: Path) -> None:
+    cached = sorted(cache_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in cached[MAX_CACHED_MOCKS:]:
+        path.unlink(missing_ok=True)
+
+
+def generate_mock_file(
+    real_path: Path,
+    mock_path: Path,
+    rows: int,
+    cache_dir: Optional[Path] = None,
+    content_hash: Optional[str] = None,
+) -> Path:
+    """
+    Write a schema-compatible synthetic mock of `real_path` to `mock_path`.
+
+    Mocks are cached in `cache_dir` by the SHA-256 of the real file, so
+    re-importing identical data is a file copy. Files that can't be read as
+    a table get an empty mock with the same extension.
+    """
+    content_hash = content_hash or file_sha256(real_path)
+    cache_path = None
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_name = f"{content_hash}-{rows}-v{GENERATOR_VERSION}{mock_path.suffix}"
+        cache_path = cache_dir / cache_name
+        if cache_path.is_file():
+            shutil.copyfile(cache_path, mock_path)
+            cache_path.touch()
+            logger.debug(f"Mock dataset served from cache: {cache_path}")
+            return mock_path
+
+    try:
+        df, has_index, formats = _read_table(real_path)
+    except Exception as e:
+        logger.warning(
+            f"Cannot read {real_path.name} as a table ({e}), using empty mock"
+        )
+        mock_path.touch()
+        return mock_path
+
+    # deterministic per input, so regenerating a mock gives the same data
+    seed = int(content_hash[:16], 16)
+    mock_df = generate_mock_dataframe(df, rows, seed=seed)
+    _write_table(mock_df, mock_path, index=has_index, formats=formats)
+    logger.debug(f"Mock dataset with {rows} rows generated at: {mock_path}")
+
+    if cache_path is not None:
+        shutil.copyfile(mock_path, cache_path)
+        _evict(cache_dir)
+    return mock_path
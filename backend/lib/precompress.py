@@ -0,0 +1,73 @@
+import gzip
+import os
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+try:
+    import brotli
+except ImportError:  # optional; without it only .gz variants are written
+    brotli = None
+
+# Text assets worth compressing; fonts and images are already compressed
+COMPRESSIBLE_SUFFIXES = {
+    ".css",
+    ".html",
+    ".js",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+}
+
+MIN_SIZE = 1024
+
+ENCODINGS = {".br": "br", ".gz": "gzip"}
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".br":
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output, and so its ETag, identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress(directory: Path) -> int:
+    """
+    Write `.br` and `.gz` variants next to the compressible files in `directory`.
+
+    Variants that are up to date are skipped, and variants that aren't
+    smaller than the original are not kept. Returns the number written.
+    """
+    suffixes = [".br", ".gz"] if brotli is not None else [".gz"]
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = Path(root) / name
+            if path.suffix not in COMPRESSIBLE_SUFFIXES:
+                continue
+            stat = path.stat()
+            if stat.st_size < MIN_SIZE:
+                continue
+
+            data = None
+            for suffix in suffixes:
+                variant = path.with_name(path.name + suffix)
+                if variant.exists() and variant.stat().st_mtime >= stat.st_mtime:
+                    continue
+                data = data if data is not None else path.read_bytes()
+                compressed = _compress(data, suffix)
+                if len(compressed) >= len(data):
+                    variant.unlink(missing_ok=True)
+                    continue
+                variant.write_bytes(compressed)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    directory = Path(sys.argv[1] if len(sys.argv) > 1 else "frontend/out")
+    count = precompress(directory)
+    logger.info(f"Wrote {count} precompressed variants in {directory}")
@@ -0,0 +1,254 @@
+import bisect
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+import pandas as pd
+
+from .columnar import csv_has_index, file_format, require_pyarrow
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, see the `columnar` extra
+    pa = None
+
+# A CSV row index keeps one (row, byte offset) checkpoint per block read,
+# so reaching any row costs at most one block of scanning past a checkpoint
+BLOCK_SIZE = 1024 * 1024
+
+MAX_CACHED_INDEXES = 32
+
+
+def _row_ends(block: bytes, start: int = 0) -> Iterator[int]:
+    """
+    Yield the position just after each newline that ends a CSV row.
+
+    `start` must be at a row boundary. Newlines inside quoted fields are
+    skipped by tracking the parity of the quotes seen (an escaped `""`
+    flips it twice).
+    """
+    if b'"' not in block:
+        pos = block.find(b"\n", start)
+        while pos != -1:
+            yield pos + 1
+            pos = block.find(b"\n", pos + 1)
+        return
+
+    in_quotes = False
+    while (newline := block.find(b"\n", start)) != -1:
+        if block.count(b'"', start, newline) & 1:
+            in_quotes = not in_quotes
+        start = newline + 1
+        if not in_quotes:
+            yield start
+
+
+def _find_row_ends(f: BinaryIO, offset: int, count: int) -> tuple[List[int], bool]:
+    """
+    Find the end offsets of the next `count` rows from `offset`.
+
+    Returns them with whether the end of the file was reached; a last row
+    without a trailing newline ends at the end of the file.
+    """
+    ends: List[int] = []
+    block_size = BLOCK_SIZE
+    while len(ends) < count:
+        f.seek(offset)
+        block = f.read(block_size)
+        at_eof = len(block) < block_size
+        found = False
+        for end in _row_ends(block):
+            ends.append(offset + end)
+            found = True
+            if len(ends) == count:
+                return ends, False
+        if at_eof:
+            tail = block[ends[-1] - offset :] if found else block
+            if tail.strip():
+                ends.append(offset + len(block))
+            return ends, True
+        if found:
+            offset = ends[-1]
+            block_size = BLOCK_SIZE
+        else:
+            # a single row longer than the block
+            block_size *= 2
+    return ends, False
+
+
+class CsvRowIndex:
+    """
+    Sparse row-offset index of a CSV file, built lazily.
+
+    The index only grows as far as the deepest row requested so far, one
+    block at a time, so previewing the first rows of a huge file never
+    scans past them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        with open(path, "rb") as f:
+            ends, _ = _find_row_ends(f, 0, 1)
+            data_start = ends[0] if ends else 0
+            f.seek(0)
+            self.header = f.read(data_start)
+        self._rows: List[int] = [0]
+        self._offsets: List[int] = [data_start]
+        self.total_rows: Optional[int] = None
+
+    def _extend(self, f: BinaryIO, row: int) -> None:
+        while self.total_rows is None and self._rows[-1] < row:
+            last_row, last_offset = self._rows[-1], self._offsets[-1]
+            f.seek(last_offset)
+            block = f.read(BLOCK_SIZE)
+            end = None
+            rows = 0
+            for end in _row_ends(block):
+                rows += 1
+            if len(block) < BLOCK_SIZE:
+                tail = block[end or 0 :]
+                self.total_rows = last_row + rows + (1 if tail.strip() else 0)
+            elif end is None:
+                # no boundary in a whole block; let the next lookup walk it
+                ends, at_eof = _find_row_ends(f, last_offset, 1)
+                if at_eof:
+                    self.total_rows = last_row + len(ends)
+                else:
+                    self._rows.append(last_row + 1)
+                    self._offsets.append(ends[0])
+            else:
+                self._rows.append(last_row + rows)
+                self._offsets.append(last_offset + end)
+
+    def read(self, offset: int, count: int) -> tuple[bytes, bool]:
+        """The bytes of rows `offset` to `offset + count`, and whether more follow."""
+        with open(self.path, "rb") as f:
+            with self._lock:
+                self._extend(f, offset)
+                i = bisect.bisect_right(self._rows, offset) - 1
+                row, start = self._rows[i], self._offsets[i]
+
+            skip = offset - row
+            ends, _ = _find_row_ends(f, start, skip + count)
+            if len(ends) <= skip:
+                return b"", False
+            if skip:
+                start = ends[skip - 1]
+            f.seek(start)
+            data = f.read(ends[-1] - start)
+            has_more = (
+                len(ends) == skip + count and ends[-1] < os.fstat(f.fileno()).st_size
+            )
+            return data, has_more
+
+
+_indexes: OrderedDict[tuple[str, int, int], CsvRowIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _csv_index(path: Path) -> CsvRowIndex:
+    """The cached row index of a CSV file, rebuilt if the file changed."""
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = CsvRowIndex(path)
+    with _indexes_lock:
+        index = _indexes.setdefault(key, index)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def _page(df: pd.DataFrame) -> dict:
+    # `to_json` turns numpy values, NaN and timestamps into plain JSON types
+    return {
+        "columns": [
+            {"name": str(name), "dtype": str(dtype)}
+            for name, dtype in df.dtypes.items()
+        ],
+        "rows": json.loads(df.to_json(orient="values", date_format="iso")),
+    }
+
+
+def _preview_csv(path: Path, offset: int, count: int) -> dict:
+    index = _csv_index(path)
+    if not index.header.strip():
+        return {"columns": [], "rows": [], "total_rows": 0, "has_more": False}
+    data, has_more = index.read(offset, count)
+    source = io.BytesIO(index.header + data)
+    df = pd.read_csv(source, index_col=0 if csv_has_index(path) else None)
+    return {**_page(df), "total_rows": index.total_rows, "has_more": has_more}
+
+
+def _preview_parquet(path: Path, offset: int, count: int) -> dict:
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    metadata = parquet_file.metadata
+    total = metadata.num_rows
+
+    # the footer's row group sizes are the row-offset index
+    groups, first_row, row = [], None, 0
+    for i in range(metadata.num_row_groups):
+        group_rows = metadata.row_group(i).num_rows
+        if row + group_rows > offset and row < offset + count:
+            groups.append(i)
+            first_row = row if first_row is None else first_row
+        row += group_rows
+
+    if groups:
+        table = parquet_file.read_row_groups(groups)
+        table = table.slice(offset - first_row, count)
+    else:
+        table = parquet_file.schema_arrow.empty_table()
+    return {
+        **_page(table.to_pandas()),
+        "total_rows": total,
+        "has_more": offset + count < total,
+    }
+
+
+def _preview_arrow(path: Path, offset: int, count: int) -> dict:
+    reader = pa_ipc.open_stream(pa.memory_map(str(path)))
+    # IPC streams have no footer, so the batches before `offset` are skipped
+    batches, row, has_more = [], 0, False
+    for batch in reader:
+        if row >= offset + count:
+            has_more = True
+            break
+        if row + batch.num_rows > offset:
+            start = max(offset - row, 0)
+            batches.append(batch.slice(start, offset + count - row - start))
+        row += batch.num_rows
+    has_more = has_more or row > offset + count
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    return {**_page(table.to_pandas()), "total_rows": None, "has_more": has_more}
+
+
+def preview_file(path: Path, offset: int, count: int) -> dict:
+    """
+    Read rows `offset` to `offset + count` of a CSV, Parquet or Arrow file.
+
+    Only the bytes of the requested rows are read: CSV files through a
+    lazily built row-offset index cached per file, Parquet files through
+    the row group sizes in their footer. Raises `ValueError` for files that
+    aren't tabular.
+    """
+    fmt = file_format(path)
+    if fmt is None:
+        raise ValueError(f"{path.name} is not a tabular file")
+    if fmt == "csv":
+        return _preview_csv(path, offset, count)
+    require_pyarrow()
+    if fmt == "parquet":
+        return _preview_parquet(path, offset, count)
+    return _preview_arrow(path, offset, count)
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from .columnar import can_read, file_format, iter_dataframes
+
+# Bump when the profile layout changes so stored profiles are recomputed
+PROFILE_VERSION = 1
+
+
+class _ColumnStats:
+    """Running statistics of one column, merged one chunk at a time."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.dtype: Optional[str] = None
+        self.count = 0
+        self.nulls = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.sum = 0.0
+        self.summed = 0
+
+    def _merge_dtype(self, dtype: str) -> None:
+        if self.dtype is None or self.dtype == dtype:
+            self.dtype = dtype
+        elif _is_number(self.dtype) and _is_number(dtype):
+            # e.g. an integer column whose later chunks contain nulls
+            self.dtype = "float64"
+        else:
+            self.dtype = "object"
+
+    def update(self, series: pd.Series) -> None:
+        self._merge_dtype(str(series.dtype))
+        non_null = series.dropna()
+        self.count += len(series)
+        self.nulls += len(series) - len(non_null)
+        if non_null.empty:
+            return
+
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            if not pd.api.types.is_bool_dtype(series):
+                self._merge_range(non_null.min(), non_null.max())
+            self.sum += float(non_null.sum())
+            self.summed += len(non_null)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            self._merge_range(non_null.min(), non_null.max())
+
+    def _merge_range(self, low: Any, high: Any) -> None:
+        try:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            # mixed types across chunks, e.g. naive and aware timestamps
+            self.min = self.max = None
+
+    def result(self) -> dict:
+        def plain(value: Any) -> Any:
+            if value is None:
+                return None
+            if isinstance(value, pd.Timestamp):
+                return value.isoformat()
+            return value.item() if hasattr(value, "item") else value
+
+        return {
+            "name": self.name,
+            "dtype": self.dtype or "object",
+            "nulls": self.nulls,
+            "null_rate": self.nulls / self.count if self.count else 0.0,
+            "min": plain(self.min),
+            "max": plain(self.max),
+            "mean": self.sum / self.summed if self.summed else None,
+        }
+
+
+def _is_number(dtype: str) -> bool:
+    return dtype.lower().startswith(("int", "uint", "float"))
+
+
+def profile_file(path: Path) -> Optional[dict]:
+    """
+    Compute the profile of a CSV, Parquet or Arrow file in a single pass.
+
+    The file is streamed in chunks, so memory use is bounded by the chunk
+    size whatever the file size. The profile holds the row count and, per
+    column, its dtype, null count and rate, and the range and mean of
+    numeric and datetime columns. Returns None for non-tabular files.
+    """
+    if not can_read(path):
+        return None
+
+    rows = 0
+    columns: dict[str, _ColumnStats] = {}
+    for chunk in iter_dataframes(path):
+        rows += len(chunk)
+        for name in chunk.columns:
+            stats = columns.get(str(name))
+            if stats is None:
+                stats = columns[str(name)] = _ColumnStats(str(name))
+            stats.update(chunk[name])
+
+    return {
+        "version": PROFILE_VERSION,
+        "format": file_format(path),
+        "size": path.stat().st_size,
+        "rows": rows,
+        "columns": [stats.result() for stats in columns.values()],
+        "profiled_at": datetime.now(timezone.utc).isoformat(),
+    }
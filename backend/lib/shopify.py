@@ -1,58 +1,118 @@
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
 import pandas as pd
 
+from .columnar import read_dataframe
+
+# Product fields repeated on every variant row, as (column, field) pairs
+PRODUCT_FIELDS = (
+    ("vendor", "vendor"),
+    ("product_type", "product_type"),
+    ("handle", "handle"),
+    ("status", "status"),
+    ("tags", "tags"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+    ("published_at", "published_at"),
+)
+
+VARIANT_FIELDS = (
+    ("variant_title", "title"),
+    ("sku", "sku"),
+    ("price", "price"),
+    ("compare_at_price", "compare_at_price"),
+    ("inventory_quantity", "inventory_quantity"),
+    ("weight", "weight"),
+    ("weight_unit", "weight_unit"),
+    ("requires_shipping", "requires_shipping"),
+    ("taxable", "taxable"),
+    ("barcode", "barcode"),
+)
+
+COLUMNS = [
+    "product_id",
+    "title",
+    *(column for column, _ in PRODUCT_FIELDS),
+    "variant_id",
+    *(column for column, _ in VARIANT_FIELDS),
+    "image_src",
+]
+
+
+def _ids(records: list) -> np.ndarray:
+    # Shopify ids are always integers, which skips pandas' dtype inference
+    return np.fromiter(
+        (record["id"] for record in records), dtype=np.int64, count=len(records)
+    )
+
+
+def _pluck(records: list, fields: tuple) -> dict:
+    """Collect `fields` of every record into per-column sequences."""
+    keys = [field for _, field in fields]
+    try:
+        # one C-level lookup per record when every record has all the fields
+        values = list(map(itemgetter(*keys), records))
+    except KeyError:
+        values = [tuple(record.get(key, "") for key in keys) for record in records]
+    columns = list(zip(*values)) if values else [()] * len(keys)
+    return {name: column for (name, _), column in zip(fields, columns)}
+
 
 def shopify_json_to_dataframe(data):
     """
     Convert Shopify products JSON data to a pandas DataFrame.
 
+    Builds the frame column by column: product fields are read and typed once
+    per product and then repeated for its variants, variant fields are read
+    with one C-level lookup per variant, and prices and datetimes are
+    converted in vectorised passes over whole columns.
+
     Parameters:
     data (dict): Shopify products JSON data with 'products' key
 
     Returns:
-    pd.DataFrame: DataFrame containing product and variant information
+    pd.DataFrame: DataFrame with one row per variant
     """
+    products = data.get("products", [])
 
-    # List to store all rows
-    rows = []
+    variants = []
+    variant_counts = []
+    for product in products:
+        product_variants = product.get("variants", [])
+        variants.extend(product_variants)
+        variant_counts.append(len(product_variants))
 
-    # Process each product
-    for product in data.get("products", []):
-        # Get the main image URL if available
-        image_src = (
-            product.get("image", {}).get("src", "") if product.get("image") else ""
-        )
+    product_columns = {
+        "product_id": _ids(products),
+        "title": [product["title"] for product in products],
+        **_pluck(products, PRODUCT_FIELDS),
+        "image_src": [
+            product["image"].get("src", "") if product.get("image") else ""
+            for product in products
+        ],
+    }
+    variant_columns = {
+        "variant_id": _ids(variants),
+        **_pluck(variants, VARIANT_FIELDS),
+    }
+
+    # types are converted before repeating, so each product's datetimes are
+    # parsed once rather than once per variant
+    product_df = _convert_column_types(pd.DataFrame(product_columns))
+    variant_df = _convert_column_types(pd.DataFrame(variant_columns))
+
+    # repeat each product row once per variant
+    product_df = product_df.iloc[np.repeat(np.arange(len(products)), variant_counts)]
+
+    df = pd.concat([product_df.reset_index(drop=True), variant_df], axis=1)
+    return df[COLUMNS]
 
-        # Process each variant (since products can have multiple variants)
-        for variant in product.get("variants", []):
-            row = {
-                "product_id": product["id"],
-                "title": product["title"],
-                "vendor": product.get("vendor", ""),
-                "product_type": product.get("product_type", ""),
-                "handle": product.get("handle", ""),
-                "status": product.get("status", ""),
-                "tags": product.get("tags", ""),
-                "created_at": product.get("created_at", ""),
-                "updated_at": product.get("updated_at", ""),
-                "published_at": product.get("published_at", ""),
-                "variant_id": variant["id"],
-                "variant_title": variant.get("title", ""),
-                "sku": variant.get("sku", ""),
-                "price": variant.get("price", ""),
-                "compare_at_price": variant.get("compare_at_price", ""),
-                "inventory_quantity": variant.get("inventory_quantity", ""),
-                "weight": variant.get("weight", ""),
-                "weight_unit": variant.get("weight_unit", ""),
-                "requires_shipping": variant.get("requires_shipping", ""),
-                "taxable": variant.get("taxable", ""),
-                "barcode": variant.get("barcode", ""),
-                "image_src": image_src,
-            }
-            rows.append(row)
-
-    # Create DataFrame from rows
-    df = pd.DataFrame(rows)
 
+def _convert_column_types(df: pd.DataFrame) -> pd.DataFrame:
     # Convert price columns to numeric (they come as strings from Shopify)
     if "price" in df.columns:
         df["price"] = pd.to_numeric(df["price"], errors="coerce")
@@ -66,3 +126,86 @@ def shopify_json_to_dataframe(data):
             df[col] = pd.to_datetime(df[col], errors="coerce")
 
     return df
+
+
+def read_shopify_file(path: Path) -> pd.DataFrame:
+    """Read a CSV or Parquet file written from `shopify_json_to_dataframe`."""
+    return _convert_column_types(read_dataframe(path))
+
+
+def latest_updated_at(df: pd.DataFrame) -> Optional[datetime]:
+    """The most recent product `updated_at` in the DataFrame, if any."""
+    if df.empty or "updated_at" not in df.columns:
+        return None
+    latest = pd.to_datetime(df["updated_at"], utc=True, errors="coerce").max()
+    return None if pd.isna(latest) else latest.to_pydatetime()
+
+
+def variantless_product_ids(data) -> set[int]:
+    """Ids of the products in a Shopify listing that have no variant rows."""
+    return {
+        product["id"]
+        for product in data.get("products", [])
+        if not product.get("variants")
+    }
+
+
+def _product_versions(df: pd.DataFrame) -> pd.DataFrame:
+    """Per product, its `updated_at` and the set of its variant ids."""
+    updated_at = pd.to_datetime(df["updated_at"], utc=True, errors="coerce")
+    return (
+        df.assign(updated_at=updated_at)
+        .groupby("product_id")
+        .agg(
+            updated_at=("updated_at", "max"),
+            variants=("variant_id", frozenset),
+        )
+    )
+
+
+def drop_unchanged_products(
+    existing: pd.DataFrame, changes: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Drop the products in `changes` the existing dataset already holds.
+
+    `updated_at_min` is inclusive, so every incremental listing repeats the
+    products updated exactly at the watermark. A product is unchanged when
+    it has the same `updated_at` and variants as its rows in `existing`.
+    """
+    if changes.empty or existing.empty:
+        return changes
+    existing = existing[existing["product_id"].isin(changes["product_id"])]
+    versions = _product_versions(changes).join(
+        _product_versions(existing), rsuffix="_existing", how="inner"
+    )
+    unchanged = versions.index[
+        (versions["updated_at"] == versions["updated_at_existing"])
+        & (versions["variants"] == versions["variants_existing"])
+    ]
+    return changes[~changes["product_id"].isin(unchanged)].reset_index(drop=True)
+
+
+def merge_shopify_dataframes(
+    existing: pd.DataFrame,
+    changes: pd.DataFrame,
+    live_product_ids: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """
+    Upsert the variants of changed products into an existing dataset.
+
+    All rows of a changed product are replaced, so variants removed from it
+    in Shopify disappear too. When `live_product_ids` is given, products that
+    are no longer in the store are dropped.
+    """
+    if not changes.empty:
+        existing = existing[~existing["product_id"].isin(changes["product_id"])]
+        merged = pd.concat([existing, changes], ignore_index=True)
+        merged = merged.drop_duplicates("variant_id", keep="last")
+    else:
+        merged = existing
+
+    if live_product_ids is not None:
+        merged = merged[merged["product_id"].isin(set(live_product_ids))]
+
+    return merged.sort_values(["product_id", "variant_id"]).reset_index(drop=True)
@@ -0,0 +1,224 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from loguru import logger
+
+from ..config import get_settings
+
+SHOPIFY_API_VERSION = "2024-01"
+
+# The largest page size the Shopify REST Admin API accepts
+PAGE_LIMIT = 250
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+CALL_LIMIT_HEADER = "x-shopify-shop-api-call-limit"
+
+# Shopify buckets drain completely in 20 seconds: 40 calls at 2/s on standard
+# plans, 400 calls at 20/s on Plus
+BUCKET_DRAIN_SECONDS = 20
+
+
+class LeakyBucket:
+    """
+    Client-side mirror of a store's REST Admin API leaky bucket.
+
+    Each request takes one slot, slots leak at the store's rate, and the
+    level and size are corrected from `X-Shopify-Shop-Api-Call-Limit` after
+    every response. Requests wait for a free slot instead of hitting 429s.
+    """
+
+    def __init__(self, capacity: int = 40):
+        self.capacity = capacity
+        self.level = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def leak_rate(self) -> float:
+        return self.capacity / BUCKET_DRAIN_SECONDS
+
+    def _leak(self) -> None:
+        now = time.monotonic()
+        self.level = max(0.0, self.level - (now - self._updated) * self.leak_rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._leak()
+            # keep one slot free for other apps using the same store
+            overflow = self.level + 2 - self.capacity
+            if overflow > 0:
+                await asyncio.sleep(overflow / self.leak_rate)
+                self._leak()
+            self.level += 1
+
+    def update(self, call_limit: str) -> None:
+        """Sync with a `used/capacity` call limit header."""
+        try:
+            used, capacity = (int(part) for part in call_limit.split("/"))
+        except ValueError:
+            return
+        self._leak()
+        self.level = float(used)
+        self.capacity = capacity
+
+
+class ShopifyClient:
+    """
+    Async client for the Shopify REST Admin API.
+
+    One `httpx.AsyncClient` (and so one keep-alive connection pool) is shared
+    by every request. List endpoints are read page by page by following the
+    cursor in the `Link` response header, requests are paced per store by
+    a `LeakyBucket`, and throttled or failed requests are retried with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        api_version: str = SHOPIFY_API_VERSION,
+    ):
+        self.http_client = http_client
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.api_version = api_version
+        self._buckets: Dict[str, LeakyBucket] = {}
+
+    def bucket(self, url: str) -> LeakyBucket:
+        """The rate limit bucket of the store serving `url`."""
+        host = httpx.URL(url).host
+        if host not in self._buckets:
+            self._buckets[host] = LeakyBucket()
+        return self._buckets[host]
+
+    def _url(self, store_url: str, resource: str) -> str:
+        return f"{str(store_url).rstrip('/')}/admin/api/{self.api_version}/{resource}"
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and "retry-after" in response.headers:
+            try:
+                return float(response.headers["retry-after"])
+            except ValueError:
+                pass
+        # full jitter, so concurrent syncs don't retry in lockstep
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    async def get(
+        self, url: str, pat: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """GET `url`, retrying transport errors, 429s and 5xx responses."""
+        headers = {
+            "X-Shopify-Access-Token": pat,
+            "Content-Type": "application/json",
+        }
+
+        bucket = self.bucket(url)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            await bucket.acquire()
+            try:
+                response = await self.http_client.get(
+                    url, params=params, headers=headers
+                )
+                if CALL_LIMIT_HEADER in response.headers:
+                    bucket.update(response.headers[CALL_LIMIT_HEADER])
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = repr(e)
+
+            if attempt == self.max_retries:
+                break
+            delay = self._retry_delay(attempt, response)
+            logger.warning(
+                f"Shopify request to {url} failed ({error}), retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        if response is not None:
+            response.raise_for_status()
+        raise httpx.TransportError(
+            f"Shopify request to {url} failed after {self.max_retries} retries"
+        )
+
+    async def iter_pages(
+        self,
+        store_url: str,
+        pat: str,
+        resource: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield every page of a list endpoint such as `products.json`."""
+        key = resource.removesuffix(".json")
+        url = self._url(store_url, resource)
+        params = {"limit": PAGE_LIMIT, **(params or {})}
+
+        while url:
+            response = await self.get(url, pat, params=params)
+            yield response.json().get(key, [])
+
+            # the `next` URL already carries page_info and limit, and Shopify
+            # rejects any other filter next to page_info
+            url = response.links.get("next", {}).get("url")
+            params = None
+
+    async def fetch_products(
+        self, store_url: str, pat: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch all products of a store, in the shape of `products.json`."""
+        products = []
+        async for page in self.iter_pages(store_url, pat, "products.json", params):
+            products.extend(page)
+        logger.debug(f"Fetched {len(products)} products from {store_url}")
+        return {"products": products}
+
+    async def count_products(self, store_url: str, pat: str) -> int:
+        response = await self.get(self._url(store_url, "products/count.json"), pat)
+        return response.json()["count"]
+
+    async def fetch_product_ids(self, store_url: str, pat: str) -> set[int]:
+        """Fetch only the ids of all products, a few bytes per product."""
+        ids = set()
+        async for page in self.iter_pages(
+            store_url, pat, "products.json", {"fields": "id"}
+        ):
+            ids.update(product["id"] for product in page)
+        return ids
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
+
+_client: Optional[ShopifyClient] = None
+
+
+def get_shopify_client() -> ShopifyClient:
+    """Get the process-wide Shopify client, creating it on first use."""
+    global _client
+    if _client is None:
+        settings = get_settings()
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.shopify_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.shopify_max_connections,
+                max_keepalive_connections=settings.shopify_max_connections,
+            ),
+        )
+        _client = ShopifyClient(http_client, max_retries=settings.shopify_max_retries)
+    return _client
+
+
+async def close_shopify_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
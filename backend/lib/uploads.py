@@ -0,0 +1,114 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Room for the multipart boundaries and the small form fields sent next to
+# the file, so the middleware only rejects requests that can't possibly fit.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class StoredUpload(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+
+
+def upload_too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Uploaded file exceeds the maximum size of {max_size} bytes",
+    )
+
+
+def copy_upload(
+    source: BinaryIO, destination: Path, max_size: int, chunk_size: int = CHUNK_SIZE
+) -> StoredUpload:
+    """
+    Stream an uploaded file to `destination` in fixed-size chunks.
+
+    The SHA-256 is computed while writing and the copy is aborted with a 413
+    as soon as more than `max_size` bytes have been read, so memory use stays
+    at one chunk regardless of the file size.
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    source.seek(0)
+    try:
+        with open(destination, "wb") as f:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise upload_too_large(max_size)
+                digest.update(chunk)
+                f.write(chunk)
+    except HTTPException:
+        destination.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(destination, size, digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject multipart request bodies larger than `max_size` while they arrive.
+
+    Requests announcing a too-large `Content-Length` are answered with a 413
+    before any of the body is read; chunked bodies are counted as they are
+    received and aborted once they cross the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+        self.max_body_size = max_size + MULTIPART_OVERHEAD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > self.max_body_size:
+            response = JSONResponse(
+                status_code=413,
+                content={"detail": upload_too_large(self.max_size).detail},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise upload_too_large(self.max_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _is_multipart(scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                return value.startswith(b"multipart/form-data")
+        return False
+
+    @staticmethod
+    def _content_length(scope: Scope) -> int | None:
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
@@ -1,13 +1,29 @@
 import os
+from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi import FastAPI
+from loguru import logger
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from backend.lib.html_static_files import HTMLStaticFiles
+from backend.lib.json_responses import FastJSONResponse
+from backend.lib.shopify_client import close_shopify_client
+from backend.lib.uploads import UploadSizeLimitMiddleware
 
+from .activity import close_activity_rollup, get_activity_rollup
 from .api import api_router
+from .approvals import start_approval_engine, stop_approval_engine
+from .api.services.shopify_service import (
+    close_sync_scheduler,
+    start_periodic_sync,
+    stop_periodic_sync,
+)
 from .config import get_settings
+from .events import close_event_hub, get_event_hub
+from .executor import shutdown_executors
+from .session import get_session_pool
+from .tasks import close_task_manager
 
 
 class ErrorResponse(BaseModel):
@@ -15,11 +31,37 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    session_pool = get_session_pool()
+    try:
+        session_pool.start()
+    except Exception as e:
+        # requests will retry loading the config and report the error
+        logger.error(f"Failed to start SyftBox session pool: {e}")
+    start_periodic_sync()
+    get_event_hub().start()
+    get_activity_rollup()
+    start_approval_engine()
+    yield
+    await stop_approval_engine()
+    close_activity_rollup()
+    await close_event_hub()
+    await stop_periodic_sync()
+    await close_task_manager()
+    await close_sync_scheduler()
+    await close_shopify_client()
+    shutdown_executors()
+    session_pool.close()
+
+
 app = FastAPI(
     title="Farming Coop SyftBox App",
     description="API for managing farming cooperative datasets and jobs",
     version=get_settings().app_version,
     debug=get_settings().debug,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     responses={
         500: {"model": ErrorResponse, "description": "Internal Server Error"},
         400: {"model": ErrorResponse, "description": "Bad Request"},
@@ -32,6 +74,9 @@ allow_origins = [f"http://localhost:{API_PORT}", f"http://127.0.0.1:{API_PORT}"]
 if get_settings().debug:
     allow_origins.append("http://localhost:3000")
 
+app.add_middleware(UploadSizeLimitMiddleware, max_size=get_settings().max_upload_size)
+
+# CORS goes last so it also wraps responses produced by the middlewares above
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allow_origins,
@@ -1,5 +1,6 @@
 # Standard library imports
-from typing import List, Literal, Union
+from datetime import date, datetime
+from typing import Any, Dict, List, Literal, Optional, Union
 
 # Third-party imports
 from pydantic import BaseModel, ConfigDict, Field
@@ -19,10 +20,47 @@ class BaseSchema(BaseModel):
     )
 
 
+class ColumnProfile(BaseSchema):
+    name: str
+    dtype: str
+    nulls: int
+    null_rate: float
+    # set for numeric and datetime (ISO string) columns
+    min: Union[None, int, float, str] = None
+    max: Union[None, int, float, str] = None
+    # set for numeric and boolean columns
+    mean: Optional[float] = None
+
+
+class DatasetProfile(BaseSchema):
+    version: int
+    format: str
+    size: int
+    rows: int
+    columns: List[ColumnProfile]
+    profiled_at: datetime
+
+
+class PreviewColumn(BaseSchema):
+    name: str
+    dtype: str
+
+
+class DatasetPreview(BaseSchema):
+    which: Literal["mock", "private"]
+    offset: int
+    columns: List[PreviewColumn]
+    rows: List[List[Any]]
+    # None until a CSV file has been indexed to its end
+    total_rows: Optional[int] = None
+    has_more: bool
+
+
 class Dataset(BaseSchema, SyftDataset):
     private_size: int = Field(default=0)
     mock_size: int = Field(default=0)
     source: Union[None, ShopifySource] = Field(default=None)
+    profile: Optional[DatasetProfile] = Field(default=None)
 
 
 class Job(BaseSchema, SyftJob):
@@ -35,7 +73,136 @@ class ListDatasetsResponse(BaseSchema):
 
 class ListJobsResponse(BaseSchema):
     jobs: List[Job]
+    # number of jobs matching the filters, across all pages
+    total: Optional[int] = None
+    # pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class JobDecision(BaseSchema):
+    uid: str
+    action: Literal["approve", "reject"]
+    reason: Optional[str] = None
+
+
+class JobDecisionResult(BaseSchema):
+    uid: str
+    action: Literal["approve", "reject"]
+    status: Literal["approved", "rejected", "not_found", "failed"]
+    error: Optional[str] = None
+
+
+class BatchJobDecisionResponse(BaseSchema):
+    approved: int
+    rejected: int
+    failed: int
+    results: List[JobDecisionResult]
 
 
 class ListAutoApproveResponse(BaseSchema):
     datasites: List[str]
+
+
+class DatasetAutoApprovalResult(BaseSchema):
+    dataset_uid: str
+    dataset_name: str
+    status: Literal["updated", "unchanged", "failed"]
+    error: Optional[str] = None
+
+
+class TrustedDatasitesUpdateResponse(BaseSchema):
+    message: str
+    datasites: List[str]
+    # whether the saved list differed from the previous one
+    changed: bool
+    datasets: List[DatasetAutoApprovalResult]
+
+
+class SyncJobStatus(BaseSchema):
+    dataset_uid: str
+    state: Literal["queued", "running", "succeeded", "failed"]
+    queued_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class SyncStatusResponse(BaseSchema):
+    max_concurrent: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    jobs: List[SyncJobStatus]
+
+
+class SourceSyncState(BaseSchema):
+    dataset_uid: str
+    syncing: bool
+    updated_at_watermark: Optional[datetime] = None
+    last_synced_at: Optional[datetime] = None
+    last_sync_status: Optional[Literal["succeeded", "failed"]] = None
+    last_sync_duration: Optional[float] = None
+    last_sync_error: Optional[str] = None
+
+
+class TaskStatus(BaseSchema):
+    id: str
+    kind: str
+    state: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    phase: str
+    cancel_requested: bool = False
+    bytes_processed: int = 0
+    bytes_total: Optional[int] = None
+    items_processed: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    result: Optional[dict] = None
+    error: Union[None, str, dict] = None
+
+
+class ListTasksResponse(BaseSchema):
+    tasks: List[TaskStatus]
+
+
+class ChangeEvent(BaseSchema):
+    type: Literal[
+        "dataset.created",
+        "dataset.updated",
+        "dataset.deleted",
+        "job.submitted",
+        "job.approved",
+        "job.rejected",
+        "job.updated",
+        "job.deleted",
+        "trust.changed",
+        # sent instead of the events a slow client missed; re-fetch everything
+        "resync",
+    ]
+    uid: Optional[str] = None
+    name: Optional[str] = None
+    dataset_name: Optional[str] = None
+    status: Optional[str] = None
+    # submission time of the job, for job events
+    created_at: Optional[datetime] = None
+    at: datetime
+
+
+class DatasetActivity(BaseSchema):
+    name: str
+    # jobs submitted per bucket, oldest first, in total and by current status
+    total: List[int]
+    by_status: Dict[str, List[int]]
+
+
+class ActivityResponse(BaseSchema):
+    period: Literal["day", "week"]
+    # first and last day covered; the last bucket ends today
+    start: date
+    end: date
+    # datasets without jobs in the window are left out
+    datasets: List[DatasetActivity]
@@ -0,0 +1,133 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from uuid import UUID
+
+from loguru import logger
+from pydantic import ValidationError
+from syft_core import Client
+
+from .config import get_settings
+from .lib.files import file_stamp, write_json_atomic
+from .lib.profile import PROFILE_VERSION, profile_file
+from .models import DatasetProfile
+
+
+def private_file(private_path: Path) -> Optional[Path]:
+    """The data file of a dataset's private directory."""
+    try:
+        return next(private_path.iterdir(), None)
+    except FileNotFoundError:
+        return None
+
+
+def compute_profile(path: Path) -> Optional[DatasetProfile]:
+    """Profile a data file; failures are logged, never raised to the ingest."""
+    try:
+        profile = profile_file(path)
+    except Exception as e:
+        logger.warning(f"Failed to profile {path.name}: {e}")
+        return None
+    return DatasetProfile.model_validate(profile) if profile else None
+
+
+class ProfileStore:
+    """
+    Dataset profiles, one JSON sidecar per dataset uid.
+
+    Profiles are computed once at ingest and stored with the (mtime, size)
+    stamp of the data file they describe, so a file replaced outside the
+    app is detected with a `stat()` instead of being re-read. Sidecars are
+    parsed once and only re-read when they change.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cache: Dict[str, tuple[tuple[int, int], dict]] = {}
+
+    def _path(self, dataset_uid: UUID | str) -> Path:
+        return self.directory / f"{dataset_uid}.json"
+
+    def _read(self, dataset_uid: UUID | str) -> Optional[dict]:
+        path = self._path(dataset_uid)
+        stamp = file_stamp(path)
+        if stamp is None:
+            self._cache.pop(str(dataset_uid), None)
+            return None
+        cached = self._cache.get(str(dataset_uid))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to read profile {path}: {e}")
+            return None
+        self._cache[str(dataset_uid)] = stamp, record
+        return record
+
+    def get(
+        self, dataset_uid: UUID | str, data_file: Optional[Path]
+    ) -> Optional[DatasetProfile]:
+        """The stored profile, if it still describes `data_file`."""
+        if data_file is None:
+            return None
+        with self._lock:
+            record = self._read(dataset_uid)
+        if record is None or record.get("version") != PROFILE_VERSION:
+            return None
+        if tuple(record.get("stamp") or ()) != file_stamp(data_file):
+            return None
+        try:
+            return DatasetProfile.model_validate(record["profile"])
+        except (KeyError, ValidationError):
+            return None
+
+    def save(
+        self, dataset_uid: UUID | str, profile: DatasetProfile, data_file: Path
+    ) -> None:
+        stamp = file_stamp(data_file)
+        if stamp is None:
+            return
+        record = {
+            "version": PROFILE_VERSION,
+            "stamp": list(stamp),
+            "profile": profile.model_dump(mode="json"),
+        }
+        path = self._path(dataset_uid)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(path, record)
+            self._cache[str(dataset_uid)] = file_stamp(path), record
+
+    def save_for(
+        self,
+        dataset_uid: UUID | str,
+        profile: Optional[DatasetProfile],
+        private_path: Path,
+    ) -> None:
+        """Store `profile` against the data file now in `private_path`."""
+        data_file = private_file(private_path)
+        if profile is not None and data_file is not None:
+            self.save(dataset_uid, profile, data_file)
+
+
+def get_profiles_dir(client: Client) -> Path:
+    app_name = get_settings().app_name
+    return client.workspace.data_dir / "private" / app_name / "profiles"
+
+
+_stores: Dict[Path, ProfileStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_profile_store(client: Client) -> ProfileStore:
+    """Get the process-wide profile store of the client's datasite."""
+    path = get_profiles_dir(client)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ProfileStore(path)
+        return store
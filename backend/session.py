@@ -0,0 +1,101 @@
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from syft_core import Client as SyftBoxClient
+from syft_rds import init_session
+from syft_rds.client.rds_client import RDSClient
+
+from .config import get_settings
+from .lib.files import file_stamp
+
+
+class SessionPool:
+    """Process-wide SyftBox client and RDS sessions.
+
+    The SyftBox config is loaded once and one RDS session is opened per
+    datasite email. Both are re-initialised transparently when the config
+    file changes on disk.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        self.config_path = config_path
+        self._lock = threading.RLock()
+        self._syftbox_client: Optional[SyftBoxClient] = None
+        self._config_stamp: Optional[tuple[int, int]] = None
+        self._sessions: Dict[str, RDSClient] = {}
+
+    def start(self) -> None:
+        """Load the config and open the session for the local datasite."""
+        syftbox_client = self.get_syftbox_client()
+        self.get_rds_client(syftbox_client.email)
+        logger.info(f"Session pool started for {syftbox_client.email}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._syftbox_client = None
+            self._config_stamp = None
+
+    def get_syftbox_client(self) -> SyftBoxClient:
+        with self._lock:
+            if self._syftbox_client is None or self._config_changed():
+                self._reload()
+            return self._syftbox_client
+
+    def get_rds_client(self, email: Optional[str] = None) -> RDSClient:
+        """Get the pooled RDS session for `email` (defaults to the local datasite)."""
+        with self._lock:
+            syftbox_client = self.get_syftbox_client()
+            email = email or syftbox_client.email
+            session = self._sessions.get(email)
+            if session is None:
+                session = init_session(email, syftbox_client=syftbox_client)
+                self._sessions[email] = session
+                logger.debug(f"Opened RDS session for {email}")
+            return session
+
+    def health(self) -> Dict[str, Any]:
+        """Report whether the pooled client and sessions are usable."""
+        try:
+            syftbox_client = self.get_syftbox_client()
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e)}
+
+        checks = {
+            "config": syftbox_client.config_path.is_file(),
+            "datasites": syftbox_client.datasites.is_dir(),
+        }
+        with self._lock:
+            sessions = list(self._sessions)
+        return {
+            "status": "healthy" if all(checks.values()) else "unhealthy",
+            "email": syftbox_client.email,
+            "checks": checks,
+            "sessions": sessions,
+        }
+
+    def _reload(self) -> None:
+        syftbox_client = SyftBoxClient.load(self.config_path)
+        if self._syftbox_client is not None:
+            logger.info(
+                f"SyftBox config changed at {syftbox_client.config_path}, "
+                "re-initialising sessions"
+            )
+        self._syftbox_client = syftbox_client
+        self._config_stamp = self._stat_config(syftbox_client)
+        self._sessions.clear()
+
+    def _config_changed(self) -> bool:
+        return self._stat_config(self._syftbox_client) != self._config_stamp
+
+    @staticmethod
+    def _stat_config(syftbox_client: SyftBoxClient) -> Optional[tuple[int, int]]:
+        return file_stamp(syftbox_client.config_path)
+
+
+@lru_cache()
+def get_session_pool() -> SessionPool:
+    """Get the process-wide session pool."""
+    return SessionPool(get_settings().config_path)
@@ -1,31 +1,126 @@
 import json
-from typing import Dict, Literal
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, HttpUrl
 from syft_core import Client
 
 from .config import get_settings
+from .lib.files import file_stamp, write_json_atomic
+from .session import get_session_pool
 
 
 class ShopifySource(BaseModel):
     type: Literal["shopify"] = Field(default="shopify")
     store_url: HttpUrl
     pat: str
+    # `updated_at` of the newest product in the dataset; syncs only fetch
+    # products updated since then
+    updated_at_watermark: Optional[datetime] = None
+    # products without variants have no rows in the dataset, but still count
+    # towards the store's product count when syncs look for deletions
+    variantless_product_ids: List[int] = Field(default_factory=list)
+    # outcome of the most recent sync, so it can be reported without
+    # contacting the store
+    last_synced_at: Optional[datetime] = None
+    last_sync_status: Optional[Literal["succeeded", "failed"]] = None
+    last_sync_duration: Optional[float] = None
+    last_sync_error: Optional[str] = None
 
 
 type SourcesConfig = Dict[UUID, ShopifySource]
 
 
-def find_source(dataset_uid: UUID | str):
-    if isinstance(dataset_uid, str):
-        dataset_uid = UUID(dataset_uid)
-    sources = load_sources()
-
-    return sources.get(dataset_uid, None)
-
-
-def get_sources_config_path():
-    syftbox_client = Client.load()
+def _to_uuid(uid: UUID | str) -> UUID:
+    return UUID(uid) if isinstance(uid, str) else uid
+
+
+class SourceRegistry:
+    """UUID-indexed, in-memory view of `dataset-sources.json`.
+
+    The file is parsed once and only re-read when its mtime or size changes,
+    so lookups for a whole dataset listing cost a single `stat()`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sources: SourcesConfig = {}
+        self._stamp: Optional[tuple[int, int]] = None
+
+    def _refresh(self) -> SourcesConfig:
+        stamp = file_stamp(self.path)
+        if stamp == self._stamp:
+            return self._sources
+
+        sources = {}
+        if stamp is not None:
+            with open(self.path) as f:
+                raw_data = json.load(f)
+            for uid, source_data in raw_data.items():
+                sources[UUID(uid)] = ShopifySource(**source_data)
+
+        self._sources = sources
+        self._stamp = stamp
+        return sources
+
+    def load(self) -> SourcesConfig:
+        """Return a copy of all registered sources."""
+        with self._lock:
+            return dict(self._refresh())
+
+    def find_source(self, dataset_uid: UUID | str) -> Optional[ShopifySource]:
+        with self._lock:
+            return self._refresh().get(_to_uuid(dataset_uid))
+
+    def find_sources(
+        self, dataset_uids: Iterable[UUID | str]
+    ) -> Dict[UUID, Optional[ShopifySource]]:
+        """Look up the sources of many datasets against a single snapshot."""
+        with self._lock:
+            sources = self._refresh()
+            return {
+                uid: sources.get(uid) for uid in (_to_uuid(u) for u in dataset_uids)
+            }
+
+    def save(self, sources: SourcesConfig) -> None:
+        with self._lock:
+            self._write(sources)
+
+    def add(self, dataset_uid: UUID | str, source: ShopifySource) -> None:
+        with self._lock:
+            sources = dict(self._refresh())
+            sources[_to_uuid(dataset_uid)] = source
+            self._write(sources)
+
+    def update(self, dataset_uid: UUID | str, **fields) -> Optional[ShopifySource]:
+        """Set `fields` on the source of a dataset, if it still has one."""
+        with self._lock:
+            sources = dict(self._refresh())
+            uid = _to_uuid(dataset_uid)
+            if uid not in sources:
+                return None
+            source = sources[uid] = sources[uid].model_copy(update=fields)
+            self._write(sources)
+            return source
+
+    def _write(self, sources: SourcesConfig) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        serializable_sources = {}
+        for uid, source in sources.items():
+            serializable_sources[str(uid)] = source.model_dump(mode="json")
+
+        write_json_atomic(self.path, serializable_sources, indent=2)
+
+        self._sources = {_to_uuid(uid): source for uid, source in sources.items()}
+        self._stamp = file_stamp(self.path)
+
+
+def get_sources_config_path(syftbox_client: Optional[Client] = None) -> Path:
+    syftbox_client = syftbox_client or get_session_pool().get_syftbox_client()
     app_settings = get_settings()
 
     sources_config_path = (
@@ -38,37 +133,31 @@ def get_sources_config_path():
     return sources_config_path
 
 
-def load_sources() -> SourcesConfig:
-    sources_config_path = get_sources_config_path()
-
-    if not sources_config_path.is_file():
-        return {}
+_registries: Dict[Path, SourceRegistry] = {}
+_registries_lock = threading.Lock()
 
-    with open(sources_config_path) as f:
-        raw_data = json.load(f)
 
-    sources = {}
-    for uid, source_data in raw_data.items():
-        sources[UUID(uid)] = ShopifySource(**source_data)
+def get_source_registry(syftbox_client: Optional[Client] = None) -> SourceRegistry:
+    """Get the process-wide source registry for the client's sources config."""
+    path = get_sources_config_path(syftbox_client)
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = SourceRegistry(path)
+        return registry
 
-    return sources
 
+def find_source(dataset_uid: UUID | str) -> Optional[ShopifySource]:
+    return get_source_registry().find_source(dataset_uid)
 
-def save_sources(sources: SourcesConfig):
-    sources_config_path = get_sources_config_path()
 
-    if not sources_config_path.is_file():
-        sources_config_path.parent.mkdir(parents=True, exist_ok=True)
+def load_sources() -> SourcesConfig:
+    return get_source_registry().load()
 
-    serializable_sources = {}
-    for uid, source in sources.items():
-        serializable_sources[str(uid)] = source.model_dump(mode="json")
 
-    with open(sources_config_path, "w") as f:
-        json.dump(serializable_sources, f, indent=2)
+def save_sources(sources: SourcesConfig):
+    get_source_registry().save(sources)
 
 
-def add_dataset_source(uid: UUID, source: ShopifySource):
-    sources = load_sources()
-    sources[uid] = source
-    save_sources(sources)
+def add_dataset_source(uid: UUID | str, source: ShopifySource):
+    get_source_registry().add(uid, source)
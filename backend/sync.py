@@ -0,0 +1,163 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+
+from .models import SyncJobStatus, SyncStatusResponse
+
+type SyncFunc = Callable[[str], Awaitable[dict]]
+type ListFunc = Callable[[], Awaitable[Iterable[str]]]
+
+
+class SyncScheduler:
+    """
+    Runs dataset syncs concurrently, with at most one sync per dataset.
+
+    Submitting a dataset that is already queued or running returns the
+    in-flight task instead of starting another one. Up to `max_concurrent`
+    syncs run at once; per-store request rates are limited by the Shopify
+    client, so syncs of different stores proceed in parallel.
+    """
+
+    def __init__(self, sync_func: SyncFunc, max_concurrent: int):
+        self.sync_func = sync_func
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._jobs: Dict[str, SyncJobStatus] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def submit(self, dataset_uid: str) -> asyncio.Task:
+        """Queue a sync of `dataset_uid`, or join the one already in flight."""
+        task = self._inflight.get(dataset_uid)
+        if task is not None:
+            return task
+
+        job = SyncJobStatus(
+            dataset_uid=dataset_uid,
+            state="queued",
+            queued_at=datetime.now(timezone.utc),
+        )
+        self._jobs[dataset_uid] = job
+        task = asyncio.create_task(self._run(job), name=f"sync-{dataset_uid}")
+        self._inflight[dataset_uid] = task
+        task.add_done_callback(lambda t: self._done(dataset_uid, t))
+        return task
+
+    def submit_many(self, dataset_uids: Iterable[str]) -> List[asyncio.Task]:
+        return [self.submit(uid) for uid in dataset_uids]
+
+    async def sync(self, dataset_uid: str) -> dict:
+        """Sync `dataset_uid` and wait for the result.
+
+        The sync is shielded, so a caller that goes away doesn't cancel it
+        for the other callers waiting on the same dataset.
+        """
+        return await asyncio.shield(self.submit(dataset_uid))
+
+    async def _run(self, job: SyncJobStatus) -> dict:
+        async with self._semaphore:
+            job.state = "running"
+            job.started_at = datetime.now(timezone.utc)
+            start = time.perf_counter()
+            try:
+                result = await self.sync_func(job.dataset_uid)
+            except asyncio.CancelledError:
+                job.state = "failed"
+                job.error = "Sync was cancelled"
+                raise
+            except Exception as e:
+                job.state = "failed"
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+                raise
+            else:
+                job.state = "succeeded"
+                job.result = result
+                return result
+            finally:
+                job.finished_at = datetime.now(timezone.utc)
+                job.duration = time.perf_counter() - start
+
+    def _done(self, dataset_uid: str, task: asyncio.Task) -> None:
+        if self._inflight.get(dataset_uid) is task:
+            del self._inflight[dataset_uid]
+        # retrieve the exception so fire-and-forget syncs don't warn
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Sync of dataset {dataset_uid} failed: {task.exception()}")
+
+    def is_syncing(self, dataset_uid: str) -> bool:
+        return dataset_uid in self._inflight
+
+    def status(self) -> SyncStatusResponse:
+        jobs = list(self._jobs.values())
+        counts = {state: 0 for state in ("queued", "running", "succeeded", "failed")}
+        for job in jobs:
+            counts[job.state] += 1
+        return SyncStatusResponse(
+            max_concurrent=self.max_concurrent, **counts, jobs=jobs
+        )
+
+    async def close(self) -> None:
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class PeriodicSync:
+    """
+    Background worker that syncs every dataset returned by `list_datasets`
+    through `scheduler`, every `interval` seconds.
+
+    Each wait is randomised by +/- `jitter` (a fraction of the interval) so
+    that several app instances don't hit the same stores in lockstep. A
+    round waits for its syncs to finish before the next wait starts, and
+    datasets already syncing (e.g. from the UI) are joined, not re-run.
+    """
+
+    def __init__(
+        self,
+        scheduler: SyncScheduler,
+        list_datasets: ListFunc,
+        interval: float,
+        jitter: float = 0.0,
+    ):
+        self.scheduler = scheduler
+        self.list_datasets = list_datasets
+        self.interval = interval
+        self.jitter = jitter
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="periodic-sync")
+
+    def _next_delay(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_delay())
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Periodic sync failed: {e}")
+
+    async def run_once(self) -> None:
+        """Sync every dataset once and wait for the syncs to finish."""
+        dataset_uids = list(await self.list_datasets())
+        if not dataset_uids:
+            return
+        logger.debug(f"Periodic sync of {len(dataset_uids)} datasets")
+        tasks = self.scheduler.submit_many(dataset_uids)
+        # failures are logged and recorded by the scheduler
+        await asyncio.gather(*map(asyncio.shield, tasks), return_exceptions=True)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+
+from .config import get_settings
+from .executor import run_io
+from .models import TaskStatus
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task's work once it has been asked to stop."""
+
+
+class TaskContext:
+    """
+    Handed to a task's work function to report progress and observe
+    cancellation. Safe to use from worker threads.
+    """
+
+    def __init__(self, status: TaskStatus):
+        self.status = status
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def request_cancel(self) -> None:
+        self._cancel.set()
+        self.status.cancel_requested = True
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise TaskCancelled(f"Task {self.status.id} was cancelled")
+
+    def set_phase(self, phase: str) -> None:
+        """Start the next phase, unless the task has been cancelled."""
+        self.check_cancelled()
+        self.status.phase = phase
+
+    def add_bytes(self, count: int) -> None:
+        self.status.bytes_processed += count
+
+    def add_items(self, count: int) -> None:
+        self.status.items_processed += count
+
+
+type TaskFunc = Callable[[TaskContext], Awaitable[Any]]
+type TaskCleanup = Callable[[], Any]
+
+
+class TaskManager:
+    """
+    Runs long-running work in the background and keeps a status record of
+    each run.
+
+    At most `max_concurrent` tasks run at once, the rest wait in order.
+    Cancelling a queued task drops it; a running task stops at its next
+    phase boundary, so work already handed to a thread is never abandoned
+    half-way. Records of finished tasks are evicted `ttl` seconds later.
+
+    A task's blocking `cleanup`, e.g. removing its staged input, runs once
+    however the task ends: finished, failed, cancelled while queued or
+    dropped at shutdown.
+    """
+
+    def __init__(self, max_concurrent: int, ttl: float):
+        self.max_concurrent = max_concurrent
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tasks: Dict[str, TaskStatus] = {}
+        self._contexts: Dict[str, TaskContext] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._cleanups: Dict[str, TaskCleanup] = {}
+
+    def submit(
+        self,
+        kind: str,
+        func: TaskFunc,
+        bytes_total: Optional[int] = None,
+        cleanup: Optional[TaskCleanup] = None,
+    ) -> TaskStatus:
+        """Queue `func` and return its status record right away."""
+        status = TaskStatus(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            state="queued",
+            phase="queued",
+            bytes_total=bytes_total,
+            created_at=datetime.now(timezone.utc),
+        )
+        context = TaskContext(status)
+        self._tasks[status.id] = status
+        self._contexts[status.id] = context
+        if cleanup is not None:
+            self._cleanups[status.id] = cleanup
+
+        task = asyncio.create_task(self._run(context, func), name=f"task-{status.id}")
+        self._inflight[status.id] = task
+        task.add_done_callback(lambda t: self._done(status.id))
+        return status
+
+    def get(self, task_id: str) -> Optional[TaskStatus]:
+        return self._tasks.get(task_id)
+
+    def list(self) -> List[TaskStatus]:
+        return sorted(self._tasks.values(), key=lambda status: status.created_at)
+
+    def cancel(self, task_id: str) -> Optional[TaskStatus]:
+        status = self._tasks.get(task_id)
+        context = self._contexts.get(task_id)
+        if status is None or context is None:
+            return status
+
+        context.request_cancel()
+        if status.state == "queued":
+            self._inflight[task_id].cancel()
+        return status
+
+    async def _run(self, context: TaskContext, func: TaskFunc) -> None:
+        status = context.status
+        start = None
+        try:
+            async with self._semaphore:
+                context.check_cancelled()
+                status.state = "running"
+                status.started_at = datetime.now(timezone.utc)
+                start = time.perf_counter()
+                status.result = await func(context)
+            status.state = "succeeded"
+            status.phase = "done"
+        except (TaskCancelled, asyncio.CancelledError):
+            status.state = "cancelled"
+        except Exception as e:
+            status.state = "failed"
+            status.error = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Task {status.id} ({status.kind}) failed: {status.error}")
+        finally:
+            status.finished_at = datetime.now(timezone.utc)
+            if start is not None:
+                status.duration = time.perf_counter() - start
+            cleanup = self._cleanups.pop(status.id, None)
+            if cleanup is not None:
+                await self._run_cleanup(status, cleanup)
+
+    async def _run_cleanup(self, status: TaskStatus, cleanup: TaskCleanup) -> None:
+        try:
+            await run_io(cleanup)
+        except Exception as e:
+            logger.warning(f"Cleanup of task {status.id} ({status.kind}) failed: {e}")
+
+    def _done(self, task_id: str) -> None:
+        self._inflight.pop(task_id, None)
+        self._contexts.pop(task_id, None)
+        loop = asyncio.get_running_loop()
+        # a task cancelled before its first step never entered `_run`
+        cleanup = self._cleanups.pop(task_id, None)
+        if cleanup is not None:
+            status = self._tasks[task_id]
+            status.state = "cancelled"
+            status.finished_at = datetime.now(timezone.utc)
+            loop.run_in_executor(None, cleanup)
+        loop.call_later(self.ttl, self._tasks.pop, task_id, None)
+
+    async def close(self) -> None:
+        """
+        Cancel every task. A task inside `run_io` first waits for its worker
+        call to return, so its cleanup never runs under the thread.
+        """
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_manager: Optional[TaskManager] = None
+
+
+def get_task_manager() -> TaskManager:
+    """Get the process-wide task manager."""
+    global _manager
+    if _manager is None:
+        settings = get_settings()
+        _manager = TaskManager(settings.task_workers, settings.task_ttl)
+    return _manager
+
+
+async def close_task_manager() -> None:
+    global _manager
+    if _manager is not None:
+        manager, _manager = _manager, None
+        await manager.close()
@@ -0,0 +1,178 @@
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from filelock import FileLock
+from loguru import logger
+from syft_core import Client
+
+from .lib.files import file_stamp, write_json_atomic
+
+
+def parse_entry(entry: str) -> str:
+    """
+    Normalise a trusted datasite entry, or raise `ValueError`.
+
+    An entry is an email (`alice@coop.org`), a whole domain (`*@coop.org`)
+    or all of its subdomains (`*@*.coop.org`). syft_rds only auto-approves
+    exact emails, so domain wildcards are resolved by the auto-approval
+    engine alone and never copied into datasets.
+    """
+    entry = entry.strip()
+    local, sep, domain = entry.rpartition("@")
+    if local == "*" and domain.startswith("*."):
+        domain = domain[2:]
+    labels = domain.split(".")
+    if not sep or not local or "*" in domain or len(labels) < 2 or not all(labels):
+        raise ValueError(f"'{entry}' is not an email, '*@domain' or '*@*.domain'")
+    return entry
+
+
+def is_wildcard(entry: str) -> bool:
+    return entry.strip().startswith("*@")
+
+
+def _reversed_labels(domain: str) -> tuple[str, ...]:
+    return tuple(reversed(domain.lower().split(".")))
+
+
+class TrustMatcher:
+    """
+    Compiled form of a trusted datasites list.
+
+    Emails are kept in a hash set; domain wildcards are indexed by their
+    reversed labels (`coop.org` -> `("org", "coop")`), so a lookup costs one
+    set probe per label of the email's domain, whatever the list size.
+    """
+
+    def __init__(self, entries: Iterable[str]):
+        self.emails: set[str] = set()
+        self.domains: set[tuple[str, ...]] = set()
+        self.subdomains: set[tuple[str, ...]] = set()
+
+        for entry in entries:
+            local, _, domain = entry.strip().rpartition("@")
+            if local != "*":
+                self.emails.add(entry.strip().lower())
+            elif domain.startswith("*."):
+                self.subdomains.add(_reversed_labels(domain[2:]))
+            else:
+                self.domains.add(_reversed_labels(domain))
+
+    def __contains__(self, email: str) -> bool:
+        return self.matches(email)
+
+    def matches(self, email: str) -> bool:
+        email = email.strip().lower()
+        if email in self.emails:
+            return True
+
+        _, sep, domain = email.rpartition("@")
+        if not sep:
+            return False
+        labels = _reversed_labels(domain)
+        if labels in self.domains:
+            return True
+        # strict suffixes only: `*@*.coop.org` doesn't match `coop.org` itself
+        return any(labels[:i] in self.subdomains for i in range(1, len(labels)))
+
+
+class TrustList:
+    """
+    In-memory view of the trusted datasites file (`auto_approve.json`).
+
+    The list and its matcher are rebuilt only when the file's mtime or size
+    changes. Edits are read-modify-write under a file lock, so they are
+    safe against other processes sharing the datasite.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(str(path.with_suffix(".lock")))
+        self._entries: List[str] = []
+        self._matcher = TrustMatcher([])
+        self._stamp: Optional[tuple[int, int]] = None
+
+    def _refresh(self) -> List[str]:
+        stamp = file_stamp(self.path)
+        if stamp == self._stamp:
+            return self._entries
+
+        entries = []
+        if stamp is not None:
+            try:
+                with open(self.path) as f:
+                    entries = json.load(f)
+            except json.JSONDecodeError:
+                logger.error(f"Failed to decode {self.path}, trusting no datasites")
+
+        self._entries = entries
+        self._matcher = TrustMatcher(entries)
+        self._stamp = stamp
+        return entries
+
+    def load(self) -> List[str]:
+        with self._lock:
+            return list(self._refresh())
+
+    def matcher(self) -> TrustMatcher:
+        with self._lock:
+            self._refresh()
+            return self._matcher
+
+    def update(
+        self, edit: Callable[[List[str]], List[str]]
+    ) -> tuple[List[str], List[str]]:
+        """
+        Apply `edit` to the current list and save the result if it changed.
+
+        Returns the previous and the new list.
+        """
+        with self._lock, self._file_lock:
+            previous = list(self._refresh())
+            entries = edit(list(previous))
+            if entries != previous:
+                self._write(entries)
+            return previous, entries
+
+    def save(self, entries: List[str]) -> tuple[List[str], List[str]]:
+        return self.update(lambda _: list(entries))
+
+    def add(self, entries: Iterable[str]) -> tuple[List[str], List[str]]:
+        entries = list(entries)
+        return self.update(lambda current: list(dict.fromkeys(current + entries)))
+
+    def remove(self, entries: Iterable[str]) -> tuple[List[str], List[str]]:
+        removed = {entry.lower() for entry in entries}
+        return self.update(
+            lambda current: [entry for entry in current if entry.lower() not in removed]
+        )
+
+    def _write(self, entries: List[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        write_json_atomic(self.path, entries, indent=4)
+
+        self._entries = list(entries)
+        self._matcher = TrustMatcher(entries)
+        self._stamp = file_stamp(self.path)
+
+
+def get_trust_list_path(client: Client) -> Path:
+    return client.app_data() / "auto_approve.json"
+
+
+_trust_lists: Dict[Path, TrustList] = {}
+_trust_lists_lock = threading.Lock()
+
+
+def get_trust_list(client: Client) -> TrustList:
+    """Get the process-wide trusted datasites list of the client's datasite."""
+    path = get_trust_list_path(client)
+    with _trust_lists_lock:
+        trust_list = _trust_lists.get(path)
+        if trust_list is None:
+            trust_list = _trust_lists[path] = TrustList(path)
+        return trust_list
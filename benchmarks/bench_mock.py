@@ -0,0 +1,78 @@
+"""
+Mock dataset generation latency.
+
+Run with `python -m benchmarks.bench_mock [rows]` from the repository root.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.lib.mock import generate_mock_file
+
+MOCK_ROWS = 1000
+
+
+def make_dataset(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "crop": rng.choice(["kale", "rye", "oat", "bean", "leek"], size=rows),
+            "farm_id": rng.integers(0, 10_000, size=rows),
+            "stock_kg": rng.gamma(2.0, 50.0, size=rows),
+            "price": np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 10),
+            "harvested_at": pd.Timestamp("2024-01-01", tz="UTC")
+            + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, size=rows), unit="s"),
+            "organic": rng.random(rows) < 0.7,
+            "lot": "lot-" + pd.Series(np.arange(rows)).astype(str),
+        }
+    )
+    df.to_csv(path)
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:<28}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+
+def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        real_path = temp_dir / "real.csv"
+        cache_dir = temp_dir / "cache"
+
+        make_dataset(real_path, rows)
+        size_mb = real_path.stat().st_size / 1024 / 1024
+        print(f"input: {rows:,} rows, {size_mb:.1f} MB, mock: {MOCK_ROWS:,} rows")
+
+        timed(
+            "cold (read + generate)",
+            lambda: generate_mock_file(
+                real_path, temp_dir / "mock1.csv", MOCK_ROWS, cache_dir=cache_dir
+            ),
+        )
+        timed(
+            "cached (hash + copy)",
+            lambda: generate_mock_file(
+                real_path, temp_dir / "mock2.csv", MOCK_ROWS, cache_dir=cache_dir
+            ),
+        )
+        timed(
+            "cached (hash known)",
+            lambda: generate_mock_file(
+                real_path,
+                temp_dir / "mock3.csv",
+                MOCK_ROWS,
+                cache_dir=cache_dir,
+                content_hash=next(cache_dir.iterdir()).name.split("-")[0],
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
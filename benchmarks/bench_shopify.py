@@ -0,0 +1,98 @@
+"""
+Shopify products JSON to DataFrame conversion: row-based vs columnar.
+
+Run with `python -m benchmarks.bench_shopify [variants ...]` from the
+repository root. Peak memory is measured with tracemalloc in a separate
+run, so it doesn't skew the timings.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from backend.lib.shopify import _convert_column_types, shopify_json_to_dataframe
+from benchmarks.fake_shopify import make_product
+
+VARIANTS_PER_PRODUCT = 3
+
+
+def row_based_json_to_dataframe(data):
+    """The previous implementation: one dict per variant, typed afterwards."""
+    rows = []
+    for product in data.get("products", []):
+        image_src = (
+            product.get("image", {}).get("src", "") if product.get("image") else ""
+        )
+        for variant in product.get("variants", []):
+            rows.append(
+                {
+                    "product_id": product["id"],
+                    "title": product["title"],
+                    "vendor": product.get("vendor", ""),
+                    "product_type": product.get("product_type", ""),
+                    "handle": product.get("handle", ""),
+                    "status": product.get("status", ""),
+                    "tags": product.get("tags", ""),
+                    "created_at": product.get("created_at", ""),
+                    "updated_at": product.get("updated_at", ""),
+                    "published_at": product.get("published_at", ""),
+                    "variant_id": variant["id"],
+                    "variant_title": variant.get("title", ""),
+                    "sku": variant.get("sku", ""),
+                    "price": variant.get("price", ""),
+                    "compare_at_price": variant.get("compare_at_price", ""),
+                    "inventory_quantity": variant.get("inventory_quantity", ""),
+                    "weight": variant.get("weight", ""),
+                    "weight_unit": variant.get("weight_unit", ""),
+                    "requires_shipping": variant.get("requires_shipping", ""),
+                    "taxable": variant.get("taxable", ""),
+                    "barcode": variant.get("barcode", ""),
+                    "image_src": image_src,
+                }
+            )
+    return _convert_column_types(pd.DataFrame(rows))
+
+
+def measure(func, data) -> tuple[float, float]:
+    """Return (seconds, peak MB) of `func(data)`."""
+    gc.collect()
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'variants':>10}{'impl':>10}{'time':>12}{'peak':>12}")
+    for variants in sizes:
+        products = variants // VARIANTS_PER_PRODUCT
+        data = {
+            "products": [
+                make_product(product_id, VARIANTS_PER_PRODUCT)
+                for product_id in range(1, products + 1)
+            ]
+        }
+        pd.testing.assert_frame_equal(
+            row_based_json_to_dataframe(data), shopify_json_to_dataframe(data)
+        )
+
+        for name, func in [
+            ("rows", row_based_json_to_dataframe),
+            ("columnar", shopify_json_to_dataframe),
+        ]:
+            elapsed, peak = measure(func, data)
+            print(f"{variants:>10,}{name:>10}{elapsed:>10.3f} s{peak:>9.1f} MB")
+        del data
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
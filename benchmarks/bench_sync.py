@@ -0,0 +1,56 @@
+"""
+Fleet-wide Shopify refresh: stores fetched one after another vs through
+the sync scheduler.
+
+Run with `python -m benchmarks.bench_sync [stores] [products]` from the
+repository root. Every store is a separate fake Shopify app with its own
+rate limit bucket and 50ms of simulated network latency per request.
+"""
+
+import asyncio
+import sys
+import time
+
+import httpx
+
+from backend.lib.shopify_client import ShopifyClient
+from backend.sync import SyncScheduler
+from benchmarks.fake_shopify import create_app
+
+LATENCY = 0.05
+
+
+def make_client(stores: int, products: int) -> ShopifyClient:
+    mounts = {
+        f"http://store{i}.myshopify.com": httpx.ASGITransport(
+            app=create_app(products, latency=LATENCY)
+        )
+        for i in range(stores)
+    }
+    return ShopifyClient(httpx.AsyncClient(mounts=mounts))
+
+
+async def main(stores: int, products: int) -> None:
+    urls = [f"http://store{i}.myshopify.com" for i in range(stores)]
+    print(f"{stores} stores x {products} products, {LATENCY * 1000:.0f}ms latency")
+
+    client = make_client(stores, products)
+    start = time.perf_counter()
+    for url in urls:
+        await client.fetch_products(url, "pat")
+    print(f"{'sequential':<12}{time.perf_counter() - start:>8.2f} s")
+
+    client = make_client(stores, products)
+
+    async def sync(url: str) -> dict:
+        return await client.fetch_products(url, "pat")
+
+    scheduler = SyncScheduler(sync, max_concurrent=stores)
+    start = time.perf_counter()
+    await asyncio.gather(*scheduler.submit_many(urls))
+    print(f"{'scheduler':<12}{time.perf_counter() - start:>8.2f} s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args + [20, 2500][len(args) :])))
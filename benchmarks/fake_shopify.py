@@ -0,0 +1,164 @@
+"""
+A local stand-in for the Shopify REST Admin products endpoint.
+
+Serves a deterministic catalogue with `Link` header cursor pagination,
+`updated_at_min` and `fields` filters, a count endpoint and a leaky-bucket
+rate limit reported in `X-Shopify-Shop-Api-Call-Limit`, so the Shopify
+client can be exercised against thousands of products without a real store:
+
+    python -m benchmarks.fake_shopify --products 5000 --port 8010
+
+and import from `http://localhost:8010` with any access token.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_product(product_id: int, variants: int = 3) -> dict:
+    updated_at = EPOCH + timedelta(minutes=product_id)
+    return {
+        "id": product_id,
+        "title": f"Product {product_id}",
+        "vendor": f"Farm {product_id % 40}",
+        "product_type": ["Vegetables", "Grains", "Fruit", "Dairy"][product_id % 4],
+        "handle": f"product-{product_id}",
+        "status": "active",
+        "tags": "organic",
+        "created_at": EPOCH.isoformat(),
+        "updated_at": updated_at.isoformat(),
+        "published_at": EPOCH.isoformat(),
+        "image": {"src": f"https://cdn.example.com/{product_id}.jpg"},
+        "variants": [
+            {
+                "id": product_id * 100 + i,
+                "title": f"Variant {i}",
+                "sku": f"SKU-{product_id}-{i}",
+                "price": f"{(product_id % 50) + i}.99",
+                "compare_at_price": None,
+                "inventory_quantity": (product_id * 7 + i) % 200,
+                "weight": 0.5 * (i + 1),
+                "weight_unit": "kg",
+                "requires_shipping": True,
+                "taxable": True,
+                "barcode": None,
+            }
+            for i in range(variants)
+        ],
+    }
+
+
+def _encode_cursor(offset: int, updated_at_min: str | None, fields: str | None) -> str:
+    cursor = json.dumps([offset, updated_at_min, fields])
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def _decode_cursor(page_info: str) -> tuple[int, str | None, str | None]:
+    return tuple(json.loads(base64.urlsafe_b64decode(page_info.encode())))
+
+
+def create_app(
+    products: int = 5000,
+    throttle_rate: float = 0.0,
+    bucket_size: int = 40,
+    latency: float = 0.0,
+) -> FastAPI:
+    app = FastAPI(title="Fake Shopify")
+    # leaky bucket that drains in 20s, like Shopify's REST Admin API
+    bucket = {"level": 0.0, "updated": time.monotonic()}
+    leak_rate = bucket_size / 20
+
+    @app.middleware("http")
+    async def rate_limit(request: Request, call_next):
+        if latency:
+            await asyncio.sleep(latency)
+
+        now = time.monotonic()
+        level = max(0.0, bucket["level"] - (now - bucket["updated"]) * leak_rate)
+        bucket["updated"] = now
+        throttled = throttle_rate and random.random() < throttle_rate
+        if level + 1 > bucket_size or throttled:
+            bucket["level"] = level
+            return JSONResponse(
+                status_code=429,
+                content={"errors": "Exceeded 2 calls per second"},
+                headers={"Retry-After": "0.1"},
+            )
+
+        bucket["level"] = level + 1
+        response = await call_next(request)
+        response.headers["X-Shopify-Shop-Api-Call-Limit"] = (
+            f"{int(bucket['level'])}/{bucket_size}"
+        )
+        return response
+
+    # exposed so callers can update or delete products between syncs
+    app.state.catalogue = catalogue = {
+        product_id: make_product(product_id) for product_id in range(1, products + 1)
+    }
+
+    def select(updated_at_min: str | None) -> list[dict]:
+        selected = list(catalogue.values())
+        if updated_at_min:
+            since = datetime.fromisoformat(updated_at_min)
+            selected = [
+                p for p in selected if datetime.fromisoformat(p["updated_at"]) >= since
+            ]
+        return selected
+
+    @app.get("/admin/api/{version}/products/count.json")
+    async def count_products(updated_at_min: str | None = None):
+        return {"count": len(select(updated_at_min))}
+
+    @app.get("/admin/api/{version}/products.json")
+    async def list_products(
+        request: Request,
+        limit: int = Query(50, le=250),
+        page_info: str | None = None,
+        updated_at_min: str | None = None,
+        fields: str | None = None,
+    ):
+        # the filters are encoded in the cursor, like Shopify does
+        if page_info:
+            offset, updated_at_min, fields = _decode_cursor(page_info)
+        else:
+            offset = 0
+        selected = select(updated_at_min)
+        page = selected[offset : offset + limit]
+        if fields:
+            keys = fields.split(",")
+            page = [{key: p[key] for key in keys if key in p} for p in page]
+
+        headers = {}
+        if offset + limit < len(selected):
+            cursor = _encode_cursor(offset + limit, updated_at_min, fields)
+            next_url = request.url.replace_query_params(limit=limit, page_info=cursor)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return JSONResponse(content={"products": page}, headers=headers)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--bucket-size", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8010)
+    args = parser.parse_args()
+
+    app = create_app(args.products, args.throttle_rate, args.bucket_size, args.latency)
+    uvicorn.run(app, port=args.port)
@@ -59,6 +59,9 @@ export function CreateDatasetModal({
       })
       onSuccess?.()
     },
+    onError: (error) => {
+      setError(error.message || "Failed to create dataset")
+    },
   })
 
   const handleFileDrop = (e: React.DragEvent) => {
@@ -1,3 +1,4 @@
+import { tasksApi, type TaskStatus } from "./tasks"
 import type { DatasetResponse } from "./types"
 
 export interface Job {
@@ -44,8 +45,21 @@ const jobStatusMap = {
   rejected: "denied",
 } as const
 
+// the fields of a job in the `view=summary` listing
+type JobSummaryResponse = Pick<
+  JobResponse,
+  | "uid"
+  | "name"
+  | "description"
+  | "datasetName"
+  | "createdBy"
+  | "createdAt"
+  | "updatedAt"
+  | "status"
+>
+
 interface JobListResponse {
-  jobs: JobResponse[]
+  jobs: JobSummaryResponse[]
 }
 
 interface AutoApproveResponse {
@@ -75,7 +89,9 @@ export const apiService = {
         throw new Error(error.detail || "Failed to create dataset")
       }
 
-      const data: DatasetResponse = await response.json()
+      // the dataset is created by a background task, wait for it to finish
+      const task: TaskStatus = await response.json()
+      await tasksApi.waitForTask<DatasetResponse>(task)
       return {
         success: true,
         message: `Dataset "${formData.get("name")}" created successfully`,
@@ -87,7 +103,7 @@ export const apiService = {
   },
 
   async getJobs(): Promise<{ jobs: Job[] }> {
-    const response = await fetch(`${getBaseUrl()}/api/v1/jobs`)
+    const response = await fetch(`${getBaseUrl()}/api/v1/jobs?view=summary`)
     if (!response.ok) {
       const error = await response.json()
       throw new Error(error.detail || "Failed to fetch jobs")
@@ -3,6 +3,7 @@ import { apiClient } from "./api-client"
 import type { Dataset, DatasetResponse } from "./types"
 import { formatBytes } from "../utils"
 import { apiService, type Job } from "./api"
+import { tasksApi, type TaskStatus } from "./tasks"
 
 export const AddShopifyDatasetFormSchema = z.object({
   name: z.string().min(1, { message: "A dataset name is required" }),
@@ -96,8 +97,15 @@ export const datasetsApi = {
       })),
     }
   },
-  addShopifyDataset: (data: z.infer<typeof AddShopifyDatasetFormSchema>) => {
-    return apiClient.post<{}>("/api/v1/datasets/import-from-shopify", data)
+  addShopifyDataset: async (
+    data: z.infer<typeof AddShopifyDatasetFormSchema>,
+  ) => {
+    const task = await apiClient.post<TaskStatus>(
+      "/api/v1/datasets/import-from-shopify",
+      data,
+    )
+    // the import runs as a background task, wait for it to finish
+    return tasksApi.waitForTask<DatasetResponse>(task)
   },
   updateShopifyDataset: ({
     uid,
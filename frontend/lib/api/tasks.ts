@@ -0,0 +1,59 @@
+import { apiClient } from "./api-client"
+import { ApiError, FormFieldError } from "./errors"
+
+export interface TaskStatus {
+  id: string
+  kind: string
+  state: "queued" | "running" | "succeeded" | "failed" | "cancelled"
+  phase: string
+  cancelRequested: boolean
+  bytesProcessed: number
+  bytesTotal: number | null
+  itemsProcessed: number
+  createdAt: string
+  startedAt: string | null
+  finishedAt: string | null
+  duration: number | null
+  result: Record<string, unknown> | null
+  error: null | string | { type?: string; loc?: string; message?: string }
+}
+
+const POLL_INTERVAL_MS = 1000
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+function taskError(task: TaskStatus): Error {
+  const { error } = task
+  if (error && typeof error === "object") {
+    if (error.type === "FormFieldError" && error.loc) {
+      return new FormFieldError(error.message || "Invalid value", error.loc)
+    }
+    return new ApiError(error.message || JSON.stringify(error), 500, task.state)
+  }
+  if (task.state === "cancelled") {
+    return new ApiError("The task was cancelled", 409, task.state)
+  }
+  return new ApiError(error || "The task failed", 500, task.state)
+}
+
+export const tasksApi = {
+  getTask: (id: string) => {
+    return apiClient.get<TaskStatus>(`/api/v1/tasks/${id}`)
+  },
+
+  /**
+   * Poll a background task until it finishes. Resolves with its result
+   * when it succeeds and rejects with its error when it fails or is
+   * cancelled.
+   */
+  async waitForTask<T = Record<string, unknown>>(task: TaskStatus): Promise<T> {
+    while (task.state === "queued" || task.state === "running") {
+      await sleep(POLL_INTERVAL_MS)
+      task = await tasksApi.getTask(task.id)
+    }
+    if (task.state !== "succeeded") {
+      throw taskError(task)
+    }
+    return task.result as T
+  },
+}
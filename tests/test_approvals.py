@@ -0,0 +1,149 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from syft_rds.models.models import Job
+
+from backend import approvals
+from backend.approvals import ApprovalEngine
+from backend.trust import TrustList
+
+
+class FakeRDS:
+    """Just enough of an RDS session for the approval engine."""
+
+    def __init__(self, path: Path):
+        jobs_dir, datasets_dir = path / "jobs", path / "datasets"
+        jobs_dir.mkdir()
+        datasets_dir.mkdir()
+        self.local_store = SimpleNamespace(
+            jobs=SimpleNamespace(store=SimpleNamespace(item_type_dir=jobs_dir)),
+            dataset=SimpleNamespace(store=SimpleNamespace(item_type_dir=datasets_dir)),
+        )
+        self.datasets = []
+        self.pending = []
+        self.decided = []
+        self.fail = set()
+        self.dataset = SimpleNamespace(get_all=lambda: self.datasets)
+        self.jobs = SimpleNamespace(approve=self._approve, reject=self._reject)
+
+    def submit(self, requester: str, dataset_name: str = "crops") -> Job:
+        job = Job(
+            uid=uuid.uuid4(),
+            user_code_id=uuid.uuid4(),
+            created_by=requester,
+            created_at=datetime.now(timezone.utc),
+            dataset_name=dataset_name,
+        )
+        self.pending.append(job)
+        self._write(job)
+        return job
+
+    def _write(self, job: Job) -> None:
+        path = self.local_store.jobs.store.item_type_dir / f"{job.uid}.yaml"
+        path.write_text(job.model_dump_json())
+
+    def _decide(self, job: Job, action: str) -> None:
+        if job.created_by in self.fail:
+            raise RuntimeError("store unavailable")
+        self.pending.remove(job)
+        self.decided.append((job.created_by, action))
+        self._write(job)
+
+    def _approve(self, job: Job) -> None:
+        self._decide(job, "approve")
+
+    def _reject(self, job: Job, reason: str) -> None:
+        self._decide(job, "reject")
+
+
+@pytest.fixture
+def rds(tmp_path: Path, monkeypatch) -> FakeRDS:
+    rds = FakeRDS(tmp_path)
+    trust_list = TrustList(tmp_path / "auto_approve.json")
+    pool = SimpleNamespace(get_syftbox_client=lambda: None)
+    index = SimpleNamespace(
+        query=lambda statuses: SimpleNamespace(jobs=list(rds.pending))
+    )
+    monkeypatch.setattr(approvals, "get_session_pool", lambda: pool)
+    monkeypatch.setattr(approvals, "get_trust_list", lambda client: trust_list)
+    monkeypatch.setattr(approvals, "get_job_index", lambda rds_client: index)
+    rds.trust = trust_list
+    return rds
+
+
+def engine(reject_untrusted: bool = False) -> ApprovalEngine:
+    return ApprovalEngine(
+        poll_interval=60,
+        batch_delay=0,
+        max_concurrent=4,
+        reject_untrusted=reject_untrusted,
+    )
+
+
+def test_trusted_requesters_are_approved(rds):
+    rds.trust.path.write_text(json.dumps(["*@trusted.org"]))
+    rds.datasets = [SimpleNamespace(name="crops", auto_approval=["bob@example.com"])]
+    rds.submit("alice@trusted.org")
+    rds.submit("bob@example.com")
+    rds.submit("eve@example.com")
+    approver = engine()
+
+    asyncio.run(approver.run_once(rds))
+
+    assert sorted(rds.decided) == [
+        ("alice@trusted.org", "approve"),
+        ("bob@example.com", "approve"),
+    ]
+    assert [job.created_by for job in rds.pending] == ["eve@example.com"]
+    assert approver._counts == {"approved": 2, "rejected": 0, "failed": 0}
+
+
+def test_reject_untrusted(rds):
+    rds.datasets = [SimpleNamespace(name="crops", auto_approval=[])]
+    rds.submit("eve@example.com")
+    rds.submit("mallory@example.com", dataset_name="deleted")
+
+    asyncio.run(engine(reject_untrusted=True).run_once(rds))
+
+    assert sorted(rds.decided) == [
+        ("eve@example.com", "reject"),
+        ("mallory@example.com", "reject"),
+    ]
+
+
+def test_unchanged_stores_are_not_re_evaluated(rds):
+    rds.datasets = [SimpleNamespace(name="crops", auto_approval=[])]
+    rds.submit("bob@example.com")
+    approver = engine()
+
+    asyncio.run(approver.run_once(rds))
+    assert rds.decided == []
+
+    # no store file changed, so the pass is skipped
+    rds.datasets[0].auto_approval = ["bob@example.com"]
+    asyncio.run(approver.run_once(rds))
+    assert rds.decided == []
+
+    rds.trust.path.write_text(json.dumps(["bob@example.com"]))
+    asyncio.run(approver.run_once(rds))
+    assert rds.decided == [("bob@example.com", "approve")]
+
+
+def test_failed_decisions_are_retried(rds):
+    rds.trust.path.write_text(json.dumps(["bob@example.com"]))
+    rds.datasets = [SimpleNamespace(name="crops", auto_approval=[])]
+    rds.submit("bob@example.com")
+    rds.fail.add("bob@example.com")
+    approver = engine()
+
+    asyncio.run(approver.run_once(rds))
+    assert approver._counts["failed"] == 1
+
+    rds.fail.clear()
+    asyncio.run(approver.run_once(rds))
+    assert rds.decided == [("bob@example.com", "approve")]
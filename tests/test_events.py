@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from backend import events
+from backend.events import EventHub, Subscriber
+from backend.models import ChangeEvent
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeDatasetStore:
+    def __init__(self, path: Path):
+        self.item_type_dir = path
+        self.names = {}
+        self.broken = set()
+
+    def put(self, uid: str, name: str, content: str = "") -> None:
+        self.names[uid] = name
+        (self.item_type_dir / f"{uid}.yaml").write_text(f"name: {name}\n{content}")
+
+    def delete(self, uid: str) -> None:
+        del self.names[uid]
+        (self.item_type_dir / f"{uid}.yaml").unlink()
+
+    def get_by_uid(self, uid: str):
+        if uid in self.broken:
+            raise ValueError("partial file")
+        return SimpleNamespace(name=self.names[uid])
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> FakeDatasetStore:
+    return FakeDatasetStore(tmp_path)
+
+
+@pytest.fixture
+def rds_client(store: FakeDatasetStore) -> SimpleNamespace:
+    return SimpleNamespace(
+        local_store=SimpleNamespace(dataset=SimpleNamespace(store=store))
+    )
+
+
+def kinds(changes: list[ChangeEvent]) -> list[tuple[str, str]]:
+    return [(event.type, event.uid) for event in changes]
+
+
+def test_dataset_diff(store, rds_client):
+    hub = EventHub(poll_interval=60, queue_size=10)
+    store.put("a", "crops")
+    assert hub._scan_datasets(rds_client, NOW) == []
+
+    store.put("b", "soil")
+    store.put("a", "crops", "description: updated\n")
+    assert sorted(kinds(hub._scan_datasets(rds_client, NOW))) == [
+        ("dataset.created", "b"),
+        ("dataset.updated", "a"),
+    ]
+    assert hub._scan_datasets(rds_client, NOW) == []
+
+    store.delete("b")
+    changes = hub._scan_datasets(rds_client, NOW)
+    assert kinds(changes) == [("dataset.deleted", "b")]
+    assert changes[0].name == "soil"
+
+
+def test_dataset_load_failure_is_retried_as_an_update(store, rds_client):
+    hub = EventHub(poll_interval=60, queue_size=10)
+    store.put("a", "crops")
+    hub._scan_datasets(rds_client, NOW)
+
+    store.put("a", "crops", "description: half written\n")
+    store.broken.add("a")
+    assert hub._scan_datasets(rds_client, NOW) == []
+
+    store.broken.clear()
+    assert kinds(hub._scan_datasets(rds_client, NOW)) == [("dataset.updated", "a")]
+
+
+def test_job_diff(monkeypatch):
+    snapshots = [
+        {"j1": ("pending_code_review", "crops", NOW)},
+        {
+            "j1": ("approved", "crops", NOW),
+            "j2": ("pending_code_review", "soil", NOW),
+        },
+        {"j2": ("job_run_finished", "soil", NOW)},
+    ]
+    index = SimpleNamespace(snapshot=lambda: snapshots.pop(0))
+    monkeypatch.setattr(events, "get_job_index", lambda rds_client: index)
+    hub = EventHub(poll_interval=60, queue_size=10)
+
+    assert hub._scan_jobs(None, NOW) == []
+    assert sorted(kinds(hub._scan_jobs(None, NOW))) == [
+        ("job.approved", "j1"),
+        ("job.submitted", "j2"),
+    ]
+    changes = hub._scan_jobs(None, NOW)
+    assert sorted(kinds(changes)) == [("job.deleted", "j1"), ("job.updated", "j2")]
+    assert {event.uid: event.status for event in changes} == {
+        "j1": "approved",
+        "j2": "job_run_finished",
+    }
+
+
+def test_slow_subscriber_gets_a_resync():
+    subscriber = Subscriber(max_size=2)
+    for i in range(3):
+        subscriber.put(ChangeEvent(type="job.submitted", uid=str(i), at=NOW))
+
+    assert subscriber.dropped == 2
+    assert subscriber.queue.qsize() == 1
+    assert subscriber.queue.get_nowait().type == "resync"
@@ -0,0 +1,158 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from syft_rds.models.models import Job, JobStatus
+
+from backend.job_index import SUMMARY_FIELDS, JobIndex
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeJobStore:
+    """The job store of an RDS session: one `<uid>.yaml` file per job."""
+
+    def __init__(self, path: Path):
+        self.item_type_dir = path
+        self.jobs = {}
+
+    def put(self, job: Job) -> None:
+        self.jobs[str(job.uid)] = job
+        path = self.item_type_dir / f"{job.uid}.yaml"
+        path.write_text(job.model_dump_json())
+
+    def delete(self, uid: str) -> None:
+        del self.jobs[uid]
+        (self.item_type_dir / f"{uid}.yaml").unlink()
+
+    def get_by_uid(self, uid: str) -> Job | None:
+        return self.jobs.get(uid)
+
+
+def make_job(minutes: int, **fields) -> Job:
+    fields.setdefault("dataset_name", "crops")
+    fields.setdefault("created_by", "alice@example.com")
+    return Job(
+        uid=uuid.uuid4(),
+        user_code_id=uuid.uuid4(),
+        name=f"job {minutes}",
+        created_at=START + timedelta(minutes=minutes),
+        **fields,
+    )
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> FakeJobStore:
+    return FakeJobStore(tmp_path)
+
+
+@pytest.fixture
+def index(store: FakeJobStore) -> JobIndex:
+    jobs = SimpleNamespace(store=store, register_client_id=lambda job: job)
+    rds_client = SimpleNamespace(
+        email="owner@example.com", local_store=SimpleNamespace(jobs=jobs)
+    )
+    return JobIndex(rds_client)
+
+
+def all_pages(index: JobIndex, **filters) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        page = index.query(limit=3, cursor=cursor, **filters)
+        pages.append([job.name for job in page.jobs])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_cursor_pages_cover_every_job_once(store, index):
+    for minutes in range(8):
+        store.put(make_job(minutes))
+
+    assert all_pages(index) == [
+        ["job 7", "job 6", "job 5"],
+        ["job 4", "job 3", "job 2"],
+        ["job 1", "job 0"],
+    ]
+    assert all_pages(index, order="asc") == [
+        ["job 0", "job 1", "job 2"],
+        ["job 3", "job 4", "job 5"],
+        ["job 6", "job 7"],
+    ]
+    assert index.query(limit=3).total == 8
+
+
+def test_new_jobs_do_not_shift_later_pages(store, index):
+    for minutes in range(6):
+        store.put(make_job(minutes))
+
+    first = index.query(limit=3)
+    store.put(make_job(10))
+    second = index.query(limit=3, cursor=first.next_cursor)
+
+    assert [job.name for job in second.jobs] == ["job 2", "job 1", "job 0"]
+    assert second.next_cursor is None
+    assert second.total == 7
+
+
+def test_filters_are_combined(store, index):
+    store.put(make_job(0, created_by="Bob@Example.com"))
+    store.put(make_job(1, created_by="bob@example.com", dataset_name="soil"))
+    store.put(make_job(2, created_by="bob@example.com", status=JobStatus.approved))
+    store.put(make_job(3))
+
+    page = index.query(
+        statuses=[JobStatus.pending_code_review.value], requester="BOB@example.com"
+    )
+    assert [job.name for job in page.jobs] == ["job 1", "job 0"]
+
+    page = index.query(requester="bob@example.com", dataset="crops")
+    assert [job.name for job in page.jobs] == ["job 2", "job 0"]
+    assert page.total == 2
+
+    assert index.query(dataset="unknown").jobs == []
+
+
+def test_changed_and_deleted_jobs_are_reindexed(store, index):
+    job = make_job(0)
+    store.put(job)
+    store.put(make_job(1))
+    assert index.query(statuses=["approved"]).total == 0
+
+    store.put(job.model_copy(update={"status": JobStatus.approved}))
+    assert [j.name for j in index.query(statuses=["approved"]).jobs] == ["job 0"]
+
+    store.delete(str(job.uid))
+    assert index.query(statuses=["approved"]).total == 0
+    assert index.query().total == 1
+
+
+def test_render_reuses_pages_until_a_job_changes(store, index):
+    job = make_job(0)
+    store.put(job)
+
+    body = index.render()
+    assert index.render() is body
+    assert json.loads(body)["jobs"][0]["name"] == "job 0"
+
+    store.put(job.model_copy(update={"name": "renamed job"}))
+    assert json.loads(index.render())["jobs"][0]["name"] == "renamed job"
+
+
+def test_render_summary_view(store, index):
+    store.put(make_job(0))
+
+    summary = json.loads(index.render(view="summary"))["jobs"][0]
+    full = json.loads(index.render())["jobs"][0]
+
+    assert tuple(summary) == SUMMARY_FIELDS
+    assert {field: full[field] for field in SUMMARY_FIELDS} == summary
+    assert "userCodeId" in full
+
+
+def test_invalid_cursor(index):
+    with pytest.raises(ValueError):
+        index.query(cursor="not a cursor")
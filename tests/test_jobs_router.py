@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from backend.api.dependencies import get_syftbox_client
+from backend.api.routers.jobs import BatchJobDecisionBody
+from backend.main import app
+
+
+def test_one_decision_per_job():
+    body = BatchJobDecisionBody(
+        decisions=[
+            {"uid": "a", "action": "approve"},
+            {"uid": "b", "action": "reject", "reason": "no"},
+        ]
+    )
+    assert [decision.uid for decision in body.decisions] == ["a", "b"]
+
+    with pytest.raises(ValidationError, match="More than one decision for jobs: a"):
+        BatchJobDecisionBody(
+            decisions=[
+                {"uid": "a", "action": "approve"},
+                {"uid": "b", "action": "approve"},
+                {"uid": "a", "action": "reject"},
+            ]
+        )
+
+
+def test_batch_with_duplicate_jobs_is_rejected():
+    app.dependency_overrides[get_syftbox_client] = lambda: None
+    try:
+        response = TestClient(app).post(
+            "/api/v1/jobs/batch",
+            json={
+                "decisions": [
+                    {"uid": "a", "action": "approve"},
+                    {"uid": "a", "action": "reject"},
+                ]
+            },
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 422
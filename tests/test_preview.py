@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.lib import preview
+from backend.lib.preview import CsvRowIndex, preview_file
+
+
+@pytest.fixture
+def csv_path(tmp_path: Path) -> Path:
+    df = pd.DataFrame(
+        {
+            "id": range(50),
+            # quoted fields with newlines and escaped quotes
+            "note": [
+                f'line {i}\nsays ""hi""' if i % 7 == 0 else f"n{i}" for i in range(50)
+            ],
+        }
+    )
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # a few rows per block, so reads go through several checkpoints
+    monkeypatch.setattr(preview, "BLOCK_SIZE", 64)
+
+
+@pytest.mark.parametrize("offset,count", [(0, 5), (13, 10), (45, 10), (49, 1)])
+def test_preview_csv_pages(csv_path, offset, count):
+    expected = pd.read_csv(csv_path).iloc[offset : offset + count]
+
+    page = preview_file(csv_path, offset, count)
+
+    assert [column["name"] for column in page["columns"]] == ["id", "note"]
+    assert page["rows"] == expected.values.tolist()
+    assert page["has_more"] == (offset + count < 50)
+
+
+def test_preview_past_the_end(csv_path):
+    page = preview_file(csv_path, 60, 10)
+    assert page["rows"] == []
+    assert page["has_more"] is False
+
+
+def test_row_index_counts_rows_once_scanned(csv_path):
+    index = CsvRowIndex(csv_path)
+    index.read(0, 2)
+    # the first rows never scan the rest of the file
+    assert index.total_rows is None
+    assert index._offsets[-1] < 64
+
+    assert index.read(60, 10) == (b"", False)
+    assert index.total_rows == 50
+
+
+def test_last_row_without_newline(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n3,4")
+
+    page = preview_file(path, 0, 10)
+
+    assert page["rows"] == [[1, 2], [3, 4]]
+    assert page["has_more"] is False
+
+
+def test_not_tabular(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("hello")
+    with pytest.raises(ValueError):
+        preview_file(path, 0, 10)
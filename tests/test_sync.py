@@ -0,0 +1,84 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from backend.sync import PeriodicSync, SyncScheduler
+
+
+def test_one_sync_per_dataset():
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def sync(dataset_uid: str) -> dict:
+            calls.append(dataset_uid)
+            await release.wait()
+            return {"uid": dataset_uid}
+
+        scheduler = SyncScheduler(sync, max_concurrent=4)
+        first = scheduler.submit("a")
+        assert scheduler.submit("a") is first
+        assert scheduler.is_syncing("a")
+
+        waiting = asyncio.gather(scheduler.sync("a"), scheduler.sync("b"))
+        await asyncio.sleep(0)
+        release.set()
+        assert await waiting == [{"uid": "a"}, {"uid": "b"}]
+        assert not scheduler.is_syncing("a")
+
+    asyncio.run(main())
+    assert calls == ["a", "b"]
+
+
+def test_concurrency_limit_and_status():
+    running, peak = 0, 0
+
+    async def sync(dataset_uid: str) -> dict:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if dataset_uid == "bad":
+            raise HTTPException(status_code=502, detail="store unavailable")
+        return {}
+
+    async def main():
+        scheduler = SyncScheduler(sync, max_concurrent=2)
+        tasks = scheduler.submit_many(["a", "b", "c", "bad"])
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return scheduler.status()
+
+    status = asyncio.run(main())
+    assert peak == 2
+    assert (status.succeeded, status.failed) == (3, 1)
+    failed = next(job for job in status.jobs if job.state == "failed")
+    assert failed.error == "store unavailable"
+
+
+def test_periodic_round_joins_running_syncs():
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def sync(dataset_uid: str) -> dict:
+            calls.append(dataset_uid)
+            await release.wait()
+            return {}
+
+        async def list_datasets() -> list[str]:
+            return ["a", "b"]
+
+        scheduler = SyncScheduler(sync, max_concurrent=4)
+        from_ui = scheduler.submit("a")
+        periodic = PeriodicSync(scheduler, list_datasets, interval=60)
+        round_ = asyncio.create_task(periodic.run_once())
+        await asyncio.sleep(0)
+        release.set()
+        await round_
+        assert from_ui.done()
+
+    asyncio.run(main())
+    assert sorted(calls) == ["a", "b"]
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+from backend.executor import run_io
+from backend.tasks import TaskContext, TaskManager
+
+
+async def wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_task_succeeds_and_runs_cleanup():
+    cleanups = []
+
+    async def work(context: TaskContext) -> dict:
+        context.set_phase("working")
+        context.add_items(3)
+        return {"ok": True}
+
+    async def main():
+        manager = TaskManager(max_concurrent=2, ttl=60)
+        status = manager.submit("test", work, cleanup=lambda: cleanups.append(1))
+        await wait_until(lambda: status.state == "succeeded")
+        assert status.result == {"ok": True}
+        assert status.items_processed == 3
+        assert status.phase == "done"
+        await wait_until(lambda: cleanups == [1])
+
+    asyncio.run(main())
+
+
+def test_failed_task_records_error():
+    async def work(context: TaskContext) -> None:
+        raise RuntimeError("boom")
+
+    async def main():
+        manager = TaskManager(max_concurrent=1, ttl=60)
+        status = manager.submit("test", work)
+        await wait_until(lambda: status.state == "failed")
+        assert status.error == "boom"
+
+    asyncio.run(main())
+
+
+def test_cancel_queued_task_drops_it():
+    calls, cleanups = [], []
+
+    async def main():
+        blocker = asyncio.Event()
+
+        async def block(context: TaskContext) -> None:
+            await blocker.wait()
+
+        async def work(context: TaskContext) -> None:
+            calls.append(1)
+
+        manager = TaskManager(max_concurrent=1, ttl=60)
+        first = manager.submit("block", block)
+        await asyncio.sleep(0)
+        queued = manager.submit("work", work, cleanup=lambda: cleanups.append(1))
+        await asyncio.sleep(0)
+        assert queued.state == "queued"
+
+        manager.cancel(queued.id)
+        await wait_until(lambda: queued.state == "cancelled")
+        blocker.set()
+        await wait_until(lambda: first.state == "succeeded")
+        await wait_until(lambda: cleanups == [1])
+        assert queued.cancel_requested
+        assert calls == []
+
+    asyncio.run(main())
+
+
+def test_cancel_before_first_step_runs_cleanup_once():
+    cleanups = []
+
+    async def work(context: TaskContext) -> None:
+        raise AssertionError("a cancelled task must not run")
+
+    async def main():
+        manager = TaskManager(max_concurrent=1, ttl=60)
+        status = manager.submit("work", work, cleanup=lambda: cleanups.append(1))
+        manager.cancel(status.id)
+        await wait_until(lambda: cleanups == [1])
+        assert status.state == "cancelled"
+
+    asyncio.run(main())
+
+
+def test_cancel_running_task_stops_at_next_phase():
+    phases = []
+
+    async def main():
+        started = asyncio.Event()
+        resume = asyncio.Event()
+
+        async def work(context: TaskContext) -> None:
+            context.set_phase("first")
+            phases.append("first")
+            started.set()
+            await resume.wait()
+            context.set_phase("second")
+            phases.append("second")
+
+        manager = TaskManager(max_concurrent=1, ttl=60)
+        status = manager.submit("work", work)
+        await started.wait()
+        manager.cancel(status.id)
+        assert status.state == "running"
+        resume.set()
+        await wait_until(lambda: status.state == "cancelled")
+
+    asyncio.run(main())
+    assert phases == ["first"]
+
+
+def test_close_waits_for_worker_call_before_cleanup():
+    finished = threading.Event()
+    seen_by_cleanup = []
+
+    def blocking() -> None:
+        time.sleep(0.2)
+        finished.set()
+
+    async def work(context: TaskContext) -> None:
+        await run_io(blocking)
+
+    async def main():
+        manager = TaskManager(max_concurrent=1, ttl=60)
+        status = manager.submit(
+            "work", work, cleanup=lambda: seen_by_cleanup.append(finished.is_set())
+        )
+        await wait_until(lambda: status.state == "running")
+        await asyncio.sleep(0.05)
+        await manager.close()
+        assert status.state == "cancelled"
+
+    asyncio.run(main())
+    assert seen_by_cleanup == [True]
@@ -0,0 +1,64 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from backend.lib.uploads import (
+    MULTIPART_OVERHEAD,
+    UploadSizeLimitMiddleware,
+    copy_upload,
+)
+
+
+def test_copy_upload(tmp_path):
+    data = b"x" * 2500
+    stored = copy_upload(
+        io.BytesIO(data), tmp_path / "out", max_size=2500, chunk_size=1000
+    )
+
+    assert stored.size == 2500
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "out").read_bytes() == data
+
+
+def test_copy_upload_over_the_limit(tmp_path):
+    destination = tmp_path / "out"
+    with pytest.raises(HTTPException) as e:
+        copy_upload(
+            io.BytesIO(b"x" * 2501), destination, max_size=2500, chunk_size=1000
+        )
+
+    assert e.value.status_code == 413
+    assert not destination.exists()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_size=1000)
+
+    @app.post("/upload")
+    async def upload(request: Request) -> dict:
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+def test_multipart_within_the_limit(client):
+    response = client.post("/upload", files={"file": ("a.csv", b"x" * 1000)})
+    assert response.status_code == 200
+
+
+def test_multipart_over_the_limit(client):
+    body = b"x" * (1000 + MULTIPART_OVERHEAD + 1)
+    response = client.post("/upload", files={"file": ("a.csv", body)})
+    assert response.status_code == 413
+
+
+def test_other_bodies_are_not_limited(client):
+    body = b"x" * (1000 + MULTIPART_OVERHEAD + 1)
+    response = client.post("/upload", content=body)
+    assert response.status_code == 200
+    assert response.json() == {"size": len(body)}